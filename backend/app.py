@@ -1,13 +1,51 @@
+import importlib
+import time
+
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from config import Config
 
+# Blueprints registrados por create_app(): (módulo, nombre del blueprint, prefijo)
+BLUEPRINTS = [
+    ('routes.auth', 'auth_bp', '/api/auth'),
+    ('routes.questions', 'questions_bp', '/api/questions'),
+    ('routes.answers', 'answers_bp', '/api/answers'),
+    ('routes.users', 'users_bp', '/api/users'),
+    ('routes.categories', 'categories_bp', '/api/categories'),
+    ('routes.tags', 'tags_bp', '/api/tags'),
+    ('routes.notifications', 'notifications_bp', '/api/notifications'),
+    ('routes.admin', 'admin_bp', '/api/admin'),
+]
+
+
+class StartupTimer:
+    """Duración de cada fase de create_app() en milisegundos"""
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 1)
+        self.last = now
+
+    def report(self):
+        return {'total_ms': round((self.last - self.started) * 1000, 1), 'phases': self.phases}
+
+
 def create_app():
     """Factory function para crear la aplicación Flask"""
+    timer = StartupTimer()
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    # Logging estructurado (antes que todo lo demás)
+    from utils.log import init_logging, get_logger
+    init_logging(app)
+    timer.mark('config')
+    
     # Inicializar extensiones
     from models import db
     db.init_app(app)
@@ -19,23 +57,68 @@ def create_app():
     CORS(app, 
          origins=['http://localhost:3000', 'http://127.0.0.1:3000'],
          supports_credentials=True,
-         allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
+         allow_headers=['Content-Type', 'Authorization', 'X-Requested-With', 'X-Request-ID', 'If-Match',
+                        'Idempotency-Key', 'X-Profile'],
+         expose_headers=['X-Request-ID', 'X-Export-Watermark', 'Retry-After', 'ETag', 'Idempotent-Replayed',
+                         'X-Profile-Id'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
     
+    # Rate limiting de endpoints de escritura y autenticación
+    from utils.ratelimit import rate_limiter
+    rate_limiter.init_app(app)
+    
+    # Lecturas concurrentes idénticas se resuelven una sola vez
+    from utils.singleflight import init_singleflight, metrics as singleflight_metrics
+    init_singleflight(app)
+    
+    # Reintentos seguros de los POST de creación (Idempotency-Key)
+    from utils.idempotency import init_idempotency, metrics as idempotency_metrics
+    init_idempotency(app)
+    
+    # Perfilado bajo demanda para administradores
+    from utils.profiling import init_profiling
+    init_profiling(app)
+    timer.mark('extensions')
+    
     # Registrar blueprints
-    from routes.auth import auth_bp
-    from routes.questions import questions_bp
-    from routes.answers import answers_bp
-    from routes.users import users_bp
+    for module_name, blueprint_name, url_prefix in BLUEPRINTS:
+        module = importlib.import_module(module_name)
+        app.register_blueprint(getattr(module, blueprint_name), url_prefix=url_prefix)
+    timer.mark('blueprints')
+    
+    # Aplicar migraciones solo si está habilitado (en producción el esquema es explícito)
+    if app.config['AUTO_CREATE_SCHEMA']:
+        from utils.migrations import upgrade_database
+        with app.app_context():
+            upgrade_database()
+        timer.mark('schema')
+    
+    # Pub/sub de eventos en tiempo real
+    from controllers.events import init_events
+    init_events(app)
+    
+    # Rankings de reputación en memoria
+    from controllers.leaderboard import init_leaderboard
+    init_leaderboard(app)
+    
+    # Índice de prefijos para el autocompletado de títulos
+    from controllers.suggest import init_suggest
+    init_suggest(app)
+    
+    # Cola de trabajos diferidos y tareas periódicas
+    from utils.jobs import job_queue
+    from controllers.tasks import register_tasks
+    register_tasks(job_queue, app)
+    job_queue.init_app(app)
+    timer.mark('background')
     
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(questions_bp, url_prefix='/api/questions')
-    app.register_blueprint(answers_bp, url_prefix='/api/answers')
-    app.register_blueprint(users_bp, url_prefix='/api/users')
+    # Comandos de CLI
+    from commands import register_commands
+    register_commands(app)
+    timer.mark('commands')
     
-    # Crear tablas
-    with app.app_context():
-        db.create_all()
+    app.extensions['startup'] = timer.report()
+    get_logger('app').info('app started', extra=app.extensions['startup'])
     
     @app.route('/')
     def home():
@@ -43,7 +126,14 @@ def create_app():
     
     @app.route('/api/health')
     def health_check():
-        return {"status": "healthy", "service": "StudentOverflow Backend"}
+        return {
+            "status": "healthy",
+            "service": "StudentOverflow Backend",
+            "jobs": job_queue.metrics(),
+            "singleflight": singleflight_metrics(),
+            "idempotency": idempotency_metrics(),
+            "startup": app.extensions['startup']
+        }
     
     return app
 
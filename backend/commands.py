@@ -0,0 +1,134 @@
+import click
+
+
+def register_commands(app):
+    """Registrar comandos de mantenimiento en la CLI de Flask"""
+
+    @app.cli.command('db-upgrade')
+    @click.argument('revision', default='head')
+    def db_upgrade(revision):
+        """Aplicar las migraciones de esquema pendientes"""
+        from utils.migrations import upgrade_database
+        upgrade_database(revision)
+        click.echo(f'Esquema actualizado a {revision}')
+    
+    @app.cli.command('recompute-hot')
+    @click.option('--batch-size', default=1000, show_default=True)
+    def recompute_hot(batch_size):
+        """Recalcular el score hot de todas las preguntas"""
+        from controllers.ranking import recompute_hot_scores
+        updated = recompute_hot_scores(batch_size=batch_size)
+        click.echo(f'{updated} preguntas actualizadas')
+    
+    @app.cli.command('backfill-signatures')
+    @click.option('--batch-size', default=500, show_default=True)
+    def backfill_signatures_command(batch_size):
+        """Calcular las firmas MinHash de las preguntas que no la tienen"""
+        from controllers.similarity import backfill_signatures
+        updated = backfill_signatures(batch_size=batch_size)
+        click.echo(f'{updated} firmas calculadas')
+    
+    @app.cli.command('render-content')
+    @click.option('--batch-size', default=500, show_default=True)
+    def render_content(batch_size):
+        """Renderizar el Markdown de las filas sin content_html"""
+        from sqlalchemy import bindparam, select, update
+        from models import db, Question, Answer
+        from utils.markdown import render_markdown
+        
+        for model in (Question, Answer):
+            rendered = 0
+            while True:
+                rows = db.session.execute(
+                    select(model.id, model.content, model.updated_at)
+                    .where(model.content_html.is_(None))
+                    .order_by(model.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                # UPDATE de Core por clave primaria: conserva updated_at y la versión
+                table = model.__table__
+                db.session.execute(update(table).where(table.c.id == bindparam('row_id')), [
+                    {'row_id': row_id, 'content_html': render_markdown(content), 'updated_at': updated_at}
+                    for row_id, content, updated_at in rows
+                ])
+                db.session.commit()
+                rendered += len(rows)
+            click.echo(f'{model.__tablename__}: {rendered} filas renderizadas')
+    
+    @app.cli.command('check-documents')
+    @click.option('--batch-size', default=500, show_default=True)
+    @click.option('--repair', is_flag=True, help='Reconstruir o eliminar los documentos incorrectos')
+    def check_documents(batch_size, repair):
+        """Verificar question_documents contra las tablas normalizadas"""
+        from controllers.documents import check_question_documents
+        stats = check_question_documents(batch_size=batch_size, repair=repair)
+        click.echo(' '.join(f'{key}={value}' for key, value in stats.items()))
+        if (stats['stale'] or stats['orphaned']) and not repair:
+            raise SystemExit(1)
+    
+    @app.cli.command('archive-deleted')
+    @click.option('--days', default=None, type=int, help='Antigüedad mínima del borrado (por defecto ARCHIVE_AFTER_DAYS)')
+    @click.option('--batch-size', default=None, type=int, help='Filas por lote (por defecto ARCHIVE_BATCH_SIZE)')
+    def archive_deleted_command(days, batch_size):
+        """Mover preguntas y respuestas eliminadas hace tiempo a las tablas de archivo"""
+        from controllers.archive import archive_deleted
+        stats = archive_deleted(
+            days if days is not None else app.config['ARCHIVE_AFTER_DAYS'],
+            batch_size or app.config['ARCHIVE_BATCH_SIZE']
+        )
+        click.echo(f"{stats['questions']} preguntas y {stats['answers']} respuestas archivadas")
+    
+    @app.cli.command('export')
+    @click.option('--output', '-o', type=click.Path(dir_okay=False), required=True,
+                  help='Archivo de salida (.ndjson o .ndjson.gz)')
+    @click.option('--entities', default='', help='users,questions,answers (por defecto todas)')
+    @click.option('--since', default='', help='Exportar solo lo modificado desde esta fecha ISO')
+    @click.option('--batch-size', default=1000, show_default=True)
+    @click.option('--private', is_flag=True,
+                  help='Incluir email, nombre y último acceso (necesarios para import-data)')
+    def export(output, entities, since, batch_size, private):
+        """Exportar el corpus de preguntas y respuestas como NDJSON"""
+        from datetime import datetime
+        from controllers.export import iter_records, iter_ndjson, parse_entities, parse_since
+        try:
+            entities = parse_entities(entities)
+            since = parse_since(since)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        
+        watermark = datetime.utcnow().isoformat()
+        records = iter_records(entities, since, batch_size=batch_size, private=private)
+        with open(output, 'wb') as f:
+            for chunk in iter_ndjson(records, compress=output.endswith('.gz')):
+                f.write(chunk)
+        click.echo(f'Exportación completa. Próximo --since: {watermark}')
+    
+    @app.cli.command('import-data')
+    @click.argument('ndjson_files', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+    @click.option('--users', 'users_csv', type=click.Path(exists=True, dir_okay=False), help='CSV de usuarios')
+    @click.option('--questions', 'questions_csv', type=click.Path(exists=True, dir_okay=False), help='CSV de preguntas')
+    @click.option('--answers', 'answers_csv', type=click.Path(exists=True, dir_okay=False), help='CSV de respuestas')
+    @click.option('--checkpoint', help='Nombre del checkpoint (tabla import_checkpoints) para reanudar')
+    @click.option('--batch-size', default=1000, show_default=True)
+    @click.option('--skip-rebuild', is_flag=True, help='No recalcular datos derivados al terminar')
+    def import_data(ndjson_files, users_csv, questions_csv, answers_csv, checkpoint, batch_size, skip_rebuild):
+        """Importar volcados NDJSON/CSV de usuarios, preguntas y respuestas"""
+        from controllers.importer import Importer, rebuild_derived_data
+        csv_paths = {'users': users_csv, 'questions': questions_csv, 'answers': answers_csv}
+        if not ndjson_files and not any(csv_paths.values()):
+            raise click.UsageError('Indica al menos un archivo NDJSON o CSV')
+        
+        importer = Importer(checkpoint=checkpoint, batch_size=batch_size)
+        stats = importer.run(ndjson_files, csv_paths)
+        for entity, values in stats.items():
+            click.echo(f"{entity}: {values['imported']} importados, {values['merged']} fusionados, "
+                       f"{values['invalid']} inválidos")
+        for error in importer.state['errors'][:20]:
+            click.echo(f"  línea {error['line']} ({error['entity']}): {error['error']}")
+        
+        if not skip_rebuild:
+            click.echo('Recalculando datos derivados...')
+            rebuild_derived_data()
+        click.echo('Importación completa')
@@ -12,6 +12,8 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Sin valor por defecto: el registro es abierto, así que un nombre fijo lo reclamaría cualquiera
+    ADMIN_USERNAMES = [u.strip() for u in os.environ.get('ADMIN_USERNAMES', '').split(',') if u.strip()]
     
     # Configuración de CORS
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',')
@@ -20,10 +22,88 @@ class Config:
     FLASK_ENV = os.environ.get('FLASK_ENV') or 'development'
     DEBUG = FLASK_ENV == 'development'
     
+    # Aplicar migraciones al arrancar (solo desarrollo; en producción usar `flask db-upgrade`)
+    AUTO_CREATE_SCHEMA = os.environ.get('AUTO_CREATE_SCHEMA', str(DEBUG)).lower() == 'true'
+    
     # Configuración de archivos
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = 'uploads'
     
     # Configuración de paginación
     QUESTIONS_PER_PAGE = 20
-    ANSWERS_PER_PAGE = 10 
\ No newline at end of file
+    ANSWERS_PER_PAGE = 10
+    BULK_MAX_IDS = int(os.environ.get('BULK_MAX_IDS', '100'))  # Máximo de IDs en ?ids=
+    
+    # Ranking "hot" (segundos entre recálculos completos; 0 desactiva)
+    HOT_RECOMPUTE_INTERVAL = int(os.environ.get('HOT_RECOMPUTE_INTERVAL', '600'))
+    
+    # Caché de categorías (segundos)
+    CATEGORY_CACHE_TTL = int(os.environ.get('CATEGORY_CACHE_TTL', '300'))
+    
+    # Caché de estadísticas de perfil (segundos)
+    USER_STATS_CACHE_TTL = int(os.environ.get('USER_STATS_CACHE_TTL', '300'))
+    
+    # Leaderboard en memoria: segundos entre recargas completas (recoge cambios de otros workers)
+    LEADERBOARD_MAX_AGE = int(os.environ.get('LEADERBOARD_MAX_AGE', '300'))
+    
+    # Autocompletado de títulos: segundos entre reconstrucciones del índice (recoge votos y vistas)
+    SUGGEST_MAX_AGE = int(os.environ.get('SUGGEST_MAX_AGE', '600'))
+    
+    # Preguntas similares (LSH en memoria): segundos entre recargas en segundo plano de cada worker
+    # (recogen otros workers e importaciones)
+    SIMILARITY_MAX_AGE = int(os.environ.get('SIMILARITY_MAX_AGE', '600'))
+    
+    # Eventos en tiempo real (SSE); con EVENT_BROKER_URL=redis://... se reparten entre workers
+    EVENT_BROKER_URL = os.environ.get('EVENT_BROKER_URL', '')
+    EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '100'))
+    EVENT_HEARTBEAT_SECONDS = int(os.environ.get('EVENT_HEARTBEAT_SECONDS', '15'))
+    
+    # Cola de trabajos diferidos (vacío = en memoria; sqlite:///ruta = durable)
+    JOB_QUEUE_URL = os.environ.get('JOB_QUEUE_URL', '')
+    JOB_QUEUE_ASYNC = os.environ.get('JOB_QUEUE_ASYNC', 'true').lower() == 'true'
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '1'))
+    # Candados de las tareas periódicas entre workers ('' = los de JOB_QUEUE_URL si es sqlite;
+    # si no, por proceso). Con varios workers y cola en memoria: sqlite:///ruta o redis://...
+    JOB_SCHEDULER_LOCK_URL = os.environ.get('JOB_SCHEDULER_LOCK_URL', '')
+    
+    # Notificaciones (reparto en segundo plano por lotes)
+    NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE', '500'))
+    
+    # Archivado de contenido eliminado (segundos entre pasadas; 0 desactiva)
+    ARCHIVE_INTERVAL = int(os.environ.get('ARCHIVE_INTERVAL', '86400'))
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '30'))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '500'))
+    
+    # Rate limiting (token buckets por IP y por usuario; RATELIMITS es "endpoint=N/periodo,...")
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL', '')  # '', sqlite:///ruta o redis://...
+    RATELIMITS = os.environ.get('RATELIMITS') or {
+        'auth.login': '10/minute',
+        'auth.register': '5/minute',
+        'questions.create_question': '10/minute',
+        'answers.create_answer': '20/minute'
+    }
+    
+    # Agrupación de lecturas concurrentes idénticas (single-flight); con una URL
+    # (sqlite:///ruta o redis://...) se coordina también entre workers
+    SINGLEFLIGHT_STORAGE_URL = os.environ.get('SINGLEFLIGHT_STORAGE_URL', '')
+    SINGLEFLIGHT_LOCK_TIMEOUT = float(os.environ.get('SINGLEFLIGHT_LOCK_TIMEOUT', '5'))
+    
+    # Idempotency-Key en los POST de creación (respuestas guardadas IDEMPOTENCY_TTL segundos)
+    IDEMPOTENCY_ENABLED = os.environ.get('IDEMPOTENCY_ENABLED', 'true').lower() == 'true'
+    IDEMPOTENCY_STORAGE_URL = os.environ.get('IDEMPOTENCY_STORAGE_URL', '')  # '', sqlite:///ruta o redis://...
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', '86400'))
+    
+    # Configuración de logging
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')  # Por blueprint, ej: "questions=DEBUG,auth=WARNING"
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # json, text
+    LOG_DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', '0.1'))
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+    
+    # Perfilado bajo demanda (solo administradores): capturas en PROFILING_DIR (vacío = directorio temporal)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'true').lower() == 'true'
+    PROFILING_DIR = os.environ.get('PROFILING_DIR', '')
+    PROFILING_MAX_CAPTURES = int(os.environ.get('PROFILING_MAX_CAPTURES', '50'))
+    PROFILING_MAX_DURATION = int(os.environ.get('PROFILING_MAX_DURATION', '300'))  # Segundos por captura
+    PROFILING_HEADER = os.environ.get('PROFILING_HEADER', 'X-Profile')  # cProfile de una petición
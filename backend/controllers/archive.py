@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, false, insert, select
+
+from models import db, Question, Answer, Tag, QuestionDocument, ArchivedQuestion, ArchivedAnswer, question_tags
+from utils.log import get_logger
+
+logger = get_logger('archive')
+
+QUESTION_FIELDS = ('id', 'title', 'content', 'author_id', 'category_id', 'votes', 'views',
+                   'is_solved', 'created_at', 'updated_at', 'deleted_at')
+ANSWER_FIELDS = ('id', 'content', 'question_id', 'author_id', 'votes', 'is_accepted',
+                 'is_active', 'created_at', 'updated_at', 'deleted_at')
+
+
+def _rows(model, fields, *conditions):
+    columns = [getattr(model, field) for field in fields]
+    return [dict(row) for row in db.session.execute(select(*columns).where(*conditions)).mappings()]
+
+
+def _move_answers(condition, archived_at):
+    """Copiar a answers_archive las respuestas que cumplen condition y borrarlas"""
+    rows = _rows(Answer, ANSWER_FIELDS, condition)
+    if rows:
+        db.session.execute(insert(ArchivedAnswer), [dict(row, archived_at=archived_at) for row in rows])
+        db.session.execute(delete(Answer.__table__).where(condition))
+    return len(rows)
+
+
+def _archive_question_batch(cutoff, batch_size):
+    question_ids = db.session.scalars(
+        select(Question.id)
+        .where(Question.is_active == false(), Question.deleted_at < cutoff)
+        .order_by(Question.deleted_at)
+        .limit(batch_size)
+    ).all()
+    if not question_ids:
+        return 0, 0
+
+    archived_at = datetime.utcnow()
+    tags = {}
+    for question_id, name in db.session.execute(
+        select(question_tags.c.question_id, Tag.name)
+        .join(Tag, Tag.id == question_tags.c.tag_id)
+        .where(question_tags.c.question_id.in_(question_ids))
+        .order_by(Tag.name)
+    ):
+        tags.setdefault(question_id, []).append(name)
+    rows = _rows(Question, QUESTION_FIELDS, Question.id.in_(question_ids))
+    db.session.execute(insert(ArchivedQuestion), [
+        dict(row, tags=tags.get(row['id'], []), archived_at=archived_at) for row in rows
+    ])
+
+    # Dependientes primero (claves foráneas): respuestas, etiquetas y documento
+    answers = _move_answers(Answer.question_id.in_(question_ids), archived_at)
+    db.session.execute(delete(question_tags).where(question_tags.c.question_id.in_(question_ids)))
+    db.session.execute(delete(QuestionDocument).where(QuestionDocument.question_id.in_(question_ids)))
+    db.session.execute(delete(Question.__table__).where(Question.id.in_(question_ids)))
+    db.session.commit()
+    return len(rows), answers
+
+
+def _archive_answer_batch(cutoff, batch_size):
+    answer_ids = db.session.scalars(
+        select(Answer.id)
+        .where(Answer.is_active == false(), Answer.deleted_at < cutoff)
+        .order_by(Answer.deleted_at)
+        .limit(batch_size)
+    ).all()
+    if not answer_ids:
+        return 0
+    moved = _move_answers(Answer.id.in_(answer_ids), datetime.utcnow())
+    db.session.commit()
+    return moved
+
+
+def archive_deleted(older_than_days=30, batch_size=500):
+    """Mover a las tablas de archivo lo eliminado hace más de older_than_days
+
+    Trabaja por lotes de batch_size filas, cada uno en su propia
+    transacción, para no bloquear las tablas principales. Las preguntas
+    se llevan todas sus respuestas; luego se archivan las respuestas
+    eliminadas sueltas de preguntas que siguen activas.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    stats = {'questions': 0, 'answers': 0}
+    while True:
+        questions, answers = _archive_question_batch(cutoff, batch_size)
+        if not questions:
+            break
+        stats['questions'] += questions
+        stats['answers'] += answers
+    while True:
+        answers = _archive_answer_batch(cutoff, batch_size)
+        if not answers:
+            break
+        stats['answers'] += answers
+
+    logger.info('deleted content archived', extra=stats)
+    return stats
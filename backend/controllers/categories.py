@@ -0,0 +1,73 @@
+from flask import current_app
+from sqlalchemy import and_, case, func, select
+
+from models import db, Answer, Category, Question
+from utils.cache import TTLCache
+
+_cache = TTLCache()
+_CACHE_KEY = 'categories'
+
+
+def _last_activity(*values):
+    values = [value for value in values if value is not None]
+    return max(values).isoformat() if values else None
+
+
+def _load_categories():
+    """Categorías activas con sus estadísticas en una sola consulta agregada
+
+    La última actividad es la más reciente entre la edición de una
+    pregunta y la publicación de una respuesta: responder no cambia el
+    updated_at de la pregunta.
+    """
+    # Agregado aparte: unir las respuestas directamente multiplicaría los conteos
+    last_answers = (
+        select(Question.category_id, func.max(Answer.created_at).label('last_answer_at'))
+        .join(Answer, Answer.question_id == Question.id)
+        .where(Question.is_active.is_(True), Answer.is_active.is_(True))
+        .group_by(Question.category_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(
+            Category,
+            func.count(Question.id),
+            func.coalesce(func.sum(case((Question.is_solved.is_(False), 1), else_=0)), 0),
+            func.max(Question.updated_at),
+            func.max(last_answers.c.last_answer_at)
+        )
+        .outerjoin(Question, and_(
+            Question.category_id == Category.id,
+            Question.is_active.is_(True)
+        ))
+        .outerjoin(last_answers, last_answers.c.category_id == Category.id)
+        .where(Category.is_active.is_(True))
+        .group_by(Category.id)
+        .order_by(Category.name)
+    ).all()
+
+    return [
+        category.to_dict(stats={
+            'question_count': question_count,
+            'unsolved_count': unsolved_count,
+            'last_activity': _last_activity(last_question_at, last_answer_at)
+        })
+        for category, question_count, unsolved_count, last_question_at, last_answer_at in rows
+    ]
+
+
+def get_categories():
+    """Obtener las categorías activas (cacheadas en el proceso)"""
+    return _cache.get_or_set(
+        _CACHE_KEY, _load_categories, ttl=current_app.config['CATEGORY_CACHE_TTL']
+    )
+
+
+def get_category(category_id):
+    """Obtener una categoría activa con sus estadísticas, o None"""
+    return next((c for c in get_categories() if c['id'] == category_id), None)
+
+
+def invalidate_category_cache():
+    """Invalidar la caché tras crear/eliminar preguntas o cambiar su categoría"""
+    _cache.invalidate(_CACHE_KEY)
@@ -0,0 +1,178 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+
+from models import db, Question, Answer, QuestionDocument, User
+from utils.jobs import job_queue
+from utils.log import get_logger
+
+logger = get_logger('documents')
+
+# Campos que cambian sin reconstruir el documento: se leen de la fila al servir
+VOLATILE_FIELDS = ('views',)
+
+
+def build_document(question):
+    """Documento de detalle: pregunta y respuestas ordenadas
+
+    Guarda solo el author_id de cada elemento: el resumen del autor
+    (username, reputación) cambia sin tocar la pregunta, así que se
+    añade al servir (ver _attach_authors).
+    """
+    answers = (
+        question.answers
+        .filter_by(is_active=True)
+        .options(undefer(Answer.content_html))
+        .order_by(Answer.is_accepted.desc(), Answer.votes.desc(), Answer.created_at.asc())
+        .all()
+    )
+    document = dict(question.to_dict(include_author=False, include_html=True), author_id=question.author_id)
+    document['answers'] = [
+        dict(answer.to_dict(include_author=False, include_html=True), author_id=answer.author_id)
+        for answer in answers
+    ]
+    for field in VOLATILE_FIELDS:
+        document.pop(field, None)
+    return document
+
+
+def _attach_authors(document):
+    """Sustituir author_id por el resumen actual del autor (una consulta por documento)"""
+    items = [document, *document['answers']]
+    author_ids = {item['author_id'] for item in items if item.get('author_id') is not None}
+    authors = {
+        user_id: {'id': user_id, 'username': username, 'reputation': reputation}
+        for user_id, username, reputation in db.session.execute(
+            select(User.id, User.username, User.reputation).where(User.id.in_(author_ids))
+        )
+    } if author_ids else {}
+    for item in items:
+        author = authors.get(item.pop('author_id', None))
+        if author is not None:
+            item['author'] = author
+        else:
+            item.pop('author', None)
+
+
+def _load_questions(question_ids):
+    return (
+        Question.query
+        .options(undefer(Question.content_html))
+        .filter(Question.id.in_(question_ids))
+        .all()
+    )
+
+
+def rebuild_question_documents(question_ids):
+    """Reconstruir los documentos de estas preguntas (borra los de las inactivas)"""
+    question_ids = set(question_ids)
+    if not question_ids:
+        return 0
+    db.session.execute(delete(QuestionDocument).where(QuestionDocument.question_id.in_(question_ids)))
+    rebuilt = 0
+    for question in _load_questions(question_ids):
+        if question.is_active:
+            db.session.add(QuestionDocument(question_id=question.id, document=build_document(question)))
+            rebuilt += 1
+    db.session.commit()
+    return rebuilt
+
+
+def refresh_question_document(question_id):
+    """Descartar el documento tras una escritura ya confirmada y reconstruirlo en segundo plano
+
+    Hasta que el trabajo termina, get_question_document lo reconstruye al leer.
+    """
+    db.session.execute(delete(QuestionDocument).where(QuestionDocument.question_id == question_id))
+    db.session.commit()
+    job_queue.enqueue('question_documents', {'question_id': question_id})
+
+
+def _strip_html(document):
+    for item in (document, *document['answers']):
+        item.pop('content_html', None)
+    return document
+
+
+def get_question_document(question_id, include_html=False):
+    """Documento de una pregunta activa con sus campos volátiles, o None"""
+    row = db.session.execute(
+        select(QuestionDocument.document, Question.views)
+        .join(Question, Question.id == QuestionDocument.question_id)
+        .where(QuestionDocument.question_id == question_id, Question.is_active.is_(True))
+    ).first()
+    if row is not None:
+        document, views = row
+    else:
+        question = db.session.get(Question, question_id)
+        if question is None or not question.is_active:
+            return None
+        document = build_document(question)
+        views = question.views
+        try:
+            db.session.add(QuestionDocument(question_id=question_id, document=document,
+                                            built_at=datetime.utcnow()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Otra petición lo guardó primero
+    # Copia: el documento puede venir del identity map o ser el recién guardado
+    document = dict(document, answers=[dict(answer) for answer in document['answers']])
+    _attach_authors(document)
+    if not include_html:
+        document = _strip_html(document)
+    return dict(document, views=views)
+
+
+def check_question_documents(batch_size=500, repair=False):
+    """Comparar los documentos guardados con las tablas normalizadas
+
+    Cuenta documentos desactualizados, faltantes (preguntas activas sin
+    documento, algo normal antes de la primera lectura) y huérfanos
+    (documentos de preguntas inactivas o inexistentes). Con repair=True
+    reconstruye los desactualizados y faltantes y elimina los huérfanos.
+    """
+    stats = {'checked': 0, 'stale': 0, 'missing': 0, 'orphaned': 0}
+    mismatched = []
+    missing = []
+
+    orphans = db.session.scalars(
+        select(QuestionDocument.question_id)
+        .outerjoin(Question, Question.id == QuestionDocument.question_id)
+        .where((Question.id.is_(None)) | (Question.is_active.is_not(True)))
+    ).all()
+    stats['orphaned'] = len(orphans)
+    mismatched.extend(orphans)
+
+    last_id = 0
+    while True:
+        question_ids = db.session.scalars(
+            select(Question.id)
+            .where(Question.is_active.is_(True), Question.id > last_id)
+            .order_by(Question.id)
+            .limit(batch_size)
+        ).all()
+        if not question_ids:
+            break
+        last_id = question_ids[-1]
+        stored = dict(db.session.execute(
+            select(QuestionDocument.question_id, QuestionDocument.document)
+            .where(QuestionDocument.question_id.in_(question_ids))
+        ).all())
+        for question in _load_questions(question_ids):
+            stats['checked'] += 1
+            if question.id not in stored:
+                stats['missing'] += 1
+                missing.append(question.id)
+            elif stored[question.id] != build_document(question):
+                stats['stale'] += 1
+                mismatched.append(question.id)
+                logger.warning('stale question document', extra={'question_id': question.id})
+        db.session.expunge_all()  # Acotar la memoria en recorridos largos
+
+    if repair:
+        to_rebuild = mismatched + missing
+        for start in range(0, len(to_rebuild), batch_size):
+            rebuild_question_documents(to_rebuild[start:start + batch_size])
+    return stats
@@ -0,0 +1,141 @@
+import itertools
+import json
+import queue
+import threading
+
+from utils.log import get_logger
+
+logger = get_logger('events')
+
+
+class Subscription:
+    """Cola de eventos de un cliente suscrito a un canal"""
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # Cliente lento: descartar el evento más antiguo en lugar de bloquear
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(event)
+
+    def get(self, timeout):
+        """Siguiente evento o None si se agota el tiempo de espera"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Pub/sub en memoria: reparte eventos a los suscriptores de este proceso"""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def _deliver(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def publish(self, channel, event_type, data):
+        event = {'id': next(self._ids), 'type': event_type, 'data': data}
+        self._deliver(channel, event)
+
+
+class RedisBroker(InProcessBroker):
+    """Broker para varios workers: publica en Redis y reparte localmente
+
+    Cada proceso escucha el patrón de canales en un hilo y entrega los
+    mensajes a sus propios suscriptores, así un evento publicado en un
+    worker llega a los clientes conectados a cualquier otro.
+    """
+
+    def __init__(self, url, queue_size=100, prefix='studentoverflow:events:'):
+        super().__init__(queue_size)
+        import redis  # Dependencia opcional, solo necesaria con EVENT_BROKER_URL
+
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(f'{prefix}*')
+        self._thread = threading.Thread(target=self._listen, name='event-broker', daemon=True)
+        self._thread.start()
+
+    def _listen(self):
+        for message in self._pubsub.listen():
+            try:
+                channel = message['channel'].decode()[len(self.prefix):]
+                self._deliver(channel, json.loads(message['data']))
+            except Exception:
+                logger.exception('Error procesando evento de Redis')
+
+    def publish(self, channel, event_type, data):
+        event = {'id': self._redis.incr(f'{self.prefix}seq'), 'type': event_type, 'data': data}
+        self._redis.publish(f'{self.prefix}{channel}', json.dumps(event, default=str))
+
+
+_broker = None
+
+
+def init_events(app):
+    """Crear el broker configurado (EVENT_BROKER_URL vacío = en memoria)"""
+    global _broker
+    url = app.config['EVENT_BROKER_URL']
+    queue_size = app.config['EVENT_QUEUE_SIZE']
+    _broker = RedisBroker(url, queue_size) if url else InProcessBroker(queue_size)
+    return _broker
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = InProcessBroker()
+    return _broker
+
+
+def question_channel(question_id):
+    return f'question:{question_id}'
+
+
+def publish_question_event(question_id, event_type, data):
+    """Publicar un evento del canal de una pregunta; nunca rompe el request"""
+    try:
+        get_broker().publish(question_channel(question_id), event_type, data)
+    except Exception:
+        logger.exception('Error publicando evento', extra={'event_type': event_type})
@@ -0,0 +1,148 @@
+import json
+import zlib
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+from models import db, User, Question, Answer
+
+EXPORT_ENTITIES = ('users', 'questions', 'answers')
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _user_record(user, private=False):
+    # Sin password_hash: el volcado es para analítica. Los datos personales
+    # (email, nombre, último acceso) solo con private, p. ej. para migrar con import-data
+    record = {
+        'type': 'user',
+        'id': user.id,
+        'username': user.username,
+        'bio': user.bio,
+        'avatar_url': user.avatar_url,
+        'university': user.university,
+        'major': user.major,
+        'reputation': user.reputation,
+        'created_at': _iso(user.created_at),
+        'updated_at': _iso(user.updated_at),
+        'is_active': user.is_active,
+        'is_verified': user.is_verified
+    }
+    if private:
+        record.update({
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'last_login': _iso(user.last_login)
+        })
+    return record
+
+
+def _question_record(question):
+    return {
+        'type': 'question',
+        'id': question.id,
+        'title': question.title,
+        'content': question.content,
+        'author_id': question.author_id,
+        'category_id': question.category_id,
+        'tags': [tag.name for tag in question.tags],
+        'votes': question.votes,
+        'views': question.views,
+        'created_at': _iso(question.created_at),
+        'updated_at': _iso(question.updated_at),
+        'deleted_at': _iso(question.deleted_at),
+        'is_active': question.is_active,
+        'is_solved': question.is_solved
+    }
+
+
+def _answer_record(answer):
+    return {
+        'type': 'answer',
+        'id': answer.id,
+        'content': answer.content,
+        'question_id': answer.question_id,
+        'author_id': answer.author_id,
+        'votes': answer.votes,
+        'is_accepted': answer.is_accepted,
+        'created_at': _iso(answer.created_at),
+        'updated_at': _iso(answer.updated_at),
+        'deleted_at': _iso(answer.deleted_at),
+        'is_active': answer.is_active
+    }
+
+
+def _queries(since, private=False):
+    """(consulta, serializador) por entidad; since filtra por updated_at"""
+    users = select(User).order_by(User.id)
+    questions = select(Question).options(selectinload(Question.tags)).order_by(Question.id)
+    answers = select(Answer).order_by(Answer.id)
+    if since:
+        users = users.where(func.coalesce(User.updated_at, User.created_at) >= since)
+        questions = questions.where(Question.updated_at >= since)
+        answers = answers.where(Answer.updated_at >= since)
+    return {
+        'users': (users, lambda user: _user_record(user, private)),
+        'questions': (questions, _question_record),
+        'answers': (answers, _answer_record)
+    }
+
+
+def iter_records(entities=EXPORT_ENTITIES, since=None, batch_size=1000, private=False):
+    """Recorrer las entidades con yield_per (cursor del servidor) a memoria constante"""
+    queries = _queries(since, private)
+    for entity in entities:
+        statement, serialize = queries[entity]
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        for obj in result.scalars():
+            yield serialize(obj)
+        # Liberar los objetos ya emitidos antes de pasar a la siguiente entidad
+        db.session.expunge_all()
+
+
+def iter_ndjson(records, compress=False):
+    """Serializar registros como NDJSON (opcionalmente gzip) en trozos de bytes"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # 31 = formato gzip
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= 64 * 1024:
+            chunk = ''.join(buffer).encode()
+            buffer, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+    chunk = ''.join(buffer).encode()
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def parse_entities(raw):
+    """Validar la lista de entidades a exportar ("users,questions")"""
+    if not raw:
+        return list(EXPORT_ENTITIES)
+    entities = [e.strip() for e in raw.split(',') if e.strip()]
+    invalid = [e for e in entities if e not in EXPORT_ENTITIES]
+    if invalid:
+        raise ValueError(f'Entidades inválidas: {", ".join(invalid)}')
+    return entities
+
+
+def parse_since(raw):
+    """Marca de agua ISO 8601 (o None para exportar todo)"""
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError('El parámetro since debe ser una fecha ISO 8601')
@@ -0,0 +1,368 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm.attributes import flag_modified
+
+from models import db, User, Question, Answer, Category, ImportCheckpoint, ImportIdMap, Tag, question_tags
+from controllers.tags import normalize_tags, get_or_create_tags
+from utils.log import get_logger
+
+logger = get_logger('importer')
+
+IMPORT_ORDER = ('users', 'questions', 'answers')
+_RECORD_TYPES = {'user': 'users', 'question': 'questions', 'answer': 'answers'}
+UNUSABLE_PASSWORD = '!'  # check_password_hash siempre falla: el usuario debe restablecerla
+MAX_REPORTED_ERRORS = 100
+
+
+def _open(path):
+    return gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') else open(path, encoding='utf-8')
+
+
+def read_ndjson(path, entity):
+    """(número de línea, registro) de un volcado NDJSON, solo del tipo pedido"""
+    with _open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if _RECORD_TYPES.get(record.get('type')) == entity:
+                yield line_no, record
+
+
+def read_csv(path):
+    """(número de línea, registro) de un CSV con encabezados"""
+    with _open(path) as f:
+        for line_no, record in enumerate(csv.DictReader(f), 1):
+            yield line_no, record
+
+
+def _datetime(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def _bool(value, default=False):
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 't')
+
+
+def _int(value, default=0):
+    return int(value) if value not in (None, '') else default
+
+
+class InvalidRecord(Exception):
+    """Registro inválido (se cuenta y se omite)"""
+
+
+class Importer:
+    """Importación por lotes con remapeo de IDs y checkpoints reanudables
+
+    El checkpoint guarda, por fuente, la última línea confirmada, de modo
+    que una importación interrumpida continúa donde quedó sin duplicar
+    lotes ya confirmados. Vive en la tabla import_checkpoints y los mapas
+    de IDs originales -> nuevos en import_id_maps (solo se insertan los
+    del lote); ambos se escriben en la transacción de cada lote: o se
+    confirman con los datos o no se confirma nada.
+    """
+
+    def __init__(self, checkpoint=None, batch_size=1000):
+        self.checkpoint = None
+        self.batch_size = batch_size
+        self.state = {
+            'positions': {},
+            'stats': {entity: {'imported': 0, 'merged': 0, 'invalid': 0} for entity in IMPORT_ORDER},
+            'errors': []
+        }
+        if checkpoint:
+            self.checkpoint = db.session.get(ImportCheckpoint, checkpoint)
+            if self.checkpoint is not None:
+                self.state = self.checkpoint.state
+                logger.info('import checkpoint loaded', extra={'checkpoint': checkpoint})
+            else:
+                self.checkpoint = ImportCheckpoint(name=checkpoint)
+        self._id_maps = {}  # entidad -> {ID original: ID nuevo}, cargado al primer uso
+        self._new_ids = {}  # (entidad, ID original) -> ID nuevo del lote en curso
+        self._category_ids = None
+
+    # --- Checkpoints -------------------------------------------------------
+
+    def _save_checkpoint(self):
+        """Anotar el estado en la transacción en curso (se confirma con el lote)"""
+        if self.checkpoint is None:
+            return
+        self.checkpoint.state = self.state
+        flag_modified(self.checkpoint, 'state')  # Mismo dict mutado: forzar el UPDATE
+        db.session.add(self.checkpoint)
+        if self._new_ids:
+            db.session.execute(insert(ImportIdMap), [
+                {'checkpoint': self.checkpoint.name, 'entity': entity, 'old_id': old_id, 'new_id': new_id}
+                for (entity, old_id), new_id in self._new_ids.items()
+            ])
+            self._new_ids = {}
+
+    def _id_map(self, entity):
+        if entity not in self._id_maps:
+            mapping = {}
+            if self.checkpoint is not None:
+                mapping = dict(db.session.execute(
+                    select(ImportIdMap.old_id, ImportIdMap.new_id)
+                    .where(ImportIdMap.checkpoint == self.checkpoint.name, ImportIdMap.entity == entity)
+                ).all())
+            self._id_maps[entity] = mapping
+        return self._id_maps[entity]
+
+    def _map(self, entity, old_id):
+        return self._id_map(entity).get(str(old_id))
+
+    def _remember(self, entity, old_id, new_id):
+        self._id_map(entity)[str(old_id)] = new_id
+        if self.checkpoint is not None:
+            self._new_ids[(entity, str(old_id))] = new_id
+
+    def _invalid(self, entity, line_no, message):
+        self.state['stats'][entity]['invalid'] += 1
+        if len(self.state['errors']) < MAX_REPORTED_ERRORS:
+            self.state['errors'].append({'entity': entity, 'line': line_no, 'error': message})
+
+    # --- Conversión y validación por entidad --------------------------------
+
+    def _user_row(self, record):
+        for field in ('id', 'username', 'email', 'first_name', 'last_name'):
+            if not record.get(field):
+                raise InvalidRecord(f'Falta el campo {field}')
+        if len(record['username']) > 80 or len(record['email']) > 120:
+            raise InvalidRecord('username o email demasiado largo')
+        return {
+            'username': record['username'],
+            'email': record['email'],
+            'password_hash': record.get('password_hash') or UNUSABLE_PASSWORD,
+            'first_name': record['first_name'][:50],
+            'last_name': record['last_name'][:50],
+            'bio': record.get('bio') or None,
+            'avatar_url': record.get('avatar_url') or None,
+            'university': record.get('university') or None,
+            'major': record.get('major') or None,
+            'reputation': max(_int(record.get('reputation')), 0),
+            'created_at': _datetime(record.get('created_at')) or datetime.utcnow(),
+            'updated_at': _datetime(record.get('updated_at')) or datetime.utcnow(),
+            'last_login': _datetime(record.get('last_login')),
+            'is_active': _bool(record.get('is_active'), True),
+            'is_verified': _bool(record.get('is_verified'))
+        }
+
+    def _question_row(self, record):
+        if not record.get('id') or not record.get('title') or not record.get('content'):
+            raise InvalidRecord('Faltan id, title o content')
+        if len(record['title']) > 200:
+            raise InvalidRecord('title demasiado largo')
+        author_id = self._map('users', record.get('author_id'))
+        if author_id is None:
+            raise InvalidRecord(f"author_id desconocido: {record.get('author_id')}")
+        category_id = _int(record.get('category_id'), None)
+        created_at = _datetime(record.get('created_at')) or datetime.utcnow()
+        updated_at = _datetime(record.get('updated_at')) or created_at
+        is_active = _bool(record.get('is_active'), True)
+        return {
+            'title': record['title'],
+            'content': record['content'],
+            'author_id': author_id,
+            'category_id': category_id if category_id in self._category_ids else None,
+            'votes': _int(record.get('votes')),
+            'views': max(_int(record.get('views')), 0),
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'deleted_at': _datetime(record.get('deleted_at')) or (None if is_active else updated_at),
+            'is_active': is_active,
+            'is_solved': _bool(record.get('is_solved'))
+        }
+
+    def _answer_row(self, record):
+        if not record.get('id') or not record.get('content'):
+            raise InvalidRecord('Faltan id o content')
+        question_id = self._map('questions', record.get('question_id'))
+        if question_id is None:
+            raise InvalidRecord(f"question_id desconocido: {record.get('question_id')}")
+        author_id = self._map('users', record.get('author_id'))
+        if author_id is None:
+            raise InvalidRecord(f"author_id desconocido: {record.get('author_id')}")
+        created_at = _datetime(record.get('created_at')) or datetime.utcnow()
+        updated_at = _datetime(record.get('updated_at')) or created_at
+        is_active = _bool(record.get('is_active'), True)
+        return {
+            'content': record['content'],
+            'question_id': question_id,
+            'author_id': author_id,
+            'votes': _int(record.get('votes')),
+            'is_accepted': _bool(record.get('is_accepted')),
+            'created_at': created_at,
+            'updated_at': updated_at,
+            'deleted_at': _datetime(record.get('deleted_at')) or (None if is_active else updated_at),
+            'is_active': is_active
+        }
+
+    # --- Inserción por lotes ------------------------------------------------
+
+    def _insert(self, model, rows):
+        """INSERT por lote devolviendo los IDs nuevos en el orden de rows"""
+        result = db.session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        )
+        return [row[0] for row in result]
+
+    def _flush_users(self, batch):
+        # Usuarios ya existentes (mismo username o email) se fusionan, no se duplican
+        usernames = [row['username'] for _, row in batch]
+        emails = [row['email'] for _, row in batch]
+        existing = db.session.execute(
+            select(User.id, User.username, User.email)
+            .where(User.username.in_(usernames) | User.email.in_(emails))
+        ).all()
+        by_username = {username: user_id for user_id, username, _ in existing}
+        by_email = {email: user_id for user_id, _, email in existing}
+
+        to_insert = []
+        pending = {}  # Duplicados dentro del mismo lote apuntan al primer registro
+        aliases = []
+        for old_id, row in batch:
+            keys = (('username', row['username']), ('email', row['email']))
+            user_id = by_username.get(row['username']) or by_email.get(row['email'])
+            if user_id:
+                self._remember('users', old_id, user_id)
+                self.state['stats']['users']['merged'] += 1
+            elif any(key in pending for key in keys):
+                aliases.append((old_id, next(pending[key] for key in keys if key in pending)))
+            else:
+                pending.update((key, old_id) for key in keys)
+                to_insert.append((old_id, row))
+
+        new_ids = self._insert(User, [row for _, row in to_insert]) if to_insert else []
+        for (old_id, _), new_id in zip(to_insert, new_ids):
+            self._remember('users', old_id, new_id)
+        for old_id, first_old_id in aliases:
+            self._remember('users', old_id, self._map('users', first_old_id))
+        self.state['stats']['users']['imported'] += len(new_ids)
+        self.state['stats']['users']['merged'] += len(aliases)
+
+    def _flush_questions(self, batch):
+        new_ids = self._insert(Question, [row for _, row, _ in batch])
+        links = []
+        tags_by_name = {tag.name: tag for tag in get_or_create_tags(
+            sorted({name for _, _, names in batch for name in names})
+        )}
+        db.session.flush()
+        for (old_id, _, names), new_id in zip(batch, new_ids):
+            self._remember('questions', old_id, new_id)
+            links.extend({'question_id': new_id, 'tag_id': tags_by_name[name].id} for name in names)
+        if links:
+            db.session.execute(insert(question_tags), links)
+        self.state['stats']['questions']['imported'] += len(new_ids)
+
+    def _flush_answers(self, batch):
+        new_ids = self._insert(Answer, [row for _, row in batch])
+        for (old_id, _), new_id in zip(batch, new_ids):
+            self._remember('answers', old_id, new_id)
+        self.state['stats']['answers']['imported'] += len(new_ids)
+
+    def import_entity(self, entity, records, source_key):
+        """Importar registros (número de línea, dict) de una entidad desde una fuente"""
+        if self._category_ids is None:
+            self._category_ids = set(db.session.scalars(select(Category.id)))
+
+        position_key = f'{source_key}:{entity}'
+        start_after = self.state['positions'].get(position_key, 0)
+        batch = []
+        last_line = start_after
+
+        def flush():
+            if batch:
+                getattr(self, f'_flush_{entity}')(batch)
+                batch.clear()
+            self.state['positions'][position_key] = last_line
+            self._save_checkpoint()
+            db.session.commit()
+
+        for line_no, record in records:
+            if line_no <= start_after:
+                continue
+            last_line = line_no
+            try:
+                if self._map(entity, record.get('id')) is not None:
+                    continue  # Ya importado en una ejecución anterior
+                if entity == 'users':
+                    batch.append((record['id'], self._user_row(record)))
+                elif entity == 'questions':
+                    names = normalize_tags(record.get('tags'))
+                    batch.append((record['id'], self._question_row(record), names))
+                else:
+                    batch.append((record['id'], self._answer_row(record)))
+            except (InvalidRecord, ValueError) as e:
+                self._invalid(entity, line_no, str(e))
+
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+
+        logger.info('entity imported', extra={'entity': entity, 'source': source_key,
+                                              **self.state['stats'][entity]})
+
+    def run(self, ndjson_paths=(), csv_paths=None):
+        """Importar volcados NDJSON (con 'type') y/o CSV por entidad, en orden"""
+        csv_paths = csv_paths or {}
+        for entity in IMPORT_ORDER:
+            for path in ndjson_paths:
+                self.import_entity(entity, read_ndjson(path, entity), os.path.abspath(path))
+            if csv_paths.get(entity):
+                path = csv_paths[entity]
+                self.import_entity(entity, read_csv(path), os.path.abspath(path))
+        return self.state['stats']
+
+
+def rebuild_derived_data():
+    """Recalcular en una pasada los datos derivados tras una importación"""
+    from controllers.categories import invalidate_category_cache
+    from controllers.leaderboard import leaderboard
+    from controllers.ranking import recompute_hot_scores
+    from controllers.similarity import backfill_signatures, similarity_index
+
+    # Contadores de etiquetas: preguntas activas por etiqueta
+    active_count = (
+        select(func.count())
+        .select_from(question_tags.join(Question, Question.id == question_tags.c.question_id))
+        .where(question_tags.c.tag_id == Tag.id, Question.is_active.is_(True))
+        .scalar_subquery()
+    )
+    db.session.execute(update(Tag).values(question_count=active_count))
+    
+    # Respuestas activas por pregunta (las importadas no pasan por las rutas)
+    answer_count = (
+        select(func.count())
+        .select_from(Answer)
+        .where(Answer.question_id == Question.id, Answer.is_active.is_(True))
+        .scalar_subquery()
+    )
+    db.session.execute(
+        update(Question)
+        .values(answer_count=answer_count, updated_at=Question.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    recompute_hot_scores()
+
+    # Firmas MinHash de las preguntas importadas; los demás workers las ven al recargar
+    backfill_signatures()
+    similarity_index.invalidate()
+
+    invalidate_category_cache()
+    leaderboard.invalidate()  # Los usuarios se insertaron sin pasar por el ORM
@@ -0,0 +1,159 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import chain
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models import db, User
+from utils.log import get_logger
+
+logger = get_logger('leaderboard')
+
+SCOPES = ('global', 'university', 'major')
+_TRACKED = ('reputation', 'university', 'major', 'is_active')
+
+
+def scope_key(scope, value=None):
+    """Clave de un ranking: ('global', None) o (campo, valor normalizado)"""
+    if scope == 'global':
+        return ('global', None)
+    value = (value or '').strip().lower()
+    return (scope, value) if value else None
+
+
+class Leaderboard:
+    """Rankings de reputación en memoria: uno global y uno por universidad y carrera
+
+    Cada ranking es una lista ordenada de (-reputación, user_id), de modo
+    que una página es un slice y el puesto de una reputación es una
+    búsqueda binaria. Los cambios confirmados por este proceso se aplican
+    al momento (ver _apply_committed_changes); los de otros procesos o de
+    escrituras en bloque se recogen al recargar cada max_age segundos.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._rankings = {}
+        self._users = {}  # user_id -> (reputación, universidad, carrera)
+        self._loaded_at = None
+
+    def _scopes(self, university, major):
+        keys = [('global', None), scope_key('university', university), scope_key('major', major)]
+        return [key for key in keys if key]
+
+    def _add(self, user_id, reputation, university, major):
+        self._users[user_id] = (reputation, university, major)
+        for key in self._scopes(university, major):
+            insort(self._rankings.setdefault(key, []), (-reputation, user_id))
+
+    def _remove(self, user_id):
+        current = self._users.pop(user_id, None)
+        if current is None:
+            return
+        reputation, university, major = current
+        for key in self._scopes(university, major):
+            ranking = self._rankings.get(key)
+            position = bisect_left(ranking, (-reputation, user_id))
+            if position < len(ranking) and ranking[position] == (-reputation, user_id):
+                del ranking[position]
+            if not ranking:
+                del self._rankings[key]
+
+    def ensure_loaded(self):
+        """Cargar (o recargar si tiene más de max_age segundos) desde users"""
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < self.max_age:
+            return
+        with self._lock:
+            if self._loaded_at is not loaded_at:
+                return  # Otro hilo acaba de recargar
+            rows = db.session.execute(
+                select(User.id, User.reputation, User.university, User.major)
+                .where(User.is_active.is_(True))
+            ).all()
+            self._rankings = {}
+            self._users = {}
+            for user_id, reputation, university, major in rows:
+                self._users[user_id] = (reputation or 0, university, major)
+                for key in self._scopes(university, major):
+                    self._rankings.setdefault(key, []).append((-(reputation or 0), user_id))
+            for ranking in self._rankings.values():
+                ranking.sort()
+            self._loaded_at = time.monotonic()
+            logger.info('leaderboard loaded', extra={'users': len(self._users), 'rankings': len(self._rankings)})
+
+    def invalidate(self):
+        """Forzar una recarga completa en la próxima consulta (tras escrituras en bloque)"""
+        self._loaded_at = None
+
+    def update(self, user_id, reputation, university, major, is_active=True):
+        """Reflejar el estado confirmado de un usuario"""
+        if self._loaded_at is None:
+            return  # Se incluirá al cargar
+        with self._lock:
+            self._remove(user_id)
+            if is_active:
+                self._add(user_id, reputation or 0, university, major)
+
+    def page(self, key, page=1, per_page=20):
+        """(total, [(puesto, user_id, reputación)]) de una página del ranking
+
+        Empates comparten puesto (1, 2, 2, 4) y se ordenan por antigüedad
+        de la cuenta (user_id).
+        """
+        self.ensure_loaded()
+        with self._lock:
+            ranking = self._rankings.get(key, [])
+            start = (page - 1) * per_page
+            entries = ranking[start:start + per_page]
+            return len(ranking), [
+                (bisect_left(ranking, (negative, 0)) + 1, user_id, -negative)
+                for negative, user_id in entries
+            ]
+
+    def rank(self, user_id, key=('global', None)):
+        """Puesto de un usuario en un ranking (None si no aparece)"""
+        self.ensure_loaded()
+        with self._lock:
+            current = self._users.get(user_id)
+            if current is None or key not in self._scopes(current[1], current[2]):
+                return None
+            return bisect_left(self._rankings[key], (-current[0], 0)) + 1
+
+
+leaderboard = Leaderboard()
+
+
+# --- Actualización incremental a partir de las escrituras del ORM ------------
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_user_changes(session, flush_context):
+    """Anotar los usuarios cuya reputación, universidad, carrera o estado cambió"""
+    changed = session.info.setdefault('leaderboard_users', {})
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if obj in session.deleted:
+            changed[obj.id] = (None, None, None, False)
+        elif obj in session.new or any(state.attrs[name].history.has_changes() for name in _TRACKED):
+            changed[obj.id] = (obj.reputation, obj.university, obj.major, obj.is_active is not False)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_changes(session):
+    for user_id, values in session.info.pop('leaderboard_users', {}).items():
+        leaderboard.update(user_id, *values)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_user_changes(session):
+    session.info.pop('leaderboard_users', None)
+
+
+def init_leaderboard(app):
+    leaderboard.max_age = app.config['LEADERBOARD_MAX_AGE']
@@ -0,0 +1,90 @@
+from sqlalchemy import func, insert, select
+
+from models import db, Answer, Notification
+from utils.jobs import job_queue
+from utils.log import get_logger
+
+logger = get_logger('notifications')
+
+
+def answer_created_event(answer, question, actor):
+    """Datos del evento de nueva respuesta, capturados dentro del request"""
+    return {
+        'type': 'answer_created',
+        'actor_id': actor.id,
+        'actor_username': actor.username,
+        'question_id': question.id,
+        'question_title': question.title,
+        'question_author_id': question.author_id,
+        'answer_id': answer.id,
+    }
+
+
+def answer_accepted_event(answer, question, actor):
+    """Datos del evento de respuesta aceptada"""
+    return {
+        'type': 'answer_accepted',
+        'actor_id': actor.id,
+        'actor_username': actor.username,
+        'question_id': question.id,
+        'question_title': question.title,
+        'answer_author_id': answer.author_id,
+        'answer_id': answer.id,
+    }
+
+
+def fan_out(events):
+    """Convertir un lote de eventos en filas de bandeja de entrada
+
+    Una nueva respuesta notifica al autor de la pregunta y a quienes ya
+    respondieron; una aceptada, al autor de la respuesta. Los participantes
+    de todas las preguntas del lote se resuelven con una sola consulta.
+    """
+    question_ids = {e['question_id'] for e in events if e['type'] == 'answer_created'}
+    participants = {}
+    if question_ids:
+        rows = db.session.execute(
+            select(Answer.question_id, Answer.author_id, func.min(Answer.id))
+            .where(Answer.question_id.in_(question_ids), Answer.is_active.is_(True))
+            .group_by(Answer.question_id, Answer.author_id)
+        )
+        for question_id, author_id, first_answer_id in rows:
+            participants.setdefault(question_id, []).append((first_answer_id, author_id))
+
+    inbox_rows = []
+    for event in events:
+        if event['type'] == 'answer_created':
+            # Solo quienes respondieron antes que esta respuesta
+            recipients = {event['question_author_id']} | {
+                author_id for first_answer_id, author_id in participants.get(event['question_id'], ())
+                if first_answer_id < event['answer_id']
+            }
+        else:
+            recipients = {event['answer_author_id']}
+        recipients.discard(event['actor_id'])
+
+        for user_id in sorted(recipients):
+            inbox_rows.append({
+                'user_id': user_id,
+                'type': event['type'],
+                'actor_id': event['actor_id'],
+                'actor_username': event['actor_username'],
+                'question_id': event['question_id'],
+                'question_title': event['question_title'],
+                'answer_id': event['answer_id'],
+                'is_read': False,
+            })
+
+    if inbox_rows:
+        db.session.execute(insert(Notification), inbox_rows)
+    db.session.commit()
+    return len(inbox_rows)
+
+
+def notify(event):
+    """Encolar un evento de notificación; nunca rompe el request"""
+    try:
+        job_queue.enqueue('notifications', event)
+    except Exception:
+        logger.exception('Error encolando notificación', extra={'event_type': event.get('type')})
+        db.session.rollback()
@@ -0,0 +1,60 @@
+from sqlalchemy import bindparam, select, update
+
+from models import db, Question
+from utils.log import get_logger
+
+logger = get_logger('ranking')
+
+
+def _update_hot_scores(conditions, limit=None):
+    """Recalcular y guardar el score hot de las preguntas que cumplen conditions"""
+    query = (
+        select(
+            Question.id, Question.votes, Question.views, Question.created_at,
+            Question.updated_at, Question.answer_count
+        )
+        .where(Question.is_active.is_(True), *conditions)
+        .order_by(Question.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    rows = db.session.execute(query).all()
+
+    if rows:
+        params = [
+            {
+                'question_id': question_id,
+                'hot_score': Question.compute_hot_score(votes, views, answer_count, created_at),
+                # Conservar updated_at: recalcular el score no es una edición
+                'updated_at': updated_at,
+            }
+            for question_id, votes, views, created_at, updated_at, answer_count in rows
+        ]
+        # UPDATE de Core: no es una edición, así que no incrementa la versión de la fila
+        questions = Question.__table__
+        db.session.execute(update(questions).where(questions.c.id == bindparam('question_id')), params)
+    db.session.commit()
+    return rows
+
+
+def refresh_hot_scores(question_ids):
+    """Recalcular el score hot de un conjunto de preguntas (actualización incremental)"""
+    question_ids = list(set(question_ids))
+    if question_ids:
+        _update_hot_scores([Question.id.in_(question_ids)])
+    return len(question_ids)
+
+
+def recompute_hot_scores(batch_size=1000):
+    """Recalcular el score hot de todas las preguntas activas por lotes"""
+    last_id = 0
+    updated = 0
+    while True:
+        rows = _update_hot_scores([Question.id > last_id], limit=batch_size)
+        if not rows:
+            break
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+    logger.info('hot scores recomputed', extra={'questions': updated})
+    return updated
@@ -0,0 +1,264 @@
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+
+from sqlalchemy import bindparam, select, true, update
+
+from models import db, Question
+from utils.log import get_logger
+
+logger = get_logger('similarity')
+
+NUM_PERM = 64
+BANDS = 32  # 32 bandas x 2 filas: candidatos a partir de ~0.2 de similitud
+ROWS = NUM_PERM // BANDS
+MAX_CONTENT_TOKENS = 100
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)  # Semilla fija: las firmas guardadas deben ser estables
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+_STOPWORDS = {
+    'que', 'como', 'para', 'por', 'con', 'una', 'los', 'las', 'del', 'sus', 'mas',
+    'este', 'esta', 'hay', 'cual', 'cuando', 'donde', 'pero', 'sobre', 'entre',
+    'the', 'and', 'for', 'with', 'how', 'what', 'why', 'does', 'this', 'that',
+}
+
+
+def _tokens(text):
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return [t for t in _TOKEN_RE.findall(text) if len(t) > 2 and t not in _STOPWORDS]
+
+
+def _shingles(title, content):
+    """Palabras y bigramas del título más las primeras palabras del contenido"""
+    title_tokens = _tokens(title)
+    shingles = set(title_tokens)
+    shingles.update(f'{a} {b}' for a, b in zip(title_tokens, title_tokens[1:]))
+    shingles.update(_tokens(content)[:MAX_CONTENT_TOKENS])
+    return shingles
+
+
+def compute_signature(title, content):
+    """Firma MinHash de un título y contenido (None si no hay texto útil)"""
+    hashes = [zlib.crc32(s.encode()) for s in _shingles(title, content)]
+    if not hashes:
+        return None
+    return array('Q', (min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS))
+
+
+def signature_to_bytes(signature):
+    # b'' (y no NULL) para "sin texto útil": NULL marca las firmas pendientes de calcular
+    return signature.tobytes() if signature is not None else b''
+
+
+def signature_from_bytes(data):
+    if not data:
+        return None
+    signature = array('Q')
+    signature.frombytes(data)
+    return signature if len(signature) == NUM_PERM else None
+
+
+class SimilarityIndex:
+    """Índice LSH en memoria sobre las firmas MinHash de las preguntas activas
+
+    Las escrituras de este proceso se aplican al momento (tarea
+    similarity_index); las de otros workers y las importaciones en bloque
+    se recogen con la tarea periódica similarity_reload, que reconstruye
+    el índice fuera del candado y lo sustituye de una vez: las consultas
+    solo leen y nunca esperan a una recarga. La carga solo lee firmas
+    guardadas: las que faltan las calcula la tarea similarity_backfill.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._signatures = {}
+        self._buckets = {}
+        self._loaded_at = None
+        self._pending = None  # Cambios recibidos durante una recarga: se reaplican al publicarla
+
+    @staticmethod
+    def _band_keys(signature):
+        return [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+    @classmethod
+    def _add(cls, signatures, buckets, question_id, signature):
+        signatures[question_id] = signature
+        for key in cls._band_keys(signature):
+            buckets.setdefault(key, set()).add(question_id)
+
+    @classmethod
+    def _remove(cls, signatures, buckets, question_id):
+        signature = signatures.pop(question_id, None)
+        if signature is None:
+            return
+        for key in cls._band_keys(signature):
+            bucket = buckets.get(key)
+            if bucket:
+                bucket.discard(question_id)
+                if not bucket:
+                    del buckets[key]
+
+    @classmethod
+    def _apply(cls, signatures, buckets, question_id, signature):
+        cls._remove(signatures, buckets, question_id)
+        if signature is not None:
+            cls._add(signatures, buckets, question_id, signature)
+
+    def reload(self, batch_size=2000):
+        """Reconstruir el índice desde las firmas guardadas y publicarlo
+
+        Devuelve False sin hacer nada si ya hay otra recarga en curso.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                self._pending = []
+            signatures, buckets = {}, {}
+            missing = 0
+            last_id = 0
+            while True:
+                rows = db.session.query(Question.id, Question.similarity_signature).filter(
+                    Question.is_active == true(), Question.id > last_id
+                ).order_by(Question.id).limit(batch_size).all()
+                if not rows:
+                    break
+                for question_id, data in rows:
+                    signature = signature_from_bytes(data)
+                    if signature is not None:
+                        self._add(signatures, buckets, question_id, signature)
+                    elif data is None:
+                        missing += 1
+                last_id = rows[-1][0]
+
+            with self._lock:
+                for question_id, signature in self._pending:
+                    self._apply(signatures, buckets, question_id, signature)
+                self._signatures, self._buckets = signatures, buckets
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+            self._reload_lock.release()
+
+        logger.info('similarity index loaded', extra={
+            'questions': len(signatures), 'missing_signatures': missing
+        })
+        if missing:
+            from utils.jobs import job_queue
+            job_queue.enqueue('similarity_backfill')
+        return True
+
+    def invalidate(self):
+        """Descartar el índice (tras escrituras en bloque); se reconstruye en la próxima recarga"""
+        with self._lock:
+            self._signatures, self._buckets = {}, {}
+            self._loaded_at = None
+
+    def update(self, question_id, signature):
+        """Agregar o reemplazar (o quitar, con signature None) una pregunta del índice"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((question_id, signature))
+            if self._loaded_at is not None:
+                self._apply(self._signatures, self._buckets, question_id, signature)
+
+    def remove(self, question_id):
+        self.update(question_id, None)
+
+    def query(self, signature, limit=5, min_score=0.2, exclude_id=None):
+        """Top-k (question_id, similitud estimada) para una firma"""
+        if self._loaded_at is None:
+            from utils.jobs import job_queue
+            if not job_queue.async_mode:
+                # Sin hilos de fondo (JOB_QUEUE_ASYNC=false) no hay recarga programada
+                self.reload()
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude_id)
+            scored = []
+            for question_id in candidates:
+                other = self._signatures[question_id]
+                score = sum(1 for a, b in zip(signature, other) if a == b) / NUM_PERM
+                if score >= min_score:
+                    scored.append((score, question_id))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [(question_id, score) for score, question_id in scored[:limit]]
+
+
+similarity_index = SimilarityIndex()
+
+
+def backfill_signatures(batch_size=500):
+    """Calcular y guardar por lotes las firmas MinHash que faltan
+
+    Lo usan la tarea similarity_backfill, `flask backfill-signatures` y la
+    importación. Cada lote se confirma por separado y se añade al índice
+    de este proceso.
+    """
+    questions = Question.__table__
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Question.id, Question.title, Question.content, Question.updated_at)
+            .where(Question.is_active == true(), Question.similarity_signature.is_(None),
+                   Question.id > last_id)
+            .order_by(Question.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        signatures = {question_id: compute_signature(title, content)
+                      for question_id, title, content, _ in rows}
+        params = [
+            {'question_id': question_id, 'similarity_signature': signature_to_bytes(signatures[question_id]),
+             'updated_at': updated_at}
+            for question_id, _, _, updated_at in rows
+        ]
+        # Conservar updated_at: calcular la firma no es una edición
+        db.session.execute(update(questions).where(questions.c.id == bindparam('question_id')), params)
+        db.session.commit()
+        for question_id, signature in signatures.items():
+            similarity_index.update(question_id, signature)
+        total += len(params)
+        last_id = rows[-1][0]
+    if total:
+        logger.info('similarity signatures backfilled', extra={'questions': total})
+    return total
+
+
+def find_similar_questions(title, content='', limit=5, exclude_id=None, signature=None):
+    """Preguntas activas más parecidas a un borrador, ordenadas por similitud"""
+    if signature is None:
+        signature = compute_signature(title, content)
+    matches = similarity_index.query(signature, limit=limit, exclude_id=exclude_id)
+    if not matches:
+        return []
+
+    questions = {
+        q.id: q for q in Question.query.filter(
+            Question.id.in_([question_id for question_id, _ in matches]),
+            Question.is_active.is_(True)
+        )
+    }
+    return [
+        {
+            'id': question_id,
+            'title': questions[question_id].title,
+            'is_solved': questions[question_id].is_solved,
+            'score': round(score, 3)
+        }
+        for question_id, score in matches if question_id in questions
+    ]
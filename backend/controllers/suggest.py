@@ -0,0 +1,233 @@
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import insort
+from itertools import chain
+
+from sqlalchemy import event, inspect, select, true
+from sqlalchemy.orm import Session
+
+from models import db, Question
+from utils.log import get_logger
+
+logger = get_logger('suggest')
+
+MAX_PREFIX = 20   # Los tokens más largos se indexan truncados
+TOP_K = 10        # Sugerencias precalculadas por prefijo
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+_TRACKED = ('title', 'is_active', 'votes', 'answer_count')
+
+
+def suggest_tokens(text):
+    """Tokens normalizados (minúsculas, sin acentos) de un título o consulta"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return [token[:MAX_PREFIX] for token in _TOKEN_RE.findall(text)]
+
+
+def popularity(votes, views, answer_count):
+    """Peso de una pregunta en las sugerencias: votos, respuestas y vistas (log)"""
+    return (votes or 0) + 2 * (answer_count or 0) + math.log10(1 + max(views or 0, 0))
+
+
+class _Node:
+    __slots__ = ('children', 'top', 'count', 'ids', 'dirty')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []      # Hasta TOP_K (-peso, question_id) ordenados
+        self.count = 0     # Preguntas con algún token que empieza por este prefijo
+        self.ids = set()   # Preguntas con un token que termina exactamente aquí
+        self.dirty = False  # top incompleto tras una baja: se recalcula al consultar
+
+
+class SuggestIndex:
+    """Trie de prefijos de los tokens de los títulos activos
+
+    Cada nodo guarda las TOP_K preguntas más populares bajo su prefijo, así
+    que una consulta de una palabra es un recorrido de len(prefijo) nodos.
+    Con varias palabras se intersectan los conjuntos de preguntas bajo
+    cada prefijo y se ordena solo el resultado. Las escrituras del
+    ORM confirmadas en este proceso se aplican al momento; los pesos
+    (votos, vistas) y los cambios de otros workers se recogen al
+    reconstruir cada max_age segundos.
+    """
+
+    def __init__(self, max_age=600):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._root = _Node()
+        self._questions = {}  # question_id -> (título, peso, tokens)
+        self._order = {}  # question_id -> (-peso, question_id): clave de ordenación
+        self._built_at = None
+
+    # --- Mantenimiento --------------------------------------------------------
+
+    def _add(self, question_id, title, weight):
+        keys = set(suggest_tokens(title))
+        self._questions[question_id] = (title, weight, keys)
+        entry = self._order[question_id] = (-weight, question_id)
+        visited = set()
+        for key in keys:
+            node = self._root
+            for char in key:
+                node = node.children.setdefault(char, _Node())
+                if id(node) in visited:
+                    continue  # Prefijo compartido con otro token de la misma pregunta
+                visited.add(id(node))
+                node.count += 1
+                if not node.dirty:
+                    insort(node.top, entry)
+                    del node.top[TOP_K:]
+            node.ids.add(question_id)
+
+    def _remove(self, question_id):
+        current = self._questions.pop(question_id, None)
+        if current is None:
+            return
+        _, weight, keys = current
+        entry = self._order.pop(question_id)
+        visited = set()
+        for key in keys:
+            parent = self._root
+            for char in key:
+                node = parent.children.get(char)
+                if node is None:
+                    break  # Ya podado al recorrer otro token
+                if id(node) not in visited:
+                    visited.add(id(node))
+                    node.count -= 1
+                    if node.count == 0:
+                        del parent.children[char]
+                        break
+                    if entry in node.top:
+                        node.top.remove(entry)
+                        node.dirty = node.dirty or len(node.top) < min(TOP_K, node.count)
+                parent = node
+            else:
+                parent.ids.discard(question_id)
+
+    def _subtree_ids(self, node):
+        ids = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ids.update(current.ids)
+            stack.extend(current.children.values())
+        return ids
+
+    def _top(self, node):
+        if node.dirty:
+            node.top = sorted(self._order[question_id] for question_id in heapq.nsmallest(
+                TOP_K, self._subtree_ids(node), key=self._order.__getitem__
+            ))
+            node.dirty = False
+        return node.top
+
+    def _find(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def ensure_built(self):
+        """Construir (o reconstruir si tiene más de max_age segundos) desde questions"""
+        built_at = self._built_at
+        if built_at is not None and time.monotonic() - built_at < self.max_age:
+            return
+        with self._lock:
+            if self._built_at is not built_at:
+                return  # Otro hilo acaba de reconstruir
+            started = time.perf_counter()
+            rows = db.session.execute(
+                select(Question.id, Question.title, Question.votes, Question.views, Question.answer_count)
+                .where(Question.is_active == true())
+            ).all()
+            self._root = _Node()
+            self._questions = {}
+            self._order = {}
+            for question_id, title, votes, views, answer_count in rows:
+                self._add(question_id, title, popularity(votes, views, answer_count))
+            self._built_at = time.monotonic()
+            logger.info('suggest index built', extra={
+                'questions': len(self._questions),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+            })
+
+    def update(self, question_id, title, weight, is_active=True):
+        """Reflejar el estado confirmado de una pregunta"""
+        if self._built_at is None:
+            return  # Se incluirá al construir
+        with self._lock:
+            self._remove(question_id)
+            if is_active:
+                self._add(question_id, title, weight)
+
+    # --- Consulta -------------------------------------------------------------
+
+    def _match_words(self, nodes, limit):
+        """Varias palabras: intersección de los subárboles de cada prefijo"""
+        postings = sorted((self._subtree_ids(node) for node in nodes), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return heapq.nsmallest(limit, candidates, key=self._order.__getitem__)
+
+    def suggest(self, text, limit=TOP_K):
+        """[(question_id, título)] de las preguntas más populares que coinciden
+
+        Cada palabra de la consulta debe ser prefijo de alguna palabra del
+        título (la última normalmente está a medio escribir).
+        """
+        self.ensure_built()
+        tokens = list(dict.fromkeys(suggest_tokens(text)))
+        if not tokens:
+            return []
+        limit = min(limit, TOP_K)
+        with self._lock:
+            nodes = [self._find(token) for token in tokens]
+            if any(node is None for node in nodes):
+                return []
+            if len(tokens) == 1:
+                matches = [question_id for _, question_id in self._top(nodes[0])[:limit]]
+            else:
+                matches = self._match_words(nodes, limit)
+            return [(question_id, self._questions[question_id][0]) for question_id in matches]
+
+
+suggest_index = SuggestIndex()
+
+
+# --- Actualización incremental a partir de las escrituras del ORM ------------
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_question_changes(session, flush_context):
+    changed = session.info.setdefault('suggest_questions', {})
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Question):
+            continue
+        state = inspect(obj)
+        if obj in session.deleted:
+            changed[obj.id] = (None, 0, False)
+        elif obj in session.new or any(state.attrs[name].history.has_changes() for name in _TRACKED):
+            changed[obj.id] = (obj.title, popularity(obj.votes, obj.views, obj.answer_count),
+                               obj.is_active is not False)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_changes(session):
+    for question_id, values in session.info.pop('suggest_questions', {}).items():
+        suggest_index.update(question_id, *values)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_question_changes(session):
+    session.info.pop('suggest_questions', None)
+
+
+def init_suggest(app):
+    suggest_index.max_age = app.config['SUGGEST_MAX_AGE']
@@ -0,0 +1,120 @@
+import re
+from datetime import datetime
+
+from sqlalchemy import case, intersect, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Tag, question_tags
+
+MAX_TAGS_PER_QUESTION = 5
+MAX_TAG_LENGTH = 30
+_TAG_RE = re.compile(r'^[a-z0-9][a-z0-9+#.\-]*$')
+
+
+def normalize_tags(raw):
+    """Normalizar una lista (o cadena separada por comas) de etiquetas
+
+    Lanza ValueError con un mensaje apto para el cliente si no es válida.
+    """
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    if not isinstance(raw, (list, tuple)):
+        raise ValueError('Las etiquetas deben ser una lista')
+
+    names = []
+    for item in raw:
+        name = re.sub(r'\s+', '-', str(item).strip().lower())
+        if not name:
+            continue
+        if len(name) > MAX_TAG_LENGTH or not _TAG_RE.match(name):
+            raise ValueError(f'Etiqueta inválida: {name[:MAX_TAG_LENGTH]}')
+        if name not in names:
+            names.append(name)
+
+    if len(names) > MAX_TAGS_PER_QUESTION:
+        raise ValueError(f'Máximo {MAX_TAGS_PER_QUESTION} etiquetas por pregunta')
+    return names
+
+
+def _insert_missing(names):
+    """INSERT de las etiquetas nuevas que ignora las que otra petición acaba de crear"""
+    rows = [{'name': name, 'question_count': 0, 'created_at': datetime.utcnow()} for name in names]
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        db.session.execute(insert(Tag).values(rows).on_conflict_do_nothing(index_elements=['name']))
+        return
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(Tag.__table__.insert().values(**row))
+        except IntegrityError:
+            pass  # Creada en paralelo: se lee a continuación
+
+
+def get_or_create_tags(names):
+    """Obtener las etiquetas por nombre creando las que no existan
+
+    Dos peticiones pueden crear a la vez la misma etiqueta nueva: el
+    INSERT ignora el conflicto con el nombre único y se vuelve a leer.
+    """
+    if not names:
+        return []
+    existing = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names))}
+    missing = [name for name in names if name not in existing]
+    if missing:
+        _insert_missing(missing)
+        existing.update((tag.name, tag) for tag in Tag.query.filter(Tag.name.in_(missing)))
+    return [existing[name] for name in names]
+
+
+def _adjust_tag_counts(tag_ids, delta):
+    """Sumar delta a question_count en SQL (sin perder incrementos concurrentes)"""
+    if not tag_ids:
+        return
+    count = Tag.question_count + delta if delta > 0 else case(
+        (Tag.question_count + delta > 0, Tag.question_count + delta), else_=0
+    )
+    db.session.execute(update(Tag).where(Tag.id.in_(tag_ids)).values(question_count=count))
+
+
+def set_question_tags(question, names):
+    """Reemplazar las etiquetas de una pregunta manteniendo los contadores"""
+    new_tags = get_or_create_tags(names)
+    old_ids = {tag.id for tag in question.tags}
+    new_ids = {tag.id for tag in new_tags}
+
+    _adjust_tag_counts(old_ids - new_ids, -1)
+    _adjust_tag_counts(new_ids - old_ids, 1)
+    question.tags = new_tags
+
+
+def release_question_tags(question):
+    """Descontar las etiquetas de una pregunta eliminada (soft delete)"""
+    _adjust_tag_counts({tag.id for tag in question.tags}, -1)
+
+
+def tagged_question_ids(names, match_all=True):
+    """Subconsulta de IDs de preguntas con las etiquetas dadas
+
+    Con match_all se intersectan las listas de publicaciones de cada
+    etiqueta (empezando por la más selectiva); si no, se unen. Devuelve
+    None si el filtro no puede coincidir con nada.
+    """
+    tags = Tag.query.filter(Tag.name.in_(names)).order_by(Tag.question_count).all()
+    if not tags or (match_all and len(tags) < len(names)):
+        return None
+
+    if not match_all or len(tags) == 1:
+        return select(question_tags.c.question_id).where(
+            question_tags.c.tag_id.in_([tag.id for tag in tags])
+        )
+
+    return intersect(*[
+        select(question_tags.c.question_id).where(question_tags.c.tag_id == tag.id)
+        for tag in tags
+    ])
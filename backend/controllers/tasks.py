@@ -0,0 +1,88 @@
+from collections import Counter
+
+from flask import current_app
+from sqlalchemy import bindparam, update
+
+from models import db, Question
+from controllers.archive import archive_deleted
+from controllers.documents import rebuild_question_documents
+from controllers.notifications import fan_out
+from controllers.ranking import refresh_hot_scores, recompute_hot_scores
+from controllers.similarity import (
+    backfill_signatures, compute_signature, signature_to_bytes, similarity_index
+)
+
+
+def flush_question_views(payloads):
+    """Sumar en un solo UPDATE por lote las vistas acumuladas de cada pregunta"""
+    counts = Counter(payload['question_id'] for payload in payloads)
+    questions = Question.__table__  # UPDATE de Core: executemany con WHERE propio
+    db.session.execute(
+        update(questions)
+        .where(questions.c.id == bindparam('question_id'))
+        .values(views=questions.c.views + bindparam('increment'), updated_at=questions.c.updated_at),
+        [{'question_id': question_id, 'increment': n} for question_id, n in counts.items()]
+    )
+    refresh_hot_scores(counts)
+
+
+def update_hot_scores(payloads):
+    refresh_hot_scores(payload['question_id'] for payload in payloads)
+
+
+def recompute_all_hot_scores(payloads):
+    recompute_hot_scores()
+
+
+def update_similarity_index(payloads):
+    """Recalcular la firma MinHash de las preguntas creadas/editadas/eliminadas"""
+    question_ids = {payload['question_id'] for payload in payloads}
+    for question in Question.query.filter(Question.id.in_(question_ids)):
+        if not question.is_active:
+            similarity_index.remove(question.id)
+            continue
+        signature = compute_signature(question.title, question.content)
+        db.session.execute(
+            update(Question)
+            .where(Question.id == question.id)
+            .values(similarity_signature=signature_to_bytes(signature), updated_at=Question.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        similarity_index.update(question.id, signature)
+    db.session.commit()
+
+
+def backfill_similarity_signatures(payloads):
+    backfill_signatures()
+
+
+def reload_similarity_index(payloads):
+    similarity_index.reload()
+
+
+def update_question_documents(payloads):
+    rebuild_question_documents(payload['question_id'] for payload in payloads)
+
+
+def archive_deleted_content(payloads):
+    config = current_app.config
+    archive_deleted(config['ARCHIVE_AFTER_DAYS'], config['ARCHIVE_BATCH_SIZE'])
+
+
+def register_tasks(job_queue, app):
+    """Registrar los tipos de trabajo diferido y las tareas periódicas"""
+    job_queue.register('question_views', flush_question_views, batch_size=1000)
+    job_queue.register('hot_scores', update_hot_scores, batch_size=500)
+    job_queue.register('hot_scores_recompute', recompute_all_hot_scores, max_retries=0)
+    job_queue.register('similarity_index', update_similarity_index, batch_size=200)
+    # Lote grande: las peticiones repetidas de varias cargas del índice se atienden con una pasada
+    job_queue.register('similarity_backfill', backfill_similarity_signatures, batch_size=100, max_retries=0)
+    job_queue.register('similarity_reload', reload_similarity_index, max_retries=0)
+    job_queue.register('question_documents', update_question_documents, batch_size=200)
+    job_queue.register('notifications', fan_out, batch_size=app.config['NOTIFICATION_BATCH_SIZE'])
+    job_queue.register('archive_deleted', archive_deleted_content, max_retries=0)
+
+    job_queue.schedule('hot_scores_recompute', app.config['HOT_RECOMPUTE_INTERVAL'])
+    job_queue.schedule('archive_deleted', app.config['ARCHIVE_INTERVAL'])
+    # El índice LSH vive en la memoria de cada worker: se recarga en todos
+    job_queue.schedule('similarity_reload', app.config['SIMILARITY_MAX_AGE'], local=True)
@@ -0,0 +1,43 @@
+from flask import current_app
+from sqlalchemy import func, select
+
+from models import db, Question, Answer
+from utils.cache import TTLCache
+
+_cache = TTLCache(maxsize=4096)
+
+
+def _load_user_stats(user_id):
+    """Totales del perfil en una sola consulta (una subconsulta escalar por total)"""
+    question_filter = (Question.author_id == user_id, Question.is_active.is_(True))
+    answer_filter = (Answer.author_id == user_id, Answer.is_active.is_(True))
+
+    question_count, answer_count, accepted_count, question_votes, answer_votes = db.session.execute(
+        select(
+            select(func.count(Question.id)).where(*question_filter).scalar_subquery(),
+            select(func.count(Answer.id)).where(*answer_filter).scalar_subquery(),
+            select(func.count(Answer.id)).where(*answer_filter, Answer.is_accepted.is_(True)).scalar_subquery(),
+            select(func.coalesce(func.sum(Question.votes), 0)).where(*question_filter).scalar_subquery(),
+            select(func.coalesce(func.sum(Answer.votes), 0)).where(*answer_filter).scalar_subquery()
+        )
+    ).one()
+
+    return {
+        'question_count': question_count,
+        'answer_count': answer_count,
+        'accepted_answer_count': accepted_count,
+        'votes_received': question_votes + answer_votes
+    }
+
+
+def get_user_stats(user_id):
+    """Estadísticas del perfil de un usuario (cacheadas en el proceso)"""
+    return _cache.get_or_set(
+        user_id, lambda: _load_user_stats(user_id), ttl=current_app.config['USER_STATS_CACHE_TTL']
+    )
+
+
+def invalidate_user_stats(*user_ids):
+    """Invalidar las estadísticas tras una escritura que cambie los totales del usuario"""
+    for user_id in user_ids:
+        _cache.invalidate(user_id)
@@ -0,0 +1,51 @@
+import os
+import sys
+
+from alembic import context
+from flask import current_app
+
+# Permitir importar la app al ejecutar `alembic` desde backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def get_app():
+    """La app en curso (flask db-upgrade / arranque) o una nueva (CLI de alembic)"""
+    try:
+        return current_app._get_current_object()
+    except RuntimeError:
+        os.environ['AUTO_CREATE_SCHEMA'] = 'false'  # Evitar migrar desde create_app()
+        from app import create_app
+        return create_app()
+
+
+def run_migrations_offline(app):
+    """Generar el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(
+        url=app.config['SQLALCHEMY_DATABASE_URI'],
+        target_metadata=app.extensions['sqlalchemy'].metadata,
+        literal_binds=True,
+        render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online(app):
+    db = app.extensions['sqlalchemy']
+    with db.engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=db.metadata,
+            render_as_batch=True,  # ALTER TABLE en SQLite mediante copia de tabla
+            compare_type=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+app = get_app()
+with app.app_context():
+    if context.is_offline_mode():
+        run_migrations_offline(app)
+    else:
+        run_migrations_online(app)
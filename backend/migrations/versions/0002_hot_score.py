@@ -0,0 +1,31 @@
+"""Score hot precalculado de las preguntas
+
+Revision ID: 0002_hot_score
+Revises: 0001_baseline
+Create Date: 2026-10-19 14:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import create_index_concurrently, drop_index_concurrently, has_column
+
+
+revision = '0002_hot_score'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Las filas existentes quedan a 0 hasta el recálculo periódico
+    # (HOT_RECOMPUTE_INTERVAL) o `flask recompute-hot`
+    if not has_column('questions', 'hot_score'):
+        with op.batch_alter_table('questions', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('hot_score', sa.Float(), nullable=False, server_default='0'))
+    create_index_concurrently('ix_questions_active_hot', 'questions', ['is_active', 'hot_score'])
+
+
+def downgrade():
+    drop_index_concurrently('ix_questions_active_hot', 'questions')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('hot_score')
@@ -0,0 +1,44 @@
+"""Etiquetas y tabla de relación question_tags
+
+Revision ID: 0003_tags
+Revises: 0002_hot_score
+Create Date: 2026-10-19 14:41:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import has_table
+
+
+revision = '0003_tags'
+down_revision = '0002_hot_score'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_table('tags'):
+        op.create_table('tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=30), nullable=False),
+        sa.Column('question_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if not has_table('question_tags'):
+        op.create_table('question_tags',
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+        sa.PrimaryKeyConstraint('tag_id', 'question_id')
+        )
+    op.create_index('ix_question_tags_question', 'question_tags', ['question_id', 'tag_id'],
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_question_tags_question', table_name='question_tags')
+    op.drop_table('question_tags')
+    op.drop_table('tags')
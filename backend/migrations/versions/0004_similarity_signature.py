@@ -0,0 +1,29 @@
+"""Firma MinHash de las preguntas para la detección de duplicados
+
+Revision ID: 0004_similarity_signature
+Revises: 0003_tags
+Create Date: 2026-10-19 14:42:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import has_column
+
+
+revision = '0004_similarity_signature'
+down_revision = '0003_tags'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable: las firmas que faltan las calcula la tarea similarity_backfill
+    # (o `flask backfill-signatures`)
+    if not has_column('questions', 'similarity_signature'):
+        with op.batch_alter_table('questions', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('similarity_signature', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('similarity_signature')
@@ -0,0 +1,44 @@
+"""Bandeja de notificaciones
+
+Revision ID: 0005_notifications
+Revises: 0004_similarity_signature
+Create Date: 2026-10-19 14:43:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import has_table
+
+
+revision = '0005_notifications'
+down_revision = '0004_similarity_signature'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_table('notifications'):
+        op.create_table('notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=30), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=True),
+        sa.Column('actor_username', sa.String(length=80), nullable=True),
+        sa.Column('question_id', sa.Integer(), nullable=True),
+        sa.Column('question_title', sa.String(length=200), nullable=True),
+        sa.Column('answer_id', sa.Integer(), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_notifications_user_id', 'notifications', ['user_id', 'id'], if_not_exists=True)
+    op.create_index('ix_notifications_user_unread', 'notifications', ['user_id', 'is_read'],
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_id', table_name='notifications')
+    op.drop_table('notifications')
@@ -0,0 +1,30 @@
+"""updated_at de los usuarios para la exportación incremental
+
+Revision ID: 0006_user_updated_at
+Revises: 0005_notifications
+Create Date: 2026-10-19 14:44:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import batched_backfill, has_column
+
+
+revision = '0006_user_updated_at'
+down_revision = '0005_notifications'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not has_column('users', 'updated_at'):
+        with op.batch_alter_table('users', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Sin ediciones registradas: la última modificación conocida es el alta
+    batched_backfill('users', {'updated_at': sa.literal_column('created_at')},
+                     where='updated_at IS NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,23 @@
+"""Índices por autor para las estadísticas de perfil
+
+Revision ID: 0007_author_indexes
+Revises: 0006_user_updated_at
+Create Date: 2026-10-19 14:45:00.000000
+"""
+from utils.migrations import create_index_concurrently, drop_index_concurrently
+
+
+revision = '0007_author_indexes'
+down_revision = '0006_user_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_concurrently('ix_questions_author_id', 'questions', ['author_id'])
+    create_index_concurrently('ix_answers_author_id', 'answers', ['author_id'])
+
+
+def downgrade():
+    drop_index_concurrently('ix_answers_author_id', 'answers')
+    drop_index_concurrently('ix_questions_author_id', 'questions')
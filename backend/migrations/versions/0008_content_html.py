@@ -0,0 +1,30 @@
+"""Markdown renderizado de preguntas y respuestas
+
+Revision ID: 0008_content_html
+Revises: 0007_author_indexes
+Create Date: 2026-10-19 15:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008_content_html'
+down_revision = '0007_author_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable y sin relleno: las filas existentes se renderizan al leerlas
+    # (o de una vez con `flask render-content`)
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_html', sa.Text(), nullable=True))
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_html', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_column('content_html')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('content_html')
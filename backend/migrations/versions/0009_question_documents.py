@@ -0,0 +1,29 @@
+"""Modelo de lectura question_documents
+
+Revision ID: 0009_question_documents
+Revises: 0008_content_html
+Create Date: 2026-10-19 15:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0009_question_documents'
+down_revision = '0008_content_html'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los documentos se construyen al leer o con `flask check-documents --repair`
+    op.create_table('question_documents',
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('document', sa.JSON(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('question_id')
+    )
+
+
+def downgrade():
+    op.drop_table('question_documents')
@@ -0,0 +1,31 @@
+"""Columna version para control de concurrencia optimista
+
+Revision ID: 0010_row_versions
+Revises: 0009_question_documents
+Create Date: 2026-10-19 16:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0010_row_versions'
+down_revision = '0009_question_documents'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # server_default rellena las filas existentes sin reescribirlas una a una
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    # Los documentos de detalle no incluyen la versión: se reconstruyen al leer
+    op.execute('DELETE FROM question_documents')
+
+
+def downgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,95 @@
+"""Archivado de contenido eliminado e índices parciales de filas activas
+
+Revision ID: 0011_archival
+Revises: 0010_row_versions
+Create Date: 2026-10-19 17:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import batched_backfill, create_index_concurrently, drop_index_concurrently
+
+
+revision = '0011_archival'
+down_revision = '0010_row_versions'
+branch_labels = None
+depends_on = None
+
+ACTIVE = {'sqlite_where': sa.text('is_active = 1'), 'postgresql_where': sa.text('is_active = true')}
+DELETED = {'sqlite_where': sa.text('is_active = 0'), 'postgresql_where': sa.text('is_active = false')}
+
+
+def upgrade():
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # Lo eliminado antes de esta versión: la última edición fue el borrado
+    for table in ('questions', 'answers'):
+        batched_backfill(table, {'deleted_at': sa.literal_column('updated_at')},
+                         where='NOT is_active AND deleted_at IS NULL')
+
+    op.create_table('questions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('votes', sa.Integer(), nullable=True),
+    sa.Column('views', sa.Integer(), nullable=True),
+    sa.Column('is_solved', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_questions_archive_author_id', 'questions_archive', ['author_id'])
+    op.create_table('answers_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('votes', sa.Integer(), nullable=True),
+    sa.Column('is_accepted', sa.Boolean(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_answers_archive_author_id', 'answers_archive', ['author_id'])
+    op.create_index('ix_answers_archive_question_id', 'answers_archive', ['question_id'])
+
+    # Índices parciales: solo filas activas (los listados) o solo eliminadas (el archivador)
+    create_index_concurrently('ix_questions_hot_active', 'questions', ['hot_score'], **ACTIVE)
+    create_index_concurrently('ix_questions_created_active', 'questions', ['created_at'], **ACTIVE)
+    create_index_concurrently('ix_questions_deleted_at', 'questions', ['deleted_at'], **DELETED)
+    create_index_concurrently('ix_answers_question_active', 'answers', ['question_id'], **ACTIVE)
+    create_index_concurrently('ix_answers_deleted_at', 'answers', ['deleted_at'], **DELETED)
+    # Sustituido por ix_questions_hot_active
+    drop_index_concurrently('ix_questions_active_hot', 'questions')
+
+
+def downgrade():
+    create_index_concurrently('ix_questions_active_hot', 'questions', ['is_active', 'hot_score'])
+    drop_index_concurrently('ix_answers_deleted_at', 'answers')
+    drop_index_concurrently('ix_answers_question_active', 'answers')
+    drop_index_concurrently('ix_questions_deleted_at', 'questions')
+    drop_index_concurrently('ix_questions_created_active', 'questions')
+    drop_index_concurrently('ix_questions_hot_active', 'questions')
+
+    # Las filas archivadas no vuelven a las tablas principales
+    op.drop_index('ix_answers_archive_question_id', table_name='answers_archive')
+    op.drop_index('ix_answers_archive_author_id', table_name='answers_archive')
+    op.drop_table('answers_archive')
+    op.drop_index('ix_questions_archive_author_id', table_name='questions_archive')
+    op.drop_table('questions_archive')
+
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,48 @@
+"""Contador answer_count e índices parciales de los feeds de triage
+
+Revision ID: 0012_answer_count
+Revises: 0011_archival
+Create Date: 2026-10-19 17:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migrations import batched_backfill, create_index_concurrently, drop_index_concurrently
+
+
+revision = '0012_answer_count'
+down_revision = '0011_archival'
+branch_labels = None
+depends_on = None
+
+ACTIVE_ANSWERS = sa.literal_column(
+    '(SELECT count(*) FROM answers WHERE answers.question_id = questions.id AND answers.is_active)'
+)
+
+
+def upgrade():
+    # Columna nullable, relleno por lotes y después NOT NULL
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('answer_count', sa.Integer(), nullable=True))
+    batched_backfill('questions', {'answer_count': ACTIVE_ANSWERS}, where='answer_count IS NULL')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.alter_column('answer_count', existing_type=sa.Integer(), nullable=False,
+                              server_default='0')
+
+    create_index_concurrently(
+        'ix_questions_unanswered', 'questions', ['created_at'],
+        sqlite_where=sa.text('is_active = 1 AND answer_count = 0'),
+        postgresql_where=sa.text('is_active = true AND answer_count = 0')
+    )
+    create_index_concurrently(
+        'ix_questions_unsolved', 'questions', ['created_at'],
+        sqlite_where=sa.text('is_active = 1 AND is_solved = 0'),
+        postgresql_where=sa.text('is_active = true AND is_solved = false')
+    )
+
+
+def downgrade():
+    drop_index_concurrently('ix_questions_unsolved', 'questions')
+    drop_index_concurrently('ix_questions_unanswered', 'questions')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_column('answer_count')
@@ -0,0 +1,22 @@
+"""Documentos de detalle sin resumen de autor (se une al servir)
+
+Revision ID: 0013_document_authors
+Revises: 0012_answer_count
+Create Date: 2026-10-19 18:30:00.000000
+"""
+from alembic import op
+
+
+revision = '0013_document_authors'
+down_revision = '0012_answer_count'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Los documentos guardados llevan el autor copiado y no su author_id: se reconstruyen al leer
+    op.execute('DELETE FROM question_documents')
+
+
+def downgrade():
+    op.execute('DELETE FROM question_documents')
@@ -0,0 +1,27 @@
+"""Checkpoints de importación en la base de datos
+
+Revision ID: 0014_import_checkpoints
+Revises: 0013_document_authors
+Create Date: 2026-10-19 18:50:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0014_import_checkpoints'
+down_revision = '0013_document_authors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_checkpoints',
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('state', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('import_checkpoints')
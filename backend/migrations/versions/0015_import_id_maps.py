@@ -0,0 +1,54 @@
+"""Mapas de IDs de importación en su propia tabla
+
+Revision ID: 0015_import_id_maps
+Revises: 0014_import_checkpoints
+Create Date: 2026-10-19 20:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0015_import_id_maps'
+down_revision = '0014_import_checkpoints'
+branch_labels = None
+depends_on = None
+
+checkpoints = sa.table('import_checkpoints', sa.column('name', sa.String), sa.column('state', sa.JSON))
+
+
+def upgrade():
+    id_maps = op.create_table('import_id_maps',
+    sa.Column('checkpoint', sa.String(length=200), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('old_id', sa.String(length=100), nullable=False),
+    sa.Column('new_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('checkpoint', 'entity', 'old_id')
+    )
+
+    # Checkpoints existentes: sacar los mapas del JSON de estado
+    connection = op.get_bind()
+    for name, state in connection.execute(sa.select(checkpoints.c.name, checkpoints.c.state)).all():
+        maps = state.pop('id_maps', None)
+        if maps is None:
+            continue
+        rows = [{'checkpoint': name, 'entity': entity, 'old_id': old_id, 'new_id': new_id}
+                for entity, mapping in maps.items() for old_id, new_id in mapping.items()]
+        if rows:
+            op.bulk_insert(id_maps, rows)
+        connection.execute(checkpoints.update().where(checkpoints.c.name == name).values(state=state))
+
+
+def downgrade():
+    connection = op.get_bind()
+    id_maps = sa.table('import_id_maps', sa.column('checkpoint', sa.String), sa.column('entity', sa.String),
+                       sa.column('old_id', sa.String), sa.column('new_id', sa.Integer))
+    for name, state in connection.execute(sa.select(checkpoints.c.name, checkpoints.c.state)).all():
+        maps = {'users': {}, 'questions': {}, 'answers': {}}
+        rows = connection.execute(
+            sa.select(id_maps.c.entity, id_maps.c.old_id, id_maps.c.new_id).where(id_maps.c.checkpoint == name)
+        )
+        for entity, old_id, new_id in rows:
+            maps.setdefault(entity, {})[old_id] = new_id
+        connection.execute(checkpoints.update().where(checkpoints.c.name == name)
+                           .values(state=dict(state, id_maps=maps)))
+    op.drop_table('import_id_maps')
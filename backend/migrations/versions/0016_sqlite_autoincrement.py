@@ -0,0 +1,48 @@
+"""SQLite: AUTOINCREMENT en questions y answers
+
+Sin AUTOINCREMENT SQLite reutiliza el mayor ID cuando se borra la última
+fila, y el archivador borra filas: una pregunta nueva podía recibir el ID
+de una ya archivada y chocar con ella al archivarse. PostgreSQL usa
+secuencias, que nunca reutilizan valores.
+
+Revision ID: 0016_sqlite_autoincrement
+Revises: 0015_import_id_maps
+Create Date: 2026-10-19 20:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0016_sqlite_autoincrement'
+down_revision = '0015_import_id_maps'
+branch_labels = None
+depends_on = None
+
+TABLES = (('questions', 'questions_archive'), ('answers', 'answers_archive'))
+
+
+def _recreate(table, autoincrement):
+    # batch_alter_table copia la tabla (con sus índices) a una nueva con la opción
+    with op.batch_alter_table(table, recreate='always',
+                              table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, archive in TABLES:
+        _recreate(table, True)
+        # Empezar después de cualquier ID ya usado, también de los archivados
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', MAX("
+            f"(SELECT COALESCE(MAX(id), 0) FROM {table}), (SELECT COALESCE(MAX(id), 0) FROM {archive}))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, _ in TABLES:
+        _recreate(table, False)
@@ -6,5 +6,11 @@ from .user import User
 from .question import Question  
 from .answer import Answer
 from .category import Category
+from .tag import Tag, question_tags
+from .notification import Notification
+from .question_document import QuestionDocument
+from .archive import ArchivedQuestion, ArchivedAnswer
+from .import_checkpoint import ImportCheckpoint, ImportIdMap
 
-__all__ = ['db', 'User', 'Question', 'Answer', 'Category'] 
\ No newline at end of file
+__all__ = ['db', 'User', 'Question', 'Answer', 'Category', 'Tag', 'question_tags', 'Notification', 'QuestionDocument',
+           'ArchivedQuestion', 'ArchivedAnswer', 'ImportCheckpoint', 'ImportIdMap'] 
\ No newline at end of file
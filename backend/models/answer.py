@@ -1,5 +1,6 @@
 from datetime import datetime
 from . import db
+from utils.markdown import render_markdown
 
 class Answer(db.Model):
     """Modelo de Respuesta para StudentOverflow"""
@@ -8,10 +9,11 @@ class Answer(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
+    content_html = db.deferred(db.Column(db.Text))  # Markdown renderizado al escribir
     
     # Relaciones
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Métricas
     votes = db.Column(db.Integer, default=0)
@@ -23,11 +25,31 @@ class Answer(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)  # Soft delete; el archivador mueve las antiguas
+    
+    # Versión para If-Match/ETag (version_id_col)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    
+    __table_args__ = (
+        # Respuestas activas de una pregunta (detalle, conteos, score hot)
+        db.Index('ix_answers_question_active', 'question_id',
+                 sqlite_where=db.text('is_active = 1'), postgresql_where=db.text('is_active = true')),
+        db.Index('ix_answers_deleted_at', 'deleted_at',
+                 sqlite_where=db.text('is_active = 0'), postgresql_where=db.text('is_active = false')),
+        # SQLite: no reutilizar IDs de filas borradas (el archivador las mueve a *_archive)
+        {'sqlite_autoincrement': True},
+    )
+    __mapper_args__ = {'version_id_col': version}
     
     def __repr__(self):
         return f'<Answer {self.id} for Question {self.question_id}>'
     
-    def to_dict(self, include_author=True):
+    @db.validates('content')
+    def _render_content(self, key, content):
+        self.content_html = render_markdown(content)
+        return content
+    
+    def to_dict(self, include_author=True, include_html=False):
         """Convierte la respuesta a diccionario"""
         data = {
             'id': self.id,
@@ -36,9 +58,13 @@ class Answer(db.Model):
             'is_accepted': self.is_accepted,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version,
             'question_id': self.question_id
         }
         
+        if include_html:
+            data['content_html'] = self.content_html or render_markdown(self.content)
+        
         if include_author and self.author:
             data['author'] = {
                 'id': self.author.id,
@@ -0,0 +1,49 @@
+from datetime import datetime
+from . import db
+
+# Tablas frías para preguntas y respuestas eliminadas hace tiempo (ver
+# controllers.archive). Guardan solo los datos originales: los derivados
+# (HTML, firmas, scores) se recalculan si alguna vez se restauran.
+
+class ArchivedQuestion(db.Model):
+    """Pregunta eliminada movida fuera de la tabla principal"""
+    
+    __tablename__ = 'questions_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    author_id = db.Column(db.Integer, nullable=False, index=True)
+    category_id = db.Column(db.Integer)
+    tags = db.Column(db.JSON)  # Nombres de etiquetas al archivar
+    votes = db.Column(db.Integer)
+    views = db.Column(db.Integer)
+    is_solved = db.Column(db.Boolean)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    deleted_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ArchivedQuestion {self.id}>'
+
+
+class ArchivedAnswer(db.Model):
+    """Respuesta eliminada (o de una pregunta archivada) fuera de la tabla principal"""
+    
+    __tablename__ = 'answers_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    content = db.Column(db.Text, nullable=False)
+    question_id = db.Column(db.Integer, nullable=False, index=True)
+    author_id = db.Column(db.Integer, nullable=False, index=True)
+    votes = db.Column(db.Integer)
+    is_accepted = db.Column(db.Boolean)
+    is_active = db.Column(db.Boolean)  # False si se eliminó antes que su pregunta
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    deleted_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ArchivedAnswer {self.id}>'
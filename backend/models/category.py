@@ -24,14 +24,24 @@ class Category(db.Model):
     def __repr__(self):
         return f'<Category {self.name}>'
     
-    def to_dict(self):
-        """Convierte la categoría a diccionario"""
-        return {
+    def to_dict(self, stats=None):
+        """Convierte la categoría a diccionario
+        
+        Si se pasan estadísticas precalculadas (ver controllers.categories)
+        se usan en lugar de contar las preguntas en vivo.
+        """
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'slug': self.slug,
             'color': self.color,
-            'question_count': self.questions.filter_by(is_active=True).count(),
             'created_at': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        }
+        
+        if stats is not None:
+            data.update(stats)
+        else:
+            data['question_count'] = self.questions.filter_by(is_active=True).count()
+        
+        return data 
\ No newline at end of file
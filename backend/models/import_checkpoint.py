@@ -0,0 +1,33 @@
+from datetime import datetime
+from . import db
+
+class ImportCheckpoint(db.Model):
+    """Estado reanudable de una importación (ver controllers.importer)
+
+    Se guarda en la misma transacción que cada lote importado, así que la
+    posición nunca queda por detrás de los datos. Solo guarda posiciones y
+    estadísticas; los mapas de IDs van en import_id_maps.
+    """
+    
+    __tablename__ = 'import_checkpoints'
+    
+    name = db.Column(db.String(200), primary_key=True)
+    state = db.Column(db.JSON, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ImportCheckpoint {self.name}>'
+
+
+class ImportIdMap(db.Model):
+    """ID original -> ID nuevo de un registro importado con checkpoint"""
+    
+    __tablename__ = 'import_id_maps'
+    
+    checkpoint = db.Column(db.String(200), primary_key=True)
+    entity = db.Column(db.String(20), primary_key=True)
+    old_id = db.Column(db.String(100), primary_key=True)
+    new_id = db.Column(db.Integer, nullable=False)
+    
+    def __repr__(self):
+        return f'<ImportIdMap {self.checkpoint} {self.entity}:{self.old_id}>'
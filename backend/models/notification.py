@@ -0,0 +1,51 @@
+from datetime import datetime
+from . import db
+
+class Notification(db.Model):
+    """Modelo de Notificación (bandeja de entrada por usuario)"""
+    
+    __tablename__ = 'notifications'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Destinatario y tipo (answer_created, answer_accepted)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    type = db.Column(db.String(30), nullable=False)
+    
+    # Datos desnormalizados para servir la bandeja sin consultar preguntas/respuestas
+    actor_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    actor_username = db.Column(db.String(80))
+    question_id = db.Column(db.Integer)
+    question_title = db.Column(db.String(200))
+    answer_id = db.Column(db.Integer)
+    
+    # Estado
+    is_read = db.Column(db.Boolean, default=False, nullable=False)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Paginación de la bandeja (user_id, id DESC) y conteo de no leídas
+        db.Index('ix_notifications_user_id', 'user_id', 'id'),
+        db.Index('ix_notifications_user_unread', 'user_id', 'is_read'),
+    )
+    
+    def __repr__(self):
+        return f'<Notification {self.type} for User {self.user_id}>'
+    
+    def to_dict(self):
+        """Convierte la notificación a diccionario"""
+        return {
+            'id': self.id,
+            'type': self.type,
+            'actor': {
+                'id': self.actor_id,
+                'username': self.actor_username
+            } if self.actor_id else None,
+            'question_id': self.question_id,
+            'question_title': self.question_title,
+            'answer_id': self.answer_id,
+            'is_read': self.is_read,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
\ No newline at end of file
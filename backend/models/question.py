@@ -1,5 +1,11 @@
+import math
 from datetime import datetime
 from . import db
+from utils.markdown import render_markdown
+
+# Referencia fija para el componente temporal del score "hot"
+HOT_EPOCH = datetime(2024, 1, 1)
+HOT_DECAY_SECONDS = 45000  # Cada 12.5 h de antigüedad equivalen a 10x de actividad
 
 class Question(db.Model):
     """Modelo de Pregunta para StudentOverflow"""
@@ -9,18 +15,28 @@ class Question(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
+    content_html = db.deferred(db.Column(db.Text))  # Markdown renderizado al escribir
     
     # Relaciones
-    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=True)
     
     # Métricas
     votes = db.Column(db.Integer, default=0)
     views = db.Column(db.Integer, default=0)
+    hot_score = db.Column(db.Float, default=0.0, nullable=False)
+    answer_count = db.Column(db.Integer, default=0, nullable=False)  # Respuestas activas, mantenido al escribir
+    
+    # Firma MinHash precalculada para detección de duplicados (ver controllers.similarity)
+    similarity_signature = db.deferred(db.Column(db.LargeBinary))
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime)  # Soft delete; el archivador mueve las antiguas
+    
+    # Control de concurrencia optimista: cada UPDATE del ORM exige la versión leída
+    version = db.Column(db.Integer, nullable=False, default=1)
     
     # Estado
     is_active = db.Column(db.Boolean, default=True)
@@ -28,11 +44,56 @@ class Question(db.Model):
     
     # Relaciones
     answers = db.relationship('Answer', backref='question', lazy='dynamic', cascade='all, delete-orphan')
+    tags = db.relationship('Tag', secondary='question_tags', lazy='selectin', order_by='Tag.name')
+    
+    __table_args__ = (
+        # Índices parciales: solo filas activas, que es lo que recorren los
+        # listados (filter_by(is_active=True) coincide con el predicado).
+        # El feed "hot" es un recorrido de rango sobre el primero.
+        db.Index('ix_questions_hot_active', 'hot_score',
+                 sqlite_where=db.text('is_active = 1'), postgresql_where=db.text('is_active = true')),
+        db.Index('ix_questions_created_active', 'created_at',
+                 sqlite_where=db.text('is_active = 1'), postgresql_where=db.text('is_active = true')),
+        # Feeds de triage (?filter=unanswered|unsolved) ordenados por fecha
+        db.Index('ix_questions_unanswered', 'created_at',
+                 sqlite_where=db.text('is_active = 1 AND answer_count = 0'),
+                 postgresql_where=db.text('is_active = true AND answer_count = 0')),
+        db.Index('ix_questions_unsolved', 'created_at',
+                 sqlite_where=db.text('is_active = 1 AND is_solved = 0'),
+                 postgresql_where=db.text('is_active = true AND is_solved = false')),
+        # Candidatas del archivador: solo las eliminadas
+        db.Index('ix_questions_deleted_at', 'deleted_at',
+                 sqlite_where=db.text('is_active = 0'), postgresql_where=db.text('is_active = false')),
+        # SQLite: no reutilizar IDs de filas borradas (el archivador las mueve a *_archive)
+        {'sqlite_autoincrement': True},
+    )
+    __mapper_args__ = {'version_id_col': version}
     
     def __repr__(self):
         return f'<Question {self.title[:50]}...>'
     
-    def to_dict(self, include_author=True):
+    @staticmethod
+    def compute_hot_score(votes, views, answer_count, created_at):
+        """Score con decaimiento temporal: actividad logarítmica + antigüedad"""
+        activity = (votes or 0) + 2 * (answer_count or 0) + (views or 0) / 10.0
+        sign = 1 if activity > 0 else -1 if activity < 0 else 0
+        magnitude = math.log10(max(abs(activity), 1))
+        age = ((created_at or datetime.utcnow()) - HOT_EPOCH).total_seconds()
+        return round(sign * magnitude + age / HOT_DECAY_SECONDS, 7)
+    
+    def refresh_hot_score(self):
+        """Recalcular el score hot de esta pregunta (actualización incremental)"""
+        self.hot_score = self.compute_hot_score(
+            self.votes, self.views, self.answer_count, self.created_at
+        )
+        return self.hot_score
+    
+    @db.validates('content')
+    def _render_content(self, key, content):
+        self.content_html = render_markdown(content)
+        return content
+    
+    def to_dict(self, include_author=True, include_html=False):
         """Convierte la pregunta a diccionario"""
         data = {
             'id': self.id,
@@ -42,11 +103,17 @@ class Question(db.Model):
             'views': self.views,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version,
             'is_solved': self.is_solved,
-            'answer_count': self.answers.count(),
-            'category_id': self.category_id
+            'answer_count': self.answer_count,
+            'category_id': self.category_id,
+            'tags': [tag.name for tag in self.tags]
         }
         
+        if include_html:
+            # Filas importadas en bloque no pasan por el ORM: se renderizan al leer
+            data['content_html'] = self.content_html or render_markdown(self.content)
+        
         if include_author and self.author:
             data['author'] = {
                 'id': self.author.id,
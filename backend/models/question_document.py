@@ -0,0 +1,18 @@
+from datetime import datetime
+from . import db
+
+class QuestionDocument(db.Model):
+    """Modelo de lectura desnormalizado: detalle de una pregunta con sus respuestas
+
+    Se reconstruye desde las tablas normalizadas (ver controllers.documents)
+    cada vez que cambia la pregunta, sus etiquetas o alguna de sus respuestas.
+    """
+    
+    __tablename__ = 'question_documents'
+    
+    question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), primary_key=True)
+    document = db.Column(db.JSON, nullable=False)
+    built_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<QuestionDocument {self.question_id}>'
@@ -0,0 +1,37 @@
+from datetime import datetime
+from . import db
+
+# Índice invertido etiqueta -> preguntas. La clave primaria (tag_id, question_id)
+# es la lista de publicaciones de cada etiqueta; el índice inverso sirve para
+# cargar las etiquetas de una pregunta.
+question_tags = db.Table(
+    'question_tags',
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True),
+    db.Column('question_id', db.Integer, db.ForeignKey('questions.id'), primary_key=True),
+    db.Index('ix_question_tags_question', 'question_id', 'tag_id')
+)
+
+class Tag(db.Model):
+    """Modelo de Etiqueta para StudentOverflow"""
+    
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(30), unique=True, nullable=False)
+    
+    # Número de preguntas activas con esta etiqueta (desnormalizado)
+    question_count = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Tag {self.name}>'
+    
+    def to_dict(self):
+        """Convierte la etiqueta a diccionario"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'question_count': self.question_count
+        }
\ No newline at end of file
@@ -0,0 +1,127 @@
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
+from controllers.export import iter_records, iter_ndjson, parse_entities, parse_since
+from utils.auth import admin_required
+from utils.log import get_logger
+from utils.profiling import capture_store, cprofile_text, max_duration, sampler, start_sampler
+
+admin_bp = Blueprint('admin', __name__)
+logger = get_logger('admin')
+
+@admin_bp.route('/export', methods=['GET'])
+@admin_required
+def export_data():
+    """Exportar usuarios, preguntas y respuestas como NDJSON en streaming
+
+    Los datos personales de los usuarios solo se incluyen con ?private=true.
+    """
+    try:
+        entities = parse_entities(request.args.get('entities', ''))
+        since = parse_since(request.args.get('since', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    compress = request.args.get('gzip', '').lower() in ('1', 'true')
+    private = request.args.get('private', '').lower() in ('1', 'true')
+
+    # La próxima exportación incremental puede usar esta marca como since
+    watermark = datetime.utcnow().isoformat()
+    filename = f"studentoverflow-{watermark[:10]}.ndjson" + ('.gz' if compress else '')
+
+    logger.info('export started', extra={
+        'entities': entities, 'since': since.isoformat() if since else None, 'gzip': compress,
+        'private': private
+    })
+
+    chunks = iter_ndjson(iter_records(entities, since, private=private), compress=compress)
+    return Response(
+        stream_with_context(chunks),
+        mimetype='application/gzip' if compress else 'application/x-ndjson',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Export-Watermark': watermark
+        }
+    )
+
+def _profiling_disabled():
+    if capture_store() is None:
+        return jsonify({'error': 'El perfilado está desactivado (PROFILING_ENABLED)'}), 404
+    return None
+
+@admin_bp.route('/profiling/sampler', methods=['GET'])
+@admin_required
+def get_sampler():
+    """Estado de la captura por muestreo de este worker"""
+    return jsonify({'running': sampler.running, 'capture': sampler.capture}), 200
+
+@admin_bp.route('/profiling/sampler', methods=['POST'])
+@admin_required
+def start_sampling():
+    """Muestrear pilas durante duration segundos (de este worker)
+
+    Cuerpo: {"duration": 30, "interval_ms": 10, "routes": {"questions.get_questions": 0.1},
+    "all_threads": false}. Sin routes se muestrean todas las peticiones.
+    """
+    disabled = _profiling_disabled()
+    if disabled:
+        return disabled
+    data = request.get_json(silent=True) or {}
+    try:
+        duration = float(data.get('duration', 30))
+        interval = float(data.get('interval_ms', 10)) / 1000
+        routes = {str(k): float(v) for k, v in (data.get('routes') or {}).items()}
+    except (TypeError, ValueError, AttributeError):
+        return jsonify({'error': 'duration, interval_ms y routes deben ser numéricos'}), 400
+    if not 0 < duration <= max_duration():
+        return jsonify({'error': f'duration debe estar entre 0 y {max_duration()} segundos'}), 400
+    if not 0.001 <= interval <= 1:
+        return jsonify({'error': 'interval_ms debe estar entre 1 y 1000'}), 400
+    if any(not 0 < fraction <= 1 for fraction in routes.values()):
+        return jsonify({'error': 'Las fracciones de routes deben estar en (0, 1]'}), 400
+
+    try:
+        start_sampler(duration, interval, routes=routes, all_threads=bool(data.get('all_threads')))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 409
+    logger.info('sampling started', extra={'duration': duration, 'routes': routes})
+    return jsonify({'running': True, 'capture': sampler.capture}), 202
+
+@admin_bp.route('/profiling/sampler', methods=['DELETE'])
+@admin_required
+def stop_sampling():
+    """Terminar antes de tiempo la captura en curso y guardarla"""
+    if not sampler.running:
+        return jsonify({'error': 'No hay una captura en curso'}), 404
+    sampler.stop()
+    return jsonify({'running': False, 'capture': sampler.capture}), 200
+
+@admin_bp.route('/profiling/captures', methods=['GET'])
+@admin_required
+def list_captures():
+    """Capturas guardadas (muestreo .folded y cProfile .prof), más recientes primero"""
+    disabled = _profiling_disabled()
+    if disabled:
+        return disabled
+    return jsonify({'captures': capture_store().list()}), 200
+
+@admin_bp.route('/profiling/captures/<capture_id>', methods=['GET'])
+@admin_required
+def download_capture(capture_id):
+    """Descargar una captura; ?format=text resume una de cProfile (&sort=cumulative)"""
+    disabled = _profiling_disabled()
+    if disabled:
+        return disabled
+    path = capture_store().path(capture_id)
+    if path is None:
+        return jsonify({'error': 'Captura no encontrada'}), 404
+    try:
+        if request.args.get('format') == 'text' and path.endswith('.prof'):
+            with open(path, 'rb') as f:
+                text = cprofile_text(f.read(), sort=request.args.get('sort', 'cumulative'))
+            return Response(text, mimetype='text/plain')
+        return send_file(path, as_attachment=True, mimetype='text/plain' if path.endswith('.folded')
+                         else 'application/octet-stream')
+    except FileNotFoundError:
+        return jsonify({'error': 'Captura no encontrada'}), 404
+    except KeyError:
+        return jsonify({'error': 'sort no válido'}), 400
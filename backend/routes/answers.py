@@ -1,18 +1,49 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import or_, update
+from sqlalchemy.orm.exc import StaleDataError
 from models import db, Answer, Question
+from controllers.categories import invalidate_category_cache
+from controllers.documents import refresh_question_document
+from controllers.users import invalidate_user_stats
+from controllers.events import publish_question_event
+from controllers.notifications import notify, answer_created_event, answer_accepted_event
+from utils.concurrency import conflict_response, if_match_failed, version_tag
+from utils.idempotency import idempotent
+from utils.jobs import job_queue
+from utils.log import get_logger
 
 answers_bp = Blueprint('answers', __name__)
+logger = get_logger('answers')
+
+def _adjust_answer_count(question_id, delta):
+    """Mantener questions.answer_count en la misma transacción que la respuesta
+
+    UPDATE de Core: sumar en SQL evita perder incrementos concurrentes y no
+    cuenta como edición de la pregunta (ni updated_at ni versión cambian).
+    """
+    questions = Question.__table__
+    db.session.execute(
+        update(questions)
+        .where(questions.c.id == question_id)
+        .values(answer_count=questions.c.answer_count + delta, updated_at=questions.c.updated_at)
+    )
 
 @answers_bp.route('', methods=['POST'])  # Cambié de '/' a ''
 @jwt_required()
+@idempotent
 def create_answer():
     """Crear nueva respuesta"""
     try:
         current_user_id = int(get_jwt_identity())  # Convertir de string a int
         data = request.get_json()
         
-        print(f"DEBUG answers: user_id={current_user_id}, data={data}")  # Debug
+        logger.debug('create_answer', extra={
+            'user_id': current_user_id,
+            'question_id': data.get('question_id'),
+            'content_length': len(data.get('content') or '')
+        })
         
         # Validar datos requeridos
         if not data.get('content') or not data.get('question_id'):
@@ -34,15 +65,23 @@ def create_answer():
         )
         
         db.session.add(answer)
+        _adjust_answer_count(question.id, 1)
         db.session.commit()
+        invalidate_category_cache()  # last_activity incluye las respuestas
+        invalidate_user_stats(current_user_id)
+        job_queue.enqueue('hot_scores', {'question_id': question.id})
+        answer_data = answer.to_dict(include_html=True)
+        publish_question_event(question.id, 'answer_created', answer_data)
+        notify(answer_created_event(answer, question, answer.author))
+        refresh_question_document(question.id)
         
         return jsonify({
             'message': 'Respuesta creada exitosamente',
-            'answer': answer.to_dict()
+            'answer': answer_data
         }), 201
         
     except Exception as e:
-        print(f"Error en create_answer: {str(e)}")  # Para debugging
+        logger.exception('Error en create_answer')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
@@ -58,6 +97,11 @@ def update_answer(answer_id):
         if answer.author_id != current_user_id:
             return jsonify({'error': 'No tienes permisos para editar esta respuesta'}), 403
         
+        # If-Match: rechazar ediciones hechas sobre una versión anterior
+        precondition_failed = if_match_failed(answer.version)
+        if precondition_failed:
+            return precondition_failed
+        
         data = request.get_json()
         
         # Actualizar contenido
@@ -67,14 +111,22 @@ def update_answer(answer_id):
             answer.content = data['content']
         
         db.session.commit()
+        answer_data = answer.to_dict(include_html=True)
+        publish_question_event(answer.question_id, 'answer_updated', answer_data)
+        refresh_question_document(answer_data['question_id'])
         
-        return jsonify({
+        response = jsonify({
             'message': 'Respuesta actualizada exitosamente',
-            'answer': answer.to_dict()
-        }), 200
+            'answer': answer_data
+        })
+        response.set_etag(version_tag(answer_data['version']))
+        return response, 200
         
+    except StaleDataError:
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
-        print(f"Error en update_answer: {str(e)}")  # Para debugging
+        logger.exception('Error en update_answer')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
@@ -90,14 +142,27 @@ def delete_answer(answer_id):
         if answer.author_id != current_user_id:
             return jsonify({'error': 'No tienes permisos para eliminar esta respuesta'}), 403
         
+        if not answer.is_active:
+            return jsonify({'error': 'Respuesta no encontrada'}), 404
+        
         # Soft delete
         answer.is_active = False
+        answer.deleted_at = datetime.utcnow()
+        _adjust_answer_count(answer.question_id, -1)
         db.session.commit()
+        invalidate_category_cache()  # last_activity incluye las respuestas
+        invalidate_user_stats(current_user_id)
+        job_queue.enqueue('hot_scores', {'question_id': answer.question_id})
+        publish_question_event(answer.question_id, 'answer_deleted', {'id': answer.id})
+        refresh_question_document(answer.question_id)
         
         return jsonify({'message': 'Respuesta eliminada exitosamente'}), 200
         
+    except StaleDataError:
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
-        print(f"Error en delete_answer: {str(e)}")  # Para debugging
+        logger.exception('Error en delete_answer')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
@@ -114,21 +179,56 @@ def accept_answer(answer_id):
         if question.author_id != current_user_id:
             return jsonify({'error': 'Solo el autor de la pregunta puede aceptar respuestas'}), 403
         
-        # Desmarcar otras respuestas aceptadas para esta pregunta
-        Answer.query.filter_by(question_id=answer.question_id).update({'is_accepted': False})
-        
-        # Marcar esta respuesta como aceptada
-        answer.is_accepted = True
-        question.is_solved = True
+        # If-Match se compara con la versión de la pregunta, que es lo que cambia
+        precondition_failed = if_match_failed(question.version)
+        if precondition_failed:
+            return precondition_failed
+        
+        # Marcar la pregunta como resuelta solo si sigue en la versión leída: el
+        # UPDATE bloquea la fila, así que dos aceptaciones simultáneas se serializan
+        # y la segunda no encuentra su versión (409)
+        questions = Question.__table__
+        solved = db.session.execute(
+            update(questions)
+            .where(questions.c.id == question.id, questions.c.version == question.version)
+            .values(is_solved=True, version=questions.c.version + 1)
+        )
+        if solved.rowcount != 1:
+            db.session.rollback()
+            return conflict_response()
+        
+        # Una sola sentencia que toca solo la respuesta aceptada antes (si la hay)
+        # y la nueva, en lugar de todas las respuestas de la pregunta
+        answers = Answer.__table__
+        changed = db.session.execute(
+            update(answers)
+            .where(
+                answers.c.question_id == question.id,
+                or_(answers.c.is_accepted.is_(True), answers.c.id == answer.id)
+            )
+            .values(is_accepted=answers.c.id == answer.id, version=answers.c.version + 1)
+            .returning(answers.c.author_id)
+        ).scalars().all()
+        affected_authors = set(changed)
         
         db.session.commit()
-        
-        return jsonify({
+        invalidate_category_cache()  # Cambia el número de preguntas sin resolver
+        invalidate_user_stats(*affected_authors)
+        publish_question_event(question.id, 'answer_accepted', {
+            'answer_id': answer.id, 'question_version': question.version
+        })
+        notify(answer_accepted_event(answer, question, question.author))
+        refresh_question_document(question.id)
+        
+        response = jsonify({
             'message': 'Respuesta marcada como aceptada',
-            'answer': answer.to_dict()
-        }), 200
+            'answer': answer.to_dict(),
+            'question_version': question.version
+        })
+        response.set_etag(version_tag(question.version))
+        return response, 200
         
     except Exception as e:
-        print(f"Error en accept_answer: {str(e)}")  # Para debugging
+        logger.exception('Error en accept_answer')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500 
\ No newline at end of file
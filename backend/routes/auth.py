@@ -2,8 +2,10 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from models import db, User
+from utils.log import get_logger
 
 auth_bp = Blueprint('auth', __name__)
+logger = get_logger('auth')
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -48,7 +50,7 @@ def register():
         }), 201
         
     except Exception as e:
-        print(f"Error en registro: {str(e)}")  # Para debugging
+        logger.exception('Error en registro')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
@@ -88,7 +90,7 @@ def login():
         }), 200
         
     except Exception as e:
-        print(f"Error en login: {str(e)}")  # Para debugging
+        logger.exception('Error en login')
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
 @auth_bp.route('/profile', methods=['GET'])
@@ -107,7 +109,7 @@ def get_profile():
         }), 200
         
     except Exception as e:
-        print(f"Error en get_profile: {str(e)}")  # Para debugging
+        logger.exception('Error en get_profile')
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
 @auth_bp.route('/verify-token', methods=['POST'])
@@ -127,5 +129,5 @@ def verify_token():
         }), 200
         
     except Exception as e:
-        print(f"Error en verify_token: {str(e)}")  # Para debugging
+        logger.exception('Error en verify_token')
         return jsonify({'error': 'Token inválido'}), 401 
\ No newline at end of file
@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify
+from controllers.categories import get_categories, get_category
+from utils.log import get_logger
+
+categories_bp = Blueprint('categories', __name__)
+logger = get_logger('categories')
+
+@categories_bp.route('', methods=['GET'])
+def list_categories():
+    """Obtener categorías activas con número de preguntas y estadísticas"""
+    try:
+        return jsonify({'categories': get_categories()}), 200
+        
+    except Exception as e:
+        logger.exception('Error en list_categories')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@categories_bp.route('/<int:category_id>', methods=['GET'])
+def category_detail(category_id):
+    """Obtener una categoría con sus estadísticas"""
+    try:
+        category = get_category(category_id)
+        
+        if not category:
+            return jsonify({'error': 'Categoría no encontrada'}), 404
+        
+        return jsonify({'category': category}), 200
+        
+    except Exception as e:
+        logger.exception('Error en category_detail')
+        return jsonify({'error': 'Error interno del servidor'}), 500
\ No newline at end of file
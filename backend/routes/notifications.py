@@ -0,0 +1,85 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models import db, Notification
+from utils.log import get_logger
+
+notifications_bp = Blueprint('notifications', __name__)
+logger = get_logger('notifications')
+
+@notifications_bp.route('', methods=['GET'])
+@jwt_required()
+def get_notifications():
+    """Obtener la bandeja de notificaciones del usuario actual (paginada por cursor)"""
+    try:
+        current_user_id = int(get_jwt_identity())  # Convertir de string a int
+        
+        before = request.args.get('before', type=int)  # ID de la última notificación recibida
+        per_page = min(request.args.get('per_page', 20, type=int), 50)  # Máximo 50 por página
+        unread_only = request.args.get('unread', '').lower() in ('1', 'true')
+        
+        query = Notification.query.filter_by(user_id=current_user_id)
+        if unread_only:
+            query = query.filter_by(is_read=False)
+        if before:
+            query = query.filter(Notification.id < before)
+        
+        # Se pide uno de más para saber si hay otra página
+        items = query.order_by(Notification.id.desc()).limit(per_page + 1).all()
+        has_next = len(items) > per_page
+        items = items[:per_page]
+        
+        return jsonify({
+            'notifications': [n.to_dict() for n in items],
+            'pagination': {
+                'per_page': per_page,
+                'has_next': has_next,
+                'next_before': items[-1].id if has_next else None
+            }
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en get_notifications')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@notifications_bp.route('/unread-count', methods=['GET'])
+@jwt_required()
+def get_unread_count():
+    """Obtener el número de notificaciones no leídas"""
+    try:
+        current_user_id = int(get_jwt_identity())  # Convertir de string a int
+        count = Notification.query.filter_by(user_id=current_user_id, is_read=False).count()
+        
+        return jsonify({'unread_count': count}), 200
+        
+    except Exception as e:
+        logger.exception('Error en get_unread_count')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@notifications_bp.route('/read', methods=['POST'])
+@jwt_required()
+def mark_read():
+    """Marcar notificaciones como leídas (todas si no se indican IDs)"""
+    try:
+        current_user_id = int(get_jwt_identity())  # Convertir de string a int
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids') if isinstance(data, dict) else None
+        
+        # Sin "ids" se marcan todas; si viene, debe ser una lista de enteros
+        if ids is not None and not (
+            isinstance(ids, list) and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+        ):
+            return jsonify({'error': 'ids debe ser una lista de IDs numéricos'}), 400
+        
+        query = Notification.query.filter_by(user_id=current_user_id, is_read=False)
+        if ids is not None:
+            query = query.filter(Notification.id.in_(ids))
+        
+        updated = query.update({'is_read': True}, synchronize_session=False)
+        db.session.commit()
+        
+        return jsonify({'updated': updated}), 200
+        
+    except Exception as e:
+        logger.exception('Error en mark_read')
+        db.session.rollback()
+        return jsonify({'error': 'Error interno del servidor'}), 500
\ No newline at end of file
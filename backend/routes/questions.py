@@ -1,109 +1,188 @@
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Question, User
 from models.answer import Answer
+from controllers.categories import invalidate_category_cache
+from controllers.documents import get_question_document, refresh_question_document
+from controllers.users import invalidate_user_stats
+from controllers.events import get_broker, question_channel, publish_question_event
+from controllers.similarity import signature_from_bytes, find_similar_questions
+from controllers.suggest import suggest_index
+from controllers.tags import normalize_tags, set_question_tags, release_question_tags, tagged_question_ids
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from utils.concurrency import conflict_response, if_match_failed, version_tag
+from utils.idempotency import idempotent
+from utils.jobs import job_queue
+from utils.log import get_logger
+from utils.params import parse_id_list
+from utils.singleflight import get_group
 
 questions_bp = Blueprint('questions', __name__)
+logger = get_logger('questions')
+question_lists = get_group('question_lists')
+question_details = get_group('question_details')
 
 @questions_bp.route('', methods=['GET'])  # Cambié de '/' a ''
 def get_questions():
     """Obtener lista de preguntas con filtros opcionales"""
     try:
+        # Consulta por lote: ?ids=1,2,3
+        if 'ids' in request.args:
+            return get_questions_by_ids(request.args['ids'])
+        
         # Parámetros de query
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         search = request.args.get('search', '')
         category_id = request.args.get('category_id', type=int)
-        sort_by = request.args.get('sort_by', 'created_at')  # created_at, votes, views
+        tags = request.args.get('tags', '')  # Separadas por comas
+        tag_mode = request.args.get('tag_mode', 'all')  # all (AND), any (OR)
+        sort_by = request.args.get('sort_by', 'created_at')  # created_at, votes, views, hot
         order = request.args.get('order', 'desc')  # asc, desc
+        feed = request.args.get('filter', '')  # unanswered, unsolved
         
         # Validar parámetros
         per_page = min(per_page, 50)  # Máximo 50 por página
-        if sort_by not in ['created_at', 'votes', 'views']:
+        if sort_by not in ['created_at', 'votes', 'views', 'hot']:
             sort_by = 'created_at'
+        if sort_by == 'hot':
+            sort_by = 'hot_score'  # Columna precalculada e indexada
         if order not in ['asc', 'desc']:
             order = 'desc'
+        if feed not in ['', 'unanswered', 'unsolved']:
+            return jsonify({'error': 'filter debe ser unanswered o unsolved'}), 400
         
-        # Construir query base
-        query = Question.query.filter_by(is_active=True)
-        
-        # Filtros
-        if search:
-            query = query.filter(
-                Question.title.contains(search) | 
-                Question.content.contains(search)
-            )
-        
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        
-        # Ordenamiento
-        if order == 'desc':
-            query = query.order_by(getattr(Question, sort_by).desc())
-        else:
-            query = query.order_by(getattr(Question, sort_by).asc())
-        
-        # Paginación
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        
-        questions = [q.to_dict() for q in pagination.items]
+        try:
+            tag_names = normalize_tags(tags) if tags else []
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        return jsonify({
-            'questions': questions,
-            'pagination': {
-                'page': page,
-                'pages': pagination.pages,
-                'per_page': per_page,
-                'total': pagination.total,
-                'has_next': pagination.has_next,
-                'has_prev': pagination.has_prev
-            }
-        }), 200
+        # Peticiones idénticas simultáneas comparten una sola consulta
+        key = (page, per_page, search, category_id, tuple(tag_names), tag_mode, sort_by, order, feed)
+        return jsonify(question_lists.do(key, lambda: list_questions(
+            page, per_page, search, category_id, tag_names, tag_mode, sort_by, order, feed
+        ))), 200
         
     except Exception as e:
-        print(f"Error en get_questions: {str(e)}")
+        logger.exception('Error en get_questions')
         return jsonify({'error': 'Error interno del servidor'}), 500
 
+def list_questions(page, per_page, search, category_id, tag_names, tag_mode, sort_by, order, feed=''):
+    """Página de preguntas activas con los filtros ya validados"""
+    # Construir query base
+    query = Question.query.filter_by(is_active=True)
+    
+    # Feeds de triage: mismos predicados que ix_questions_unanswered / ix_questions_unsolved
+    if feed == 'unanswered':
+        query = query.filter_by(answer_count=0)
+    elif feed == 'unsolved':
+        query = query.filter_by(is_solved=False)
+    
+    # Filtros
+    if search:
+        query = query.filter(
+            Question.title.contains(search) | 
+            Question.content.contains(search)
+        )
+    
+    if category_id:
+        query = query.filter_by(category_id=category_id)
+    
+    if tag_names:
+        question_ids = tagged_question_ids(tag_names, match_all=tag_mode != 'any')
+        if question_ids is None:
+            query = query.filter(db.false())
+        else:
+            query = query.filter(Question.id.in_(question_ids))
+    
+    # Ordenamiento
+    if order == 'desc':
+        query = query.order_by(getattr(Question, sort_by).desc())
+    else:
+        query = query.order_by(getattr(Question, sort_by).asc())
+    
+    # Paginación
+    pagination = query.paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    
+    return {
+        'questions': [q.to_dict() for q in pagination.items],
+        'pagination': {
+            'page': page,
+            'pages': pagination.pages,
+            'per_page': per_page,
+            'total': pagination.total,
+            'has_next': pagination.has_next,
+            'has_prev': pagination.has_prev
+        }
+    }
+
+def get_questions_by_ids(raw_ids):
+    """Resolver varias preguntas en una sola consulta IN, en el orden pedido"""
+    try:
+        ids = parse_id_list(raw_ids, current_app.config['BULK_MAX_IDS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    found = {
+        q.id: q for q in Question.query.options(joinedload(Question.author)).filter(
+            Question.id.in_(ids), Question.is_active.is_(True)
+        )
+    }
+    
+    return jsonify({
+        'questions': [found[i].to_dict() for i in ids if i in found],
+        'missing': [i for i in ids if i not in found]
+    }), 200
+
 @questions_bp.route('/<int:question_id>', methods=['GET'])
 def get_question(question_id):
     """Obtener una pregunta específica con sus respuestas"""
     try:
-        question = Question.query.get_or_404(question_id)
-        
-        if not question.is_active:
+        # ?format=html añade content_html (Markdown renderizado y sanitizado)
+        content_format = request.args.get('format', 'markdown')
+        if content_format not in ('markdown', 'html'):
+            return jsonify({'error': 'Formato inválido (markdown, html)'}), 400
+        
+        # Documento precalculado por clave primaria más los autores actuales; las
+        # peticiones simultáneas de la misma pregunta comparten la lectura
+        question_data = question_details.do((question_id, content_format), lambda: get_question_document(
+            question_id, include_html=content_format == 'html'
+        ))
+        if question_data is None:
             return jsonify({'error': 'Pregunta no encontrada'}), 404
         
-        # Incrementar contador de vistas
-        question.views += 1
-        db.session.commit()
-        
-        # Obtener respuestas ordenadas por votos
-        answers = question.answers.filter_by(is_active=True).order_by(
-            Answer.is_accepted.desc(),
-            Answer.votes.desc(),
-            Answer.created_at.asc()
-        ).all()
-        
-        question_data = question.to_dict()
-        question_data['answers'] = [answer.to_dict() for answer in answers]
+        # Incrementar contador de vistas fuera del request (se suman por lotes)
+        job_queue.enqueue('question_views', {'question_id': question_id})
         
-        return jsonify(question_data), 200
+        # El resultado es compartido: no se modifica
+        response = jsonify(dict(question_data, views=question_data['views'] + 1))
+        response.set_etag(version_tag(question_data['version']))  # Para If-Match al editar
+        return response, 200
         
     except Exception as e:
-        print(f"Error en get_question: {str(e)}")
+        logger.exception('Error en get_question')
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 @questions_bp.route('', methods=['POST'])  # Cambié de '/' a ''
 @jwt_required()
+@idempotent
 def create_question():
     """Crear nueva pregunta"""
     try:
         current_user_id = int(get_jwt_identity())  # Convertir de string a int
         data = request.get_json()
         
-        print(f"DEBUG: user_id={current_user_id}, data={data}")  # Debug
+        logger.debug('create_question', extra={
+            'user_id': current_user_id,
+            'category_id': data.get('category_id'),
+            'title_length': len(data.get('title') or ''),
+            'content_length': len(data.get('content') or '')
+        })
         
         # Validar datos requeridos
         if not data.get('title') or not data.get('content'):
@@ -115,6 +194,11 @@ def create_question():
         if len(data['content']) < 20:
             return jsonify({'error': 'El contenido debe tener al menos 20 caracteres'}), 400
         
+        try:
+            tag_names = normalize_tags(data.get('tags'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Crear pregunta
         question = Question(
             title=data['title'],
@@ -122,9 +206,14 @@ def create_question():
             author_id=current_user_id,
             category_id=data.get('category_id')
         )
+        question.refresh_hot_score()
+        set_question_tags(question, tag_names)
         
         db.session.add(question)
         db.session.commit()
+        invalidate_category_cache()
+        invalidate_user_stats(current_user_id)
+        job_queue.enqueue('similarity_index', {'question_id': question.id})
         
         return jsonify({
             'message': 'Pregunta creada exitosamente',
@@ -132,7 +221,7 @@ def create_question():
         }), 201
         
     except Exception as e:
-        print(f"Error en create_question: {str(e)}")
+        logger.exception('Error en create_question')
         db.session.rollback()
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
@@ -148,6 +237,15 @@ def update_question(question_id):
         if question.author_id != current_user_id:
             return jsonify({'error': 'No tienes permisos para editar esta pregunta'}), 403
         
+        # Una pregunta eliminada no se edita: tocaría los contadores de etiquetas
+        if not question.is_active:
+            return jsonify({'error': 'Pregunta no encontrada'}), 404
+        
+        # If-Match: rechazar ediciones hechas sobre una versión anterior
+        precondition_failed = if_match_failed(question.version)
+        if precondition_failed:
+            return precondition_failed
+        
         data = request.get_json()
         
         # Actualizar campos
@@ -161,18 +259,39 @@ def update_question(question_id):
                 return jsonify({'error': 'El contenido debe tener al menos 20 caracteres'}), 400
             question.content = data['content']
         
-        if 'category_id' in data:
+        if 'tags' in data:
+            try:
+                set_question_tags(question, normalize_tags(data['tags']))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            # Las etiquetas no son columnas: forzar el UPDATE para que cambie la versión
+            question.updated_at = datetime.utcnow()
+        
+        category_changed = 'category_id' in data and data['category_id'] != question.category_id
+        if category_changed:
             question.category_id = data['category_id']
         
         db.session.commit()
-        
-        return jsonify({
+        if category_changed:
+            invalidate_category_cache()
+        if 'title' in data or 'content' in data:
+            job_queue.enqueue('similarity_index', {'question_id': question.id})
+        question_data = question.to_dict(include_html=True)
+        publish_question_event(question.id, 'question_updated', question_data)
+        refresh_question_document(question_id)
+        
+        response = jsonify({
             'message': 'Pregunta actualizada exitosamente',
-            'question': question.to_dict()
-        }), 200
+            'question': question_data
+        })
+        response.set_etag(version_tag(question_data['version']))
+        return response, 200
         
+    except StaleDataError:
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
-        print(f"Error en update_question: {str(e)}")
+        logger.exception('Error en update_question')
         db.session.rollback()
         return jsonify({'error': 'Error interno del servidor'}), 500
 
@@ -188,13 +307,119 @@ def delete_question(question_id):
         if question.author_id != current_user_id:
             return jsonify({'error': 'No tienes permisos para eliminar esta pregunta'}), 403
         
+        # Borrar dos veces descontaría dos veces las etiquetas compartidas
+        if not question.is_active:
+            return jsonify({'error': 'Pregunta no encontrada'}), 404
+        
         # Soft delete
         question.is_active = False
+        question.deleted_at = datetime.utcnow()
+        release_question_tags(question)
         db.session.commit()
+        invalidate_category_cache()
+        invalidate_user_stats(current_user_id)
+        job_queue.enqueue('similarity_index', {'question_id': question.id})
+        publish_question_event(question.id, 'question_deleted', {'id': question.id})
+        refresh_question_document(question_id)
         
         return jsonify({'message': 'Pregunta eliminada exitosamente'}), 200
         
+    except StaleDataError:
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
-        print(f"Error en delete_question: {str(e)}")
+        logger.exception('Error en delete_question')
         db.session.rollback()
-        return jsonify({'error': 'Error interno del servidor'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@questions_bp.route('/suggest', methods=['GET'])
+def suggest_questions():
+    """Autocompletar títulos mientras se escribe (?q=prefijo)"""
+    try:
+        text = request.args.get('q', '')[:100]
+        limit = min(max(request.args.get('limit', 8, type=int), 1), 10)
+        
+        return jsonify({
+            'suggestions': [
+                {'id': question_id, 'title': title}
+                for question_id, title in suggest_index.suggest(text, limit=limit)
+            ]
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en suggest_questions')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@questions_bp.route('/similar', methods=['POST'])
+def similar_questions():
+    """Buscar preguntas parecidas a un borrador (detección de duplicados)"""
+    try:
+        data = request.get_json() or {}
+        title = data.get('title', '')
+        content = data.get('content', '')
+        limit = min(int(data.get('limit', 5)), 20)  # Máximo 20 resultados
+        
+        if len(title.strip()) < 3:
+            return jsonify({'questions': []}), 200
+        
+        return jsonify({
+            'questions': find_similar_questions(title, content, limit=limit)
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en similar_questions')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@questions_bp.route('/<int:question_id>/related', methods=['GET'])
+def related_questions(question_id):
+    """Obtener preguntas relacionadas con una pregunta existente"""
+    try:
+        question = Question.query.get_or_404(question_id)
+        
+        if not question.is_active:
+            return jsonify({'error': 'Pregunta no encontrada'}), 404
+        
+        limit = min(request.args.get('limit', 5, type=int), 20)
+        signature = signature_from_bytes(question.similarity_signature)
+        
+        return jsonify({
+            'questions': find_similar_questions(
+                question.title, question.content, limit=limit,
+                exclude_id=question.id, signature=signature
+            )
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en related_questions')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@questions_bp.route('/<int:question_id>/events', methods=['GET'])
+def question_events(question_id):
+    """Canal SSE con respuestas nuevas, aceptadas, ediciones y eliminaciones"""
+    question = Question.query.get_or_404(question_id)
+    
+    if not question.is_active:
+        return jsonify({'error': 'Pregunta no encontrada'}), 404
+    
+    # No retener una conexión de la base de datos mientras dure el stream
+    db.session.close()
+    
+    subscription = get_broker().subscribe(question_channel(question_id))
+    heartbeat = current_app.config['EVENT_HEARTBEAT_SECONDS']
+    
+    def stream():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ': ping\n\n'  # Mantener viva la conexión a través de proxies
+                    continue
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        finally:
+            subscription.close()
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
\ No newline at end of file
@@ -0,0 +1,25 @@
+from flask import Blueprint, request, jsonify
+from models import Tag
+from utils.log import get_logger
+
+tags_bp = Blueprint('tags', __name__)
+logger = get_logger('tags')
+
+@tags_bp.route('', methods=['GET'])
+def get_tags():
+    """Obtener etiquetas más usadas, opcionalmente filtradas por prefijo"""
+    try:
+        prefix = request.args.get('q', '').strip().lower()
+        limit = min(request.args.get('limit', 20, type=int), 100)  # Máximo 100
+        
+        query = Tag.query.filter(Tag.question_count > 0)
+        if prefix:
+            query = query.filter(Tag.name.startswith(prefix, autoescape=True))
+        
+        tags = query.order_by(Tag.question_count.desc(), Tag.name).limit(limit).all()
+        
+        return jsonify({'tags': [tag.to_dict() for tag in tags]}), 200
+        
+    except Exception as e:
+        logger.exception('Error en get_tags')
+        return jsonify({'error': 'Error interno del servidor'}), 500
\ No newline at end of file
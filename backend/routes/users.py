@@ -1,10 +1,86 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, User
 from models.question import Question
 from models.answer import Answer
+from controllers.leaderboard import SCOPES, leaderboard, scope_key
+from controllers.users import get_user_stats
+from utils.log import get_logger
+from utils.params import parse_id_list
 
 users_bp = Blueprint('users', __name__)
+logger = get_logger('users')
+
+@users_bp.route('', methods=['GET'])
+def get_users():
+    """Obtener varios perfiles públicos por ID (?ids=1,2,3) en una sola consulta"""
+    try:
+        try:
+            ids = parse_id_list(request.args.get('ids', ''), current_app.config['BULK_MAX_IDS'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        found = {
+            u.id: u for u in User.query.filter(User.id.in_(ids), User.is_active.is_(True))
+        }
+        
+        return jsonify({
+            'users': [found[i].to_dict() for i in ids if i in found],
+            'missing': [i for i in ids if i not in found]
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en get_users')
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+@users_bp.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Usuarios ordenados por reputación (?scope=global|university|major&value=...)"""
+    try:
+        scope = request.args.get('scope', 'global')
+        if scope not in SCOPES:
+            return jsonify({'error': f"scope debe ser uno de: {', '.join(SCOPES)}"}), 400
+        key = scope_key(scope, request.args.get('value'))
+        if key is None:
+            return jsonify({'error': 'Indica value para este scope'}), 400
+        
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 50)  # Máximo 50 por página
+        
+        total, entries = leaderboard.page(key, page, per_page)
+        users = {
+            u.id: u for u in User.query.filter(User.id.in_([user_id for _, user_id, _ in entries]))
+        }
+        pages = (total + per_page - 1) // per_page
+        
+        return jsonify({
+            'scope': scope,
+            'value': request.args.get('value') if scope != 'global' else None,
+            'users': [
+                {
+                    'rank': rank,
+                    'id': user_id,
+                    'username': users[user_id].username,
+                    'avatar_url': users[user_id].avatar_url,
+                    'university': users[user_id].university,
+                    'major': users[user_id].major,
+                    'reputation': reputation
+                }
+                for rank, user_id, reputation in entries if user_id in users
+            ],
+            'pagination': {
+                'page': page,
+                'pages': pages,
+                'per_page': per_page,
+                'total': total,
+                'has_next': page < pages,
+                'has_prev': page > 1
+            }
+        }), 200
+        
+    except Exception as e:
+        logger.exception('Error en get_leaderboard')
+        return jsonify({'error': 'Error interno del servidor'}), 500
 
 @users_bp.route('/profile', methods=['PUT'])
 @jwt_required()
@@ -50,6 +126,7 @@ def update_profile():
         }), 200
         
     except Exception as e:
+        logger.exception('Error en update_profile')
         db.session.rollback()
         return jsonify({'error': 'Error interno del servidor'}), 500
 
@@ -63,10 +140,13 @@ def get_user(user_id):
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
         return jsonify({
-            'user': user.to_dict()
+            'user': user.to_dict(),
+            'stats': get_user_stats(user.id),
+            'rank': leaderboard.rank(user.id)
         }), 200
         
     except Exception as e:
+        logger.exception('Error en get_user')
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 @users_bp.route('/<int:user_id>/questions', methods=['GET'])
@@ -101,6 +181,7 @@ def get_user_questions(user_id):
         }), 200
         
     except Exception as e:
+        logger.exception('Error en get_user_questions')
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 @users_bp.route('/<int:user_id>/answers', methods=['GET'])
@@ -135,4 +216,5 @@ def get_user_answers(user_id):
         }), 200
         
     except Exception as e:
+        logger.exception('Error en get_user_answers')
         return jsonify({'error': 'Error interno del servidor'}), 500 
\ No newline at end of file
@@ -4,6 +4,7 @@ Script para agregar datos de ejemplo al sistema StudentOverflow
 """
 from app import create_app
 from models import db, User, Question, Answer, Category
+from controllers.ranking import recompute_hot_scores
 from datetime import datetime, timedelta
 import random
 
@@ -306,6 +307,9 @@ Los hooks como `useState`, `useEffect`, `useContext` cubren todos los casos de u
         
         db.session.commit()
         
+        # Calcular scores de tendencias con los votos/vistas de ejemplo
+        recompute_hot_scores()
+        
         print("✅ Datos de ejemplo creados exitosamente!")
         print(f"📊 Resumen:")
         print(f"   - {len(categories)} categorías")
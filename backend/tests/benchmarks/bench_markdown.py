@@ -0,0 +1,42 @@
+import itertools
+
+from models import Question
+from utils import markdown
+from utils.markdown import render_markdown
+
+# Contenido representativo de una pregunta: párrafos, lista, enlace y código
+SAMPLE = '\n\n'.join([
+    '¿Cómo puedo **ordenar** una lista de diccionarios por una clave en Python?',
+    'Tengo algo así y no sé si es la forma [recomendada](https://docs.python.org/3/howto/sorting.html):',
+    '```python\nusers = [{"name": "ana", "age": 30}, {"name": "luis", "age": 25}]\n'
+    'users.sort(key=lambda user: user["age"])\nprint(users)\n```',
+    '- ¿Es estable?\n- ¿Qué pasa si falta la clave?\n- ¿Conviene `operator.itemgetter`?',
+    '> Nota: necesito que funcione también con Python 3.8.',
+] * 3)
+
+
+def test_stored_html_vs_render_on_read(bench):
+    counter = itertools.count()
+
+    # Sin HTML guardado ni caché: cada lectura renderiza y sanitiza
+    render = bench('render_markdown (sin caché)',
+                   lambda: render_markdown(f'{SAMPLE}\n\n{next(counter)}'), number=30, rounds=3)
+    # Misma entrada ya renderizada: hash del contenido + TTLCache
+    cached = bench('render_markdown (caché)', lambda: render_markdown(SAMPLE))
+
+    stored = Question(title='Ordenar diccionarios', content=SAMPLE)
+    assert stored.content_html
+    legacy = Question(title='Ordenar diccionarios', content=SAMPLE)
+    legacy.content_html = None  # Fila importada en bloque: se renderiza al leer
+
+    def legacy_to_dict():
+        markdown._cache.invalidate()
+        return legacy.to_dict(include_author=False, include_html=True)
+
+    read_stored = bench('to_dict(include_html) con content_html',
+                        lambda: stored.to_dict(include_author=False, include_html=True))
+    read_legacy = bench('to_dict(include_html) sin content_html', legacy_to_dict, number=30, rounds=3)
+    print(f'content_html ahorra {read_legacy - read_stored:.1f} µs por lectura')
+
+    assert cached < render
+    assert read_stored < read_legacy
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+import flask
+
+from utils.ratelimit import RateLimiter, parse_limit, rate_limiter
+from utils.shared_store import create_store
+
+# Umbral holgado: detecta que el limitador deje de ser barato (p. ej. una
+# consulta extra por petición), no variaciones de la máquina
+RATELIMIT_BUDGET_US = float(os.environ.get('RATELIMIT_BUDGET_US', '2000'))
+
+# Capacidad enorme: se mide el camino normal (petición permitida), no el 429
+_LIMIT = '1000000/second'
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def storage(request, tmp_path):
+    """(nombre, RATELIMIT_STORAGE_URL) de cada almacén medido"""
+    return request.param, '' if request.param == 'memory' else f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+
+def test_hit_overhead(bench, storage):
+    name, storage_url = storage
+    limiter = RateLimiter()
+    limiter.store = create_store(storage_url)
+    capacity, rate = parse_limit(_LIMIT)
+
+    per_call = bench(f'hit() [{name}]',
+                     lambda: limiter.hit('bench:ip:127.0.0.1', capacity, rate))
+
+    assert per_call < RATELIMIT_BUDGET_US
+
+
+def test_check_overhead_per_request(bench, make_app, storage):
+    name, storage_url = storage
+    app = make_app(RATELIMIT_ENABLED=True, RATELIMIT_STORAGE_URL=storage_url,
+                   RATELIMITS={'auth.login': _LIMIT})
+    client = app.test_client()
+    token = client.post('/api/auth/register', json={
+        'username': 'bench', 'email': 'bench@example.com', 'password': 'secreto123',
+        'first_name': 'Bench', 'last_name': 'Test'
+    }).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Endpoint limitado con JWT: se consultan el bucket por IP y el del usuario
+    with app.test_request_context('/api/auth/login', method='POST', headers=headers):
+        assert flask.request.endpoint in rate_limiter.limits
+        per_request = bench(f'check() [{name}]', rate_limiter.check, number=500)
+
+    assert rate_limiter.limited == 0
+    assert per_request < 2 * RATELIMIT_BUDGET_US
@@ -0,0 +1,22 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def bench():
+    """Medir una función: devuelve microsegundos por llamada (mejor de varias rondas)"""
+    def measure(name, func, number=2000, rounds=5):
+        func()  # Calentar cachés e imports
+        best = min(_timed(func, number) for _ in range(rounds))
+        per_call = best / number * 1e6
+        print(f'\n{name}: {per_call:.1f} µs/op')
+        return per_call
+    return measure
+
+
+def _timed(func, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - started
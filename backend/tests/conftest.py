@@ -0,0 +1,62 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Fábrica de aplicaciones sobre una base SQLite temporal; acepta overrides de Config"""
+    def factory(**overrides):
+        settings = dict(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.db'}",
+            AUTO_CREATE_SCHEMA=True,
+            JOB_QUEUE_ASYNC=False,
+            RATELIMIT_ENABLED=False,
+            PROFILING_ENABLED=False,
+            LOG_LEVEL='WARNING',
+        )
+        settings.update(overrides)
+        for name, value in settings.items():
+            monkeypatch.setattr(Config, name, value, raising=False)
+
+        # Los índices y cachés del proceso sobreviven entre aplicaciones
+        from controllers.categories import invalidate_category_cache
+        from controllers.leaderboard import leaderboard
+        from controllers.similarity import similarity_index
+        from controllers.suggest import suggest_index
+        from controllers.users import _cache as user_stats_cache
+        invalidate_category_cache()
+        user_stats_cache.invalidate()
+        leaderboard.invalidate()
+        similarity_index.invalidate()
+        suggest_index._built_at = None
+
+        from app import create_app
+        return create_app()
+    return factory
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Registrar un usuario y devolver las cabeceras de autenticación"""
+    def factory(username, client=client, **kwargs):
+        response = client.post('/api/auth/register', json={
+            'username': username,
+            'email': f'{username}@example.com',
+            'password': 'secreto123',
+            'first_name': username.title(),
+            'last_name': 'Test',
+        }, **kwargs)
+        assert response.status_code == 201, response.get_json()
+        return {'Authorization': f"Bearer {response.get_json()['token']}"}
+    return factory
@@ -0,0 +1,29 @@
+from controllers.archive import archive_deleted
+from models import db, ArchivedAnswer, ArchivedQuestion
+
+QUESTION = {'title': 'Cómo ordenar una lista en Python', 'content': 'Necesito ordenar una lista de diccionarios.'}
+ANSWER = 'Usa sorted() con una función key que devuelva la clave.'
+
+
+def _create_and_delete(client, headers):
+    question = client.post('/api/questions', json=QUESTION, headers=headers).get_json()['question']
+    answer = client.post('/api/answers', json={'question_id': question['id'], 'content': ANSWER},
+                         headers=headers).get_json()['answer']
+    assert client.delete(f"/api/questions/{question['id']}", headers=headers).status_code == 200
+    return question['id'], answer['id']
+
+
+def test_ids_are_not_reused_after_archiving(app, client, register):
+    headers = register('autora')
+
+    first = _create_and_delete(client, headers)
+    with app.app_context():
+        assert archive_deleted(older_than_days=0) == {'questions': 1, 'answers': 1}
+
+    # La tabla principal quedó vacía: el ID nuevo no puede repetir el archivado
+    second = _create_and_delete(client, headers)
+    with app.app_context():
+        assert archive_deleted(older_than_days=0) == {'questions': 1, 'answers': 1}
+        assert second[0] > first[0] and second[1] > first[1]
+        assert sorted(db.session.scalars(db.select(ArchivedQuestion.id))) == [first[0], second[0]]
+        assert sorted(db.session.scalars(db.select(ArchivedAnswer.id))) == [first[1], second[1]]
@@ -0,0 +1,89 @@
+import threading
+
+from routes import answers as answers_routes
+
+QUESTION = {'title': 'Cómo ordenar una lista en Python', 'content': 'Necesito ordenar una lista de diccionarios.'}
+ANSWER = 'Usa sorted() con una función key que devuelva la clave.'
+
+
+def _question(client, headers):
+    response = client.post('/api/questions', json=QUESTION, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['question']['id']
+
+
+def _answer(client, headers, question_id, content=ANSWER):
+    response = client.post('/api/answers', json={'question_id': question_id, 'content': content}, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['answer']['id']
+
+
+def test_etag_changes_after_each_edit(client, register):
+    author = register('autora')
+    question_id = _question(client, author)
+
+    etag = client.get(f'/api/questions/{question_id}').headers['ETag']
+    seen = [etag]
+    for title in ('Cómo ordenar una lista en Python 3', 'Ordenar diccionarios por clave'):
+        response = client.put(f'/api/questions/{question_id}', json={'title': title},
+                              headers={**author, 'If-Match': etag})
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert client.get(f'/api/questions/{question_id}').headers['ETag'] == etag
+        seen.append(etag)
+
+    assert len(set(seen)) == 3
+
+
+def test_stale_if_match_returns_412(client, register):
+    author = register('autora')
+    question_id = _question(client, author)
+    answer_id = _answer(client, author, question_id)
+    stale = client.get(f'/api/questions/{question_id}').headers['ETag']
+
+    edited = client.put(f'/api/questions/{question_id}', json={'title': 'Título editado por otra pestaña'},
+                        headers={**author, 'If-Match': stale})
+    response = client.put(f'/api/questions/{question_id}', json={'title': 'Título basado en la versión vieja'},
+                          headers={**author, 'If-Match': stale})
+
+    assert response.status_code == 412
+    assert response.headers['ETag'] == edited.headers['ETag']
+    assert client.get(f'/api/questions/{question_id}').get_json()['title'] == 'Título editado por otra pestaña'
+
+    response = client.put(f'/api/answers/{answer_id}', json={'content': ANSWER + ' Editada.'},
+                          headers={**author, 'If-Match': '"v0"'})
+    assert response.status_code == 412
+
+
+def test_racing_accepts_return_one_409(app, client, register, monkeypatch):
+    author = register('autora')
+    helpers = [register('ana'), register('luis')]
+    question_id = _question(client, author)
+    answer_ids = [_answer(client, headers, question_id) for headers in helpers]
+
+    # Ambas peticiones leen la misma versión de la pregunta antes de escribir
+    barrier = threading.Barrier(2)
+    if_match_failed = answers_routes.if_match_failed
+
+    def read_together(version):
+        barrier.wait(timeout=5)
+        return if_match_failed(version)
+
+    monkeypatch.setattr(answers_routes, 'if_match_failed', read_together)
+    statuses = {}
+
+    def accept(answer_id):
+        response = app.test_client().post(f'/api/answers/{answer_id}/accept', headers=author)
+        statuses[answer_id] = response.status_code
+
+    threads = [threading.Thread(target=accept, args=(answer_id,)) for answer_id in answer_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(statuses.values()) == [200, 409]
+    winner = next(answer_id for answer_id, status in statuses.items() if status == 200)
+    accepted = [answer['id'] for answer in client.get(f'/api/questions/{question_id}').get_json()['answers']
+                if answer['is_accepted']]
+    assert accepted == [winner]
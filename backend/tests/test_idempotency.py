@@ -0,0 +1,74 @@
+import threading
+
+from models import Question
+from routes import questions as questions_routes
+
+QUESTION = {'title': 'Cómo ordenar una lista en Python', 'content': 'Necesito ordenar una lista de diccionarios.'}
+
+
+def _post(client, headers, key, body=QUESTION):
+    return client.post('/api/questions', json=body, headers={**headers, 'Idempotency-Key': key})
+
+
+def _count(app):
+    with app.app_context():
+        return Question.query.count()
+
+
+def test_retry_replays_the_stored_response(app, client, register):
+    headers = register('autora')
+
+    first = _post(client, headers, 'clave-1')
+    retry = _post(client, headers, 'clave-1')
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert _count(app) == 1
+
+
+def test_key_reused_with_another_body_returns_422(app, client, register):
+    headers = register('autora')
+
+    _post(client, headers, 'clave-1')
+    response = _post(client, headers, 'clave-1', dict(QUESTION, title='Otra pregunta con la misma clave'))
+
+    assert response.status_code == 422
+    assert _count(app) == 1
+
+
+def test_retry_while_in_progress_returns_409(app, client, register, monkeypatch):
+    headers = register('autora')
+    started, release = threading.Event(), threading.Event()
+    normalize_tags = questions_routes.normalize_tags
+
+    def slow_normalize_tags(tags):
+        started.set()
+        release.wait(timeout=5)
+        return normalize_tags(tags)
+
+    monkeypatch.setattr(questions_routes, 'normalize_tags', slow_normalize_tags)
+    results = []
+    first = threading.Thread(target=lambda: results.append(_post(app.test_client(), headers, 'clave-1')))
+    first.start()
+    assert started.wait(timeout=5)
+
+    retry = _post(client, headers, 'clave-1')
+    release.set()
+    first.join(timeout=10)
+
+    assert retry.status_code == 409
+    assert results[0].status_code == 201
+    assert _count(app) == 1
+
+
+def test_validation_errors_are_not_stored(app, client, register):
+    headers = register('autora')
+
+    invalid = _post(client, headers, 'clave-1', dict(QUESTION, title='Corto'))
+    fixed = _post(client, headers, 'clave-1')
+
+    assert invalid.status_code == 400
+    assert fixed.status_code == 201
+    assert 'Idempotent-Replayed' not in fixed.headers
+    assert _count(app) == 1
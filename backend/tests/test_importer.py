@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from controllers.importer import Importer
+from models import db, Answer, ImportCheckpoint, ImportIdMap, Question, User
+
+
+def _dump(path, users=3, questions=4, answers=6):
+    records = [
+        {'type': 'user', 'id': f'u{i}', 'username': f'user{i}', 'email': f'user{i}@example.com',
+         'first_name': 'Nombre', 'last_name': 'Apellido'}
+        for i in range(users)
+    ]
+    records += [
+        {'type': 'question', 'id': 100 + i, 'author_id': f'u{i % users}',
+         'title': f'Pregunta importada número {i}', 'content': 'Contenido de la pregunta importada'}
+        for i in range(questions)
+    ]
+    records += [
+        {'type': 'answer', 'id': 500 + i, 'question_id': 100 + i % questions, 'author_id': f'u{i % users}',
+         'content': f'Respuesta {i}'}
+        for i in range(answers)
+    ]
+    path.write_text('\n'.join(json.dumps(record) for record in records) + '\n')
+    return str(path)
+
+
+def test_checkpoint_keeps_id_maps_in_table(app, tmp_path):
+    dump = _dump(tmp_path / 'dump.ndjson')
+    with app.app_context():
+        stats = Importer(checkpoint='dump', batch_size=2).run([dump])
+
+        state = db.session.get(ImportCheckpoint, 'dump').state
+        assert 'id_maps' not in state
+        assert stats['answers']['imported'] == 6
+        assert db.session.query(ImportIdMap).filter_by(checkpoint='dump').count() == 3 + 4 + 6
+        question = db.session.get(Question, db.session.query(ImportIdMap.new_id)
+                                  .filter_by(checkpoint='dump', entity='questions', old_id='100').scalar())
+        assert question.title == 'Pregunta importada número 0'
+
+
+def test_resume_after_crash_does_not_duplicate(app, tmp_path, monkeypatch):
+    dump = _dump(tmp_path / 'dump.ndjson')
+    with app.app_context():
+        importer = Importer(checkpoint='dump', batch_size=2)
+        flush_answers = importer._flush_answers
+        calls = []
+
+        def crash_on_second_batch(batch):
+            calls.append(batch)
+            if len(calls) == 2:
+                raise RuntimeError('worker caído')
+            flush_answers(batch)
+
+        monkeypatch.setattr(importer, '_flush_answers', crash_on_second_batch)
+        with pytest.raises(RuntimeError):
+            importer.run([dump])
+        db.session.rollback()
+        db.session.remove()
+
+        # Nuevo proceso: los mapas salen de import_id_maps
+        stats = Importer(checkpoint='dump', batch_size=2).run([dump])
+
+        assert stats['answers']['imported'] == 6
+        assert db.session.query(User).count() == 3
+        assert db.session.query(Question).count() == 4
+        assert db.session.query(Answer).count() == 6
+        assert db.session.query(ImportIdMap).filter_by(entity='answers').count() == 6
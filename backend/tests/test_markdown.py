@@ -0,0 +1,41 @@
+from utils.markdown import render_markdown
+
+
+def test_script_tags_are_stripped():
+    html = render_markdown('Hola\n\n<script>alert("x")</script>\n\n<SCRIPT src="https://evil.test/x.js"></SCRIPT>')
+
+    assert '<script' not in html.lower()
+    assert 'evil.test' not in html
+
+
+def test_event_handler_attributes_are_stripped():
+    html = render_markdown(
+        '<p onclick="alert(1)">texto</p>\n\n'
+        '<img src="https://example.com/a.png" onerror="alert(2)" alt="a">\n\n'
+        '<a href="https://example.com" onmouseover="alert(3)">enlace</a>'
+    )
+
+    assert 'alert' not in html
+    assert 'onclick' not in html and 'onerror' not in html and 'onmouseover' not in html
+    assert 'src="https://example.com/a.png"' in html
+    assert 'href="https://example.com"' in html
+
+
+def test_javascript_links_are_removed():
+    html = render_markdown(
+        '[markdown](javascript:alert(1))\n\n'
+        '<a href="javascript:alert(2)">html</a>\n\n'
+        '<a href="JaVaScRiPt:alert(3)">mayúsculas</a>\n\n'
+        '![img](javascript:alert(4))'
+    )
+
+    assert 'javascript:' not in html.lower()
+    assert 'markdown' in html and 'html' in html
+
+
+def test_allowed_markup_is_kept():
+    html = render_markdown('**negrita** y [enlace](https://example.com)\n\n```python\nprint(1)\n```')
+
+    assert '<strong>negrita</strong>' in html
+    assert '<a href="https://example.com">enlace</a>' in html
+    assert '<code class="language-python">' in html
@@ -0,0 +1,39 @@
+import pytest
+
+QUESTION = {'title': 'Cómo ordenar una lista en Python', 'content': 'Necesito ordenar una lista de diccionarios.'}
+ANSWER = 'Usa sorted() con una función key que devuelva la clave.'
+
+
+@pytest.fixture
+def inbox(client, register):
+    """Cabeceras de una autora con dos notificaciones de respuesta sin leer"""
+    author, helper = register('autora'), register('ayudante')
+    question_id = client.post('/api/questions', json=QUESTION, headers=author).get_json()['question']['id']
+    for n in range(2):
+        client.post('/api/answers', json={'question_id': question_id, 'content': f'{ANSWER} ({n})'}, headers=helper)
+    assert client.get('/api/notifications/unread-count', headers=author).get_json()['unread_count'] == 2
+    return author
+
+
+@pytest.mark.parametrize('ids', ['1', [None], ['1'], [True], [1.5], {'id': 1}])
+def test_mark_read_rejects_invalid_ids(client, inbox, ids):
+    response = client.post('/api/notifications/read', json={'ids': ids}, headers=inbox)
+
+    assert response.status_code == 400
+    assert client.get('/api/notifications/unread-count', headers=inbox).get_json()['unread_count'] == 2
+
+
+def test_mark_read_only_given_ids(client, inbox):
+    notification_id = client.get('/api/notifications', headers=inbox).get_json()['notifications'][0]['id']
+
+    response = client.post('/api/notifications/read', json={'ids': [notification_id]}, headers=inbox)
+
+    assert response.get_json() == {'updated': 1}
+    assert client.get('/api/notifications/unread-count', headers=inbox).get_json()['unread_count'] == 1
+
+
+def test_mark_read_without_ids_marks_all(client, inbox):
+    response = client.post('/api/notifications/read', headers=inbox)
+
+    assert response.get_json() == {'updated': 2}
+    assert client.get('/api/notifications/unread-count', headers=inbox).get_json()['unread_count'] == 0
@@ -0,0 +1,78 @@
+import pytest
+
+from utils import ratelimit
+from utils.ratelimit import RateLimiter, parse_limit
+from utils.shared_store import create_store
+
+
+@pytest.fixture
+def limited_app(make_app):
+    return make_app(RATELIMIT_ENABLED=True, RATELIMIT_STORAGE_URL='', RATELIMITS={
+        'auth.login': '2/minute',
+        'questions.create_question': '2/minute',
+    })
+
+
+def _login(client, ip):
+    return client.post('/api/auth/login', json={'username': 'nadie', 'password': 'x'},
+                       environ_base={'REMOTE_ADDR': ip})
+
+
+def test_exhausted_bucket_returns_429_with_retry_after(limited_app):
+    client = limited_app.test_client()
+
+    statuses = [_login(client, '10.0.0.1').status_code for _ in range(2)]
+    response = _login(client, '10.0.0.1')
+
+    assert 429 not in statuses
+    assert response.status_code == 429
+    # 2/minute: un token cada 30 segundos
+    assert response.headers['Retry-After'] == '30'
+
+
+def test_buckets_are_separate_per_ip(limited_app):
+    client = limited_app.test_client()
+    for _ in range(2):
+        _login(client, '10.0.0.1')
+
+    assert _login(client, '10.0.0.1').status_code == 429
+    assert _login(client, '10.0.0.2').status_code != 429
+
+
+def test_buckets_are_separate_per_user(limited_app, register):
+    client = limited_app.test_client()
+    alice = register('alice', client=client)
+    bob = register('bob', client=client)
+
+    def create(headers, ip):
+        return client.post('/api/questions', json={}, headers=headers,
+                           environ_base={'REMOTE_ADDR': ip}).status_code
+
+    # Cambiar de IP no evita el bucket del usuario
+    assert create(alice, '10.0.0.1') != 429
+    assert create(alice, '10.0.0.2') != 429
+    assert create(alice, '10.0.0.3') == 429
+    assert create(bob, '10.0.0.4') != 429
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    limiter = RateLimiter()
+    limiter.store = create_store('')
+    capacity, rate = parse_limit('2/minute')
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, 'time', lambda: now[0])
+
+    assert limiter.hit('k', capacity, rate) == 0
+    assert limiter.hit('k', capacity, rate) == 0
+    assert limiter.hit('k', capacity, rate) == pytest.approx(30)
+
+    now[0] += 15
+    assert limiter.hit('k', capacity, rate) == pytest.approx(15)
+
+    now[0] += 15
+    assert limiter.hit('k', capacity, rate) == 0
+    assert limiter.hit('k', capacity, rate) > 0
+
+    # Tras rellenarse por completo no acumula más de la capacidad
+    now[0] += 3600
+    assert [limiter.hit('k', capacity, rate) == 0 for _ in range(3)] == [True, True, False]
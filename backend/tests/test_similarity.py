@@ -0,0 +1,68 @@
+import threading
+import time
+
+from controllers import similarity
+from controllers.similarity import compute_signature, similarity_index
+from utils.jobs import job_queue
+
+TITLE = 'Cómo ordenar una lista de diccionarios en Python'
+CONTENT = 'Necesito ordenar una lista de diccionarios por la clave edad en Python.'
+
+
+def _create(client, headers, title=TITLE):
+    response = client.post('/api/questions', json={'title': title, 'content': CONTENT}, headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['question']['id']
+
+
+def _matches(title=TITLE):
+    return [question_id for question_id, _ in similarity_index.query(compute_signature(title, CONTENT))]
+
+
+def test_reload_builds_off_lock_and_keeps_concurrent_updates(app, client, register, monkeypatch):
+    headers = register('autora')
+    first = _create(client, headers)
+    with app.app_context():
+        similarity_index.reload()
+
+    building, release = threading.Event(), threading.Event()
+    signature_from_bytes = similarity.signature_from_bytes
+
+    def slow_signature_from_bytes(data):
+        building.set()
+        release.wait(timeout=5)
+        return signature_from_bytes(data)
+
+    def reload():
+        with app.app_context():
+            similarity_index.reload()
+
+    monkeypatch.setattr(similarity, 'signature_from_bytes', slow_signature_from_bytes)
+    thread = threading.Thread(target=reload)
+    thread.start()
+    assert building.wait(timeout=5)
+
+    # Mientras se construye, las consultas leen el índice anterior sin esperar
+    started = time.monotonic()
+    assert _matches() == [first]
+    assert time.monotonic() - started < 1
+    # Una pregunta indexada durante la recarga sobrevive a la sustitución
+    second = _create(client, headers, title='Ordenar una lista de diccionarios en Python por clave')
+
+    release.set()
+    thread.join(timeout=10)
+    assert sorted(_matches()) == sorted([first, second])
+
+
+def test_query_does_not_load_when_reload_is_scheduled(app, client, register, monkeypatch):
+    _create(client, register('autora'))
+    similarity_index.invalidate()
+    monkeypatch.setattr(job_queue, 'async_mode', True)
+
+    with app.app_context():
+        assert _matches() == []
+    assert similarity_index._loaded_at is None
+
+    with app.app_context():
+        job_queue._run_local('similarity_reload', None)
+        assert len(_matches()) == 1
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from utils import singleflight
+from utils.singleflight import SingleFlight
+
+FOLLOWERS = 7
+
+
+class _CountingEvent(threading.Event):
+    """Event que cuenta cuántos hilos están esperando"""
+
+    waiting = 0
+    lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self.lock:
+            type(self).waiting += 1
+        return super().wait(timeout)
+
+
+@pytest.fixture
+def counting_calls(monkeypatch):
+    monkeypatch.setitem(singleflight._settings, 'store', None)  # Solo dentro del proceso
+    monkeypatch.setattr(_CountingEvent, 'waiting', 0)
+
+    class CountingCall(singleflight._Call):
+        __slots__ = ()
+
+        def __init__(self):
+            super().__init__()
+            self.done = _CountingEvent()
+
+    monkeypatch.setattr(singleflight, '_Call', CountingCall)
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timeout'
+        time.sleep(0.005)
+
+
+def _run_concurrently(group, key, loader):
+    """Un líder bloqueado en loader y FOLLOWERS peticiones idénticas esperándolo"""
+    started, release = threading.Event(), threading.Event()
+    results, errors = [], []
+
+    def blocking_loader():
+        started.set()
+        release.wait(timeout=5)
+        return loader()
+
+    def request():
+        try:
+            results.append(group.do(key, blocking_loader))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=request)]
+    threads[0].start()
+    assert started.wait(timeout=5)
+    threads += [threading.Thread(target=request) for _ in range(FOLLOWERS)]
+    for thread in threads[1:]:
+        thread.start()
+    _wait_for(lambda: _CountingEvent.waiting == FOLLOWERS)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def test_concurrent_identical_requests_run_the_loader_once(counting_calls):
+    group = SingleFlight('test')
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {'questions': [1, 2, 3]}
+
+    results, errors = _run_concurrently(group, ('page', 1), loader)
+
+    assert len(calls) == 1
+    assert errors == []
+    assert len(results) == FOLLOWERS + 1
+    assert all(result is results[0] for result in results)
+    assert group.stats() == {'executed': 1, 'coalesced': FOLLOWERS, 'lock_waits': 0, 'errors': 0,
+                             'in_flight': 0}
+
+
+def test_loader_error_reaches_every_waiter(counting_calls):
+    group = SingleFlight('test')
+    failure = RuntimeError('base de datos caída')
+
+    def loader():
+        raise failure
+
+    results, errors = _run_concurrently(group, ('page', 1), loader)
+
+    assert results == []
+    assert len(errors) == FOLLOWERS + 1
+    assert all(error is failure for error in errors)
+    assert group.stats()['errors'] == 1
+
+    # El error no queda guardado: la siguiente petición vuelve a ejecutar fn()
+    assert group.do(('page', 1), lambda: 'ok') == 'ok'
@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Umbral holgado: detecta regresiones graves (imports pesados, trabajo síncrono
+# al arrancar), no variaciones de la máquina. Ajustable con STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', '10000'))
+
+_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+app = create_app()
+wall_ms = (time.perf_counter() - started) * 1000
+print('STARTUP ' + json.dumps(dict(app.extensions['startup'], wall_ms=wall_ms)))
+"""
+
+
+def _cold_start(tmp_path, **env):
+    """Arrancar create_app() en un intérprete nuevo y devolver su informe de arranque"""
+    environ = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}",
+        JOB_QUEUE_ASYNC='false',
+        PROFILING_ENABLED='false',
+        LOG_LEVEL='WARNING',
+        **env
+    )
+    result = subprocess.run([sys.executable, '-c', _SCRIPT], cwd=BACKEND_DIR, env=environ,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    line = next(line for line in result.stdout.splitlines() if line.startswith('STARTUP '))
+    return json.loads(line[len('STARTUP '):])
+
+
+def test_cold_start_without_schema_work(tmp_path):
+    report = _cold_start(tmp_path, AUTO_CREATE_SCHEMA='false')
+
+    assert 'schema' not in report['phases']
+    assert set(report['phases']) >= {'config', 'extensions', 'blueprints', 'background', 'commands'}
+    assert report['total_ms'] <= report['wall_ms']
+    assert report['total_ms'] < STARTUP_BUDGET_MS
+
+
+def test_cold_start_applying_migrations(tmp_path):
+    report = _cold_start(tmp_path, AUTO_CREATE_SCHEMA='true')
+
+    assert report['phases']['schema'] > 0
+    assert report['total_ms'] < STARTUP_BUDGET_MS
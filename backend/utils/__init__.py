@@ -0,0 +1 @@
+# Utilidades compartidas para StudentOverflow
\ No newline at end of file
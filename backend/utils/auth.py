@@ -0,0 +1,39 @@
+from functools import wraps
+
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from models import db, User
+
+
+def is_admin(user):
+    """Un usuario es administrador si su username está en ADMIN_USERNAMES"""
+    return bool(user and user.is_active and user.username in current_app.config['ADMIN_USERNAMES'])
+
+
+def request_is_admin():
+    """True si la petición trae un JWT válido de un administrador (sin exigirlo)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        return False
+    return bool(user_id) and is_admin(db.session.get(User, int(user_id)))
+
+
+def admin_required(fn):
+    """Decorador: requiere JWT válido de un administrador
+
+    Con ADMIN_USERNAMES vacío (el valor por defecto) las rutas de
+    administración quedan cerradas para todos.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not current_app.config['ADMIN_USERNAMES']:
+            return jsonify({'error': 'Administración desactivada: configura ADMIN_USERNAMES'}), 403
+        verify_jwt_in_request()
+        user = db.session.get(User, int(get_jwt_identity()))
+        if not is_admin(user):
+            return jsonify({'error': 'Se requieren permisos de administrador'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
\ No newline at end of file
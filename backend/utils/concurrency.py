@@ -0,0 +1,26 @@
+from flask import jsonify, request
+
+
+def version_tag(version):
+    """Valor (sin comillas) del ETag de un recurso con columna de versión"""
+    return f'v{version}'
+
+
+def if_match_failed(version):
+    """Respuesta 412 si el cliente envió If-Match y no coincide con la versión actual"""
+    if request.if_match and not request.if_match.contains_weak(version_tag(version)):
+        response = jsonify({
+            'error': 'El recurso fue modificado por otra persona; recárgalo e inténtalo de nuevo',
+            'version': version
+        })
+        response.status_code = 412
+        response.set_etag(version_tag(version))
+        return response
+    return None
+
+
+def conflict_response():
+    """Respuesta 409 cuando una escritura concurrente ganó la carrera (StaleDataError)"""
+    return jsonify({
+        'error': 'Conflicto de edición: otra persona modificó el recurso al mismo tiempo'
+    }), 409
@@ -0,0 +1,106 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+from utils.log import get_logger
+from utils.shared_store import create_store
+
+logger = get_logger('idempotency')
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Además de los 2xx se guardan los conflictos: repetir la petición daría lo mismo
+STORED_ERRORS = {409, 412}
+
+_settings = {'store': None, 'ttl': 86400, 'lock_ttl': 60}  # Ver init_idempotency
+_counters = {'executed': 0, 'replayed': 0, 'in_progress': 0, 'mismatched': 0}
+
+
+def _fingerprint():
+    return hashlib.sha256(request.get_data()).hexdigest()
+
+
+def _error(message, status):
+    response = jsonify({'error': message})
+    response.status_code = status
+    return response
+
+
+def idempotent(view):
+    """Hacer seguros los reintentos de un POST con el encabezado Idempotency-Key
+
+    La primera petición con una clave ejecuta la vista y guarda su
+    respuesta durante IDEMPOTENCY_TTL segundos; los reintentos con la misma
+    clave (del mismo usuario y endpoint) reciben esa respuesta sin volver a
+    escribir. Una clave reutilizada con otro cuerpo es un error del
+    cliente (422) y un reintento mientras la primera sigue en curso recibe
+    409. Solo se guardan las respuestas 2xx y los conflictos (409, 412); el
+    resto de errores (400 de validación, 404, 5xx...) liberan la clave para
+    que el cliente pueda corregir la petición y reintentar con ella.
+    Va debajo de @jwt_required para que la clave sea por usuario.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        store = _settings['store']
+        if not key or store is None:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f'{HEADER} no puede superar {MAX_KEY_LENGTH} caracteres', 400)
+
+        store_key = f'idem:{request.endpoint}:{get_jwt_identity()}:{key}'
+        fingerprint = _fingerprint()
+        # El marcador "en curso" expira solo si el worker muere a mitad de la escritura
+        if not store.add(store_key, {'fingerprint': fingerprint}, ttl=_settings['lock_ttl']):
+            saved = store.get(store_key)
+            if saved is not None:
+                return _replay(saved, fingerprint)
+            # Expiró entre add y get: se trata como una petición nueva
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            store.delete(store_key)
+            raise
+        if response.status_code >= 300 and response.status_code not in STORED_ERRORS:
+            store.delete(store_key)
+            return response
+
+        _counters['executed'] += 1
+        store.set(store_key, {
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'body': response.get_data(as_text=True),
+            'content_type': response.content_type
+        }, ttl=_settings['ttl'])
+        return response
+
+    return wrapper
+
+
+def _replay(saved, fingerprint):
+    if saved['fingerprint'] != fingerprint:
+        _counters['mismatched'] += 1
+        return _error(f'{HEADER} ya se usó con otra solicitud', 422)
+    if 'status' not in saved:
+        _counters['in_progress'] += 1
+        return _error('Una solicitud con esta Idempotency-Key sigue en curso', 409)
+
+    _counters['replayed'] += 1
+    logger.info('idempotent replay', extra={'endpoint': request.endpoint})
+    response = current_app.response_class(saved['body'], status=saved['status'],
+                                          content_type=saved['content_type'])
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def init_idempotency(app):
+    """Configurar el almacén de respuestas (IDEMPOTENCY_STORAGE_URL vacío = memoria del proceso)"""
+    _settings['store'] = create_store(app.config['IDEMPOTENCY_STORAGE_URL']) if app.config['IDEMPOTENCY_ENABLED'] else None
+    _settings['ttl'] = app.config['IDEMPOTENCY_TTL']
+
+
+def metrics():
+    return dict(_counters)
@@ -0,0 +1,372 @@
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from itertools import chain
+
+from utils.log import get_logger
+from utils.shared_store import create_store
+
+logger = get_logger('jobs')
+
+
+class Job:
+    """Trabajo diferido: tipo, datos serializables y número de intentos"""
+
+    __slots__ = ('id', 'type', 'payload', 'attempts', 'enqueued_at', 'available_at')
+
+    def __init__(self, type, payload, attempts=0, enqueued_at=None, available_at=None, id=None):
+        self.id = id
+        self.type = type
+        self.payload = payload
+        self.attempts = attempts
+        self.enqueued_at = enqueued_at or time.time()
+        self.available_at = available_at or self.enqueued_at
+
+
+class MemoryJobStore:
+    """Cola en memoria (por defecto): rápida, se pierde al reiniciar el proceso
+
+    Una deque FIFO por tipo con los trabajos disponibles y un heap por
+    available_at con los reintentos pendientes. put() y take() son O(1)
+    por trabajo (O(log n) para reintentos), así que encolar desde una
+    petición no espera a que el worker recorra la cola.
+    """
+
+    def __init__(self):
+        self._ready = {}        # tipo -> deque de trabajos disponibles
+        self._types = deque()   # tipos con trabajos disponibles, en turno rotatorio
+        self._delayed = []      # heap (available_at, secuencia, trabajo) de reintentos
+        self._seq = 0
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def _push_ready(self, job):
+        queue = self._ready.get(job.type)
+        if queue is None:
+            queue = self._ready[job.type] = deque()
+        if not queue:
+            self._types.append(job.type)
+        queue.append(job)
+
+    def put(self, job):
+        with self._cond:
+            self._size += 1
+            if job.available_at > time.time():
+                self._seq += 1
+                heapq.heappush(self._delayed, (job.available_at, self._seq, job))
+            else:
+                self._push_ready(job)
+            self._cond.notify()
+
+    def _promote(self, now):
+        while self._delayed and self._delayed[0][0] <= now:
+            self._push_ready(heapq.heappop(self._delayed)[2])
+
+    def take(self, max_items, timeout):
+        """Siguiente lote de trabajos disponibles del mismo tipo (por turnos entre tipos)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                self._promote(time.time())
+                if self._types:
+                    job_type = self._types.popleft()
+                    queue = self._ready[job_type]
+                    batch = [queue.popleft() for _ in range(min(max_items, len(queue)))]
+                    if queue:
+                        self._types.append(job_type)
+                    self._size -= len(batch)
+                    return batch
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                if self._delayed:
+                    remaining = min(remaining, max(self._delayed[0][0] - time.time(), 0))
+                self._cond.wait(min(remaining, 0.5))
+
+    def ack(self, jobs):
+        pass
+
+    def retry(self, job, delay):
+        job.attempts += 1
+        job.available_at = time.time() + delay
+        self.put(job)
+
+    def depth(self):
+        with self._cond:
+            return self._size
+
+    def oldest_enqueued_at(self):
+        with self._cond:
+            heads = (queue[0].enqueued_at for queue in self._ready.values() if queue)
+            delayed = (job.enqueued_at for _, _, job in self._delayed)
+            return min(chain(heads, delayed), default=None)
+
+
+class SQLiteJobStore:
+    """Cola durable en un archivo SQLite, compartible entre workers del mismo host"""
+
+    LOCK_SECONDS = 300  # Un trabajo tomado y no confirmado vuelve a la cola
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    type TEXT NOT NULL,
+                    payload TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    enqueued_at REAL NOT NULL,
+                    available_at REAL NOT NULL,
+                    locked_until REAL NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_jobs_available ON jobs (available_at, type)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def put(self, job):
+        self._connect().execute(
+            'INSERT INTO jobs (type, payload, attempts, enqueued_at, available_at) VALUES (?, ?, ?, ?, ?)',
+            (job.type, json.dumps(job.payload), job.attempts, job.enqueued_at, job.available_at)
+        )
+
+    def take(self, max_items, timeout):
+        deadline = time.monotonic() + timeout
+        conn = self._connect()
+        while True:
+            now = time.time()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                first = conn.execute(
+                    'SELECT type FROM jobs WHERE available_at <= ? AND locked_until <= ? '
+                    'ORDER BY available_at LIMIT 1', (now, now)
+                ).fetchone()
+                rows = []
+                if first:
+                    rows = conn.execute(
+                        'SELECT id, type, payload, attempts, enqueued_at, available_at FROM jobs '
+                        'WHERE type = ? AND available_at <= ? AND locked_until <= ? '
+                        'ORDER BY available_at LIMIT ?', (first[0], now, now, max_items)
+                    ).fetchall()
+                    conn.executemany(
+                        'UPDATE jobs SET locked_until = ? WHERE id = ?',
+                        [(now + self.LOCK_SECONDS, row[0]) for row in rows]
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+            if rows:
+                return [
+                    Job(type, json.loads(payload), attempts, enqueued_at, available_at, id=job_id)
+                    for job_id, type, payload, attempts, enqueued_at, available_at in rows
+                ]
+            if time.monotonic() >= deadline:
+                return []
+            time.sleep(min(0.2, max(deadline - time.monotonic(), 0)))
+
+    def ack(self, jobs):
+        self._connect().executemany('DELETE FROM jobs WHERE id = ?', [(job.id,) for job in jobs])
+
+    def retry(self, job, delay):
+        self._connect().execute(
+            'UPDATE jobs SET attempts = attempts + 1, available_at = ?, locked_until = 0 WHERE id = ?',
+            (time.time() + delay, job.id)
+        )
+
+    def depth(self):
+        return self._connect().execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def oldest_enqueued_at(self):
+        return self._connect().execute('SELECT MIN(enqueued_at) FROM jobs').fetchone()[0]
+
+
+class JobQueue:
+    """Cola de trabajos diferidos con lotes por tipo, reintentos y métricas
+
+    Las rutas encolan con enqueue(tipo, datos); un hilo worker toma lotes
+    de trabajos del mismo tipo y llama al handler registrado con la lista
+    de datos. Si el handler falla, cada trabajo se reintenta con espera
+    exponencial hasta max_retries.
+
+    Cada worker del servidor arranca sus hilos de programación, pero en
+    cada intervalo solo encola el que consigue el candado de esa tarea en
+    JOB_SCHEDULER_LOCK_URL, así que las tareas periódicas se ejecutan una
+    vez por intervalo y no una vez por worker. Las programadas con
+    local=True (estado en memoria del proceso) se ejecutan en cada worker,
+    en su hilo de programación y sin pasar por la cola.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.store = None
+        self.async_mode = False
+        self._handlers = {}
+        self._schedules = {}
+        self._schedule_locks = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def register(self, job_type, handler, batch_size=1, max_retries=3):
+        """Registrar el handler de un tipo; recibe una lista de payloads"""
+        self._handlers[job_type] = {
+            'handler': handler, 'batch_size': batch_size, 'max_retries': max_retries
+        }
+
+    def schedule(self, job_type, interval, payload=None, local=False):
+        """Encolar un trabajo periódicamente (cada interval segundos)
+
+        Con local=True se ejecuta en todos los workers, al arrancar y luego
+        cada interval segundos, sin candado ni cola compartida.
+        """
+        if interval > 0:
+            self._schedules[job_type] = (interval, payload, local)
+
+    def init_app(self, app):
+        self.app = app
+        url = app.config['JOB_QUEUE_URL']
+        self.store = SQLiteJobStore(url[len('sqlite:///'):]) if url.startswith('sqlite:///') else MemoryJobStore()
+        self.async_mode = app.config['JOB_QUEUE_ASYNC']
+        # Sin URL propia los candados van al mismo archivo que la cola durable (si lo hay)
+        lock_url = app.config['JOB_SCHEDULER_LOCK_URL'] or (url if url.startswith('sqlite:///') else '')
+        self._schedule_locks = create_store(lock_url)
+        if self.async_mode and not self._threads:
+            for i in range(app.config['JOB_WORKERS']):
+                self._start_thread(self._work, f'job-worker-{i}')
+            for job_type, (interval, payload, local) in self._schedules.items():
+                self._start_thread(lambda t=job_type, i=interval, p=payload, l=local: self._tick(t, i, p, l),
+                                   f'job-scheduler-{job_type}')
+
+    def _start_thread(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _count(self, job_type, key, amount=1):
+        with self._lock:
+            counters = self._counters.setdefault(job_type, {
+                'enqueued': 0, 'processed': 0, 'failed': 0, 'retried': 0, 'batches': 0
+            })
+            counters[key] += amount
+
+    def enqueue(self, job_type, payload=None):
+        """Encolar un trabajo; en modo síncrono se ejecuta de inmediato"""
+        if job_type not in self._handlers:
+            raise ValueError(f'Tipo de trabajo no registrado: {job_type}')
+        self._count(job_type, 'enqueued')
+        job = Job(job_type, payload)
+        if not self.async_mode:
+            self._execute([job])
+            return
+        self.store.put(job)
+
+    def _tick(self, job_type, interval, payload, local=False):
+        owner = f'{os.getpid()}:{threading.get_ident()}'
+        if local:
+            self._run_local(job_type, payload)
+        while not self._stop.wait(interval):
+            try:
+                if local:
+                    self._run_local(job_type, payload)
+                # El candado expira antes del siguiente intervalo: cualquier worker puede tomarlo
+                elif self._schedule_locks.add(f'jobs:schedule:{job_type}', owner, ttl=interval * 0.9):
+                    self.enqueue(job_type, payload)
+            except Exception:
+                logger.exception('Error programando trabajo', extra={'job_type': job_type})
+
+    def _run_local(self, job_type, payload):
+        """Ejecutar un trabajo en este proceso, sin pasar por la cola (sin reintentos)"""
+        self._count(job_type, 'enqueued')
+        with self.app.app_context():
+            try:
+                self._handlers[job_type]['handler']([payload])
+            except Exception:
+                logger.exception('Error ejecutando trabajo', extra={'job_type': job_type, 'jobs': 1})
+                self._rollback()
+                self._count(job_type, 'failed')
+                return
+        self._count(job_type, 'processed')
+        self._count(job_type, 'batches')
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                jobs = self.store.take(self._max_batch(), timeout=1.0)
+            except Exception:
+                logger.exception('Error leyendo la cola de trabajos')
+                time.sleep(1)
+                continue
+            if not jobs:
+                continue
+            # take() devuelve un solo tipo, pero cada tipo tiene su propio tamaño de lote
+            spec = self._handlers.get(jobs[0].type)
+            limit = spec['batch_size'] if spec else len(jobs)
+            for start in range(0, len(jobs), limit):
+                with self.app.app_context():
+                    self._execute(jobs[start:start + limit])
+
+    def _max_batch(self):
+        return max((spec['batch_size'] for spec in self._handlers.values()), default=1)
+
+    def _execute(self, jobs):
+        job_type = jobs[0].type
+        spec = self._handlers.get(job_type)
+        if spec is None:
+            logger.error('Trabajo sin handler', extra={'job_type': job_type})
+            self.store.ack(jobs)
+            return
+
+        try:
+            spec['handler']([job.payload for job in jobs])
+        except Exception:
+            logger.exception('Error ejecutando trabajo', extra={'job_type': job_type, 'jobs': len(jobs)})
+            self._rollback()
+            if not self.async_mode:
+                self._count(job_type, 'failed', len(jobs))
+                return
+            for job in jobs:
+                if job.attempts < spec['max_retries']:
+                    self.store.retry(job, delay=2 ** job.attempts)
+                    self._count(job_type, 'retried')
+                else:
+                    self.store.ack([job])
+                    self._count(job_type, 'failed')
+            return
+
+        self.store.ack(jobs)
+        self._count(job_type, 'processed', len(jobs))
+        self._count(job_type, 'batches')
+
+    def _rollback(self):
+        from models import db
+        db.session.rollback()
+
+    def metrics(self):
+        """Profundidad de la cola, retraso del trabajo más antiguo y contadores"""
+        oldest = self.store.oldest_enqueued_at() if self.store else None
+        with self._lock:
+            counters = {job_type: dict(values) for job_type, values in self._counters.items()}
+        return {
+            'async': self.async_mode,
+            'depth': self.store.depth() if self.store else 0,
+            'lag_seconds': round(time.time() - oldest, 3) if oldest else 0.0,
+            'jobs': counters,
+        }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,163 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+LOGGER_NAME = 'studentoverflow'
+
+# Atributos estándar de LogRecord; todo lo demás se considera campo estructurado
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'request_id', 'sample'
+}
+
+_listener = None
+_queue_handler = None
+
+
+def get_logger(name=None):
+    """Obtener el logger de un blueprint o subsistema (studentoverflow.<name>)"""
+    return logging.getLogger(f'{LOGGER_NAME}.{name}' if name else LOGGER_NAME)
+
+
+class RequestIdFilter(logging.Filter):
+    """Agrega el request_id del request actual a cada registro"""
+
+    def filter(self, record):
+        record.request_id = g.get('request_id') if has_request_context() else None
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Deja pasar solo una fracción de los eventos DEBUG de alto volumen"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or not getattr(record, 'sample', True):
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            data['request_id'] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                data[key] = value
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que nunca bloquea el request: si la cola está llena descarta"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolver mensaje y traceback aquí; el listener solo serializa
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(spec):
+    """Convierte "questions=DEBUG,auth=WARNING" en un diccionario"""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def init_logging(app):
+    """Configurar logging estructurado y asíncrono para la aplicación"""
+    global _listener, _queue_handler
+
+    root = get_logger()
+    root.setLevel(app.config['LOG_LEVEL'].upper())
+    root.propagate = False
+
+    levels = app.config['LOG_LEVELS']
+    if isinstance(levels, str):
+        levels = _parse_levels(levels)
+    for name, level in levels.items():
+        get_logger(name).setLevel(level)
+
+    if _listener is None:
+        stream = logging.StreamHandler(sys.stderr)
+        if app.config['LOG_FORMAT'] == 'json':
+            stream.setFormatter(JsonFormatter())
+        else:
+            stream.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'
+            ))
+
+        log_queue = queue.Queue(maxsize=app.config['LOG_QUEUE_SIZE'])
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+        _queue_handler.addFilter(RequestIdFilter())
+        _listener = logging.handlers.QueueListener(log_queue, stream)
+        _listener.start()
+        atexit.register(_listener.stop)
+        root.addHandler(_queue_handler)
+
+    # El filtro de muestreo se reemplaza en cada create_app por si cambia la tasa
+    for existing in [f for f in _queue_handler.filters if isinstance(f, DebugSamplingFilter)]:
+        _queue_handler.removeFilter(existing)
+    _queue_handler.addFilter(DebugSamplingFilter(app.config['LOG_DEBUG_SAMPLE_RATE']))
+
+    http_logger = get_logger('http')
+
+    @app.before_request
+    def assign_request_id():
+        incoming = request.headers.get('X-Request-ID', '')
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        if http_logger.isEnabledFor(logging.DEBUG):
+            started = g.get('request_started')
+            http_logger.debug('request', extra={
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2) if started else None,
+            })
+        return response
@@ -0,0 +1,48 @@
+import hashlib
+import threading
+
+from utils.cache import TTLCache
+
+# Etiquetas y atributos permitidos en el HTML generado (el resto se elimina)
+ALLOWED_TAGS = [
+    'p', 'br', 'hr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'em', 'del',
+    'blockquote', 'code', 'pre', 'ul', 'ol', 'li', 'a', 'img',
+    'table', 'thead', 'tbody', 'tr', 'th', 'td'
+]
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'img': ['src', 'alt', 'title'],
+    'code': ['class'],  # language-xxx de los bloques de código, para resaltarlos en el cliente
+    'th': ['align'],
+    'td': ['align']
+}
+ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'sane_lists']
+
+# La clave es el hash del contenido, así que una entrada nunca queda obsoleta
+_cache = TTLCache(ttl=24 * 3600, maxsize=2048)
+_local = threading.local()  # markdown.Markdown no es seguro entre hilos
+
+
+def _render(text):
+    # Importación diferida: markdown y bleach solo se cargan al primer render
+    import bleach
+    import markdown
+
+    if not hasattr(_local, 'markdown'):
+        _local.markdown = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    html = _local.markdown.reset().convert(text)
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES,
+                        protocols=ALLOWED_PROTOCOLS, strip=True)
+
+
+def render_markdown(text):
+    """Convertir Markdown a HTML sanitizado (cacheado por hash del contenido)"""
+    if not text:
+        return ''
+    key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    return _cache.get_or_set(key, lambda: _render(text))
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,110 @@
+import os
+
+import sqlalchemy as sa
+
+from utils.log import get_logger
+
+logger = get_logger('migrations')
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_REVISION = '0001_baseline'
+
+
+def alembic_config():
+    from alembic.config import Config as AlembicConfig
+
+    config = AlembicConfig(os.path.join(BACKEND_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', os.path.join(BACKEND_DIR, 'migrations'))
+    return config
+
+
+def upgrade_database(revision='head'):
+    """Aplicar las migraciones pendientes (requiere contexto de aplicación)
+
+    Una base creada antes de las migraciones (con db.create_all()) no
+    tiene tabla alembic_version: se marca como la versión base y se
+    aplican las migraciones posteriores. Las que corresponden a cambios
+    anteriores a Alembic (0002-0007) comprueban qué existe ya, porque
+    create_all() pudo ejecutarse con cualquier versión de los modelos.
+    """
+    from alembic import command
+    from models import db
+
+    config = alembic_config()
+    tables = set(sa.inspect(db.engine).get_table_names())
+    if tables and 'alembic_version' not in tables:
+        logger.info('stamping existing schema', extra={'revision': BASELINE_REVISION})
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+
+# --- Ayudas para escribir migraciones --------------------------------------
+
+
+def has_table(table):
+    from alembic import op
+
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table, column):
+    from alembic import op
+
+    return any(c['name'] == column for c in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def create_index_concurrently(name, table, columns, **kwargs):
+    """Crear un índice sin bloquear escrituras (CONCURRENTLY en Postgres)
+
+    CREATE INDEX CONCURRENTLY no puede ir dentro de una transacción, así
+    que en Postgres se ejecuta en un bloque autocommit. En otros motores
+    es un create_index normal.
+    """
+    from alembic import op
+
+    # IF NOT EXISTS: bases marcadas como versión base pueden tener ya el índice
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, postgresql_concurrently=True,
+                            if_not_exists=True, **kwargs)
+    else:
+        op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def drop_index_concurrently(name, table):
+    from alembic import op
+
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def batched_backfill(table, values, where, batch_size=1000, pk='id'):
+    """Rellenar una columna nueva por lotes de filas, confirmando cada lote
+
+    Pensado para el patrón en línea: añadir la columna nullable, rellenarla
+    con esta función y, en una migración posterior, hacerla NOT NULL. Cada
+    lote es una transacción corta, así que no se bloquea la tabla entera.
+
+        batched_backfill('questions', {'answer_count': <expresión>},
+                         where='answer_count IS NULL')
+    """
+    from alembic import op
+
+    target = sa.table(table, sa.column(pk), *(sa.column(name) for name in values))
+    condition = sa.text(where)
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            ids = bind.execute(
+                sa.select(target.c[pk]).where(condition).order_by(target.c[pk]).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            bind.execute(target.update().where(target.c[pk].in_(ids)).values(**values))
+            total += len(ids)
+            logger.info('backfill batch', extra={'table': table, 'rows': total})
+    return total
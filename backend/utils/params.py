@@ -0,0 +1,23 @@
+def parse_id_list(raw, max_ids):
+    """Convertir "3,1,2" en [3, 1, 2] conservando el orden y sin duplicados
+
+    Lanza ValueError con un mensaje apto para el cliente si no es válida.
+    """
+    ids = []
+    seen = set()
+    for part in raw.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f'ID inválido: {part[:20]}')
+        value = int(part)
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+
+    if not ids:
+        raise ValueError('Se requiere al menos un ID')
+    if len(ids) > max_ids:
+        raise ValueError(f'Máximo {max_ids} IDs por petición')
+    return ids
\ No newline at end of file
@@ -0,0 +1,277 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+
+from utils.log import get_logger
+
+logger = get_logger('profiling')
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAPTURE_ID_RE = re.compile(r'^[0-9]{8}T[0-9]{6}-(sampler|cprofile)-[0-9a-f]{8}$')
+EXTENSIONS = {'sampler': '.folded', 'cprofile': '.prof'}
+
+_labels = {}
+
+
+def _frame_label(code):
+    """'función (archivo:línea)' con rutas relativas al backend o a site-packages"""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(BACKEND_DIR):
+            filename = os.path.relpath(filename, BACKEND_DIR)
+        else:
+            filename = '/'.join(filename.replace('\\', '/').split('/')[-2:])
+        label = _labels[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'
+    return label
+
+
+def fold_stack(frame, root=None):
+    """Pila de un frame en formato "folded" (raíz;...;hoja) de los flame graphs"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    if root:
+        labels.append(root)
+    return ';'.join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Profiler por muestreo de pilas (sys._current_frames) activable bajo demanda
+
+    Un hilo toma cada interval segundos la pila de los hilos que están
+    atendiendo una petición seleccionada: todas (routes={'*': 1.0}) o una
+    fracción por endpoint. Con all_threads se muestrean todos los hilos del
+    proceso (también los workers de la cola). No instrumenta el código, así
+    que el coste fuera de las capturas es un diccionario consultado en
+    before_request. El resultado son pilas "folded" con el endpoint (o el
+    nombre del hilo) como raíz, listas para flamegraph.pl o speedscope.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tracked = {}  # ident del hilo -> endpoint de la petición en curso
+        self._stacks = Counter()
+        self._routes = {}
+        self._all_threads = False
+        self._thread = None
+        self._stop = threading.Event()
+        self.capture = None  # Metadatos de la captura en curso
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration, interval, routes=None, all_threads=False, on_finish=None):
+        with self._lock:
+            if self.running:
+                raise RuntimeError('Ya hay una captura en curso')
+            self._stacks = Counter()
+            self._routes = routes or {'*': 1.0}
+            self._all_threads = all_threads
+            self._stop.clear()
+            self.capture = {
+                'started_at': time.time(), 'duration': duration, 'interval': interval,
+                'routes': self._routes, 'all_threads': all_threads, 'samples': 0
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(duration, interval, on_finish),
+                name='sampling-profiler', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def track(self, endpoint):
+        """Seleccionar (o no) la petición actual según la fracción de su endpoint"""
+        routes = self._routes
+        if not self.running or self._all_threads:
+            return
+        fraction = routes.get(endpoint, routes.get('*', 0))
+        if fraction and random.random() < fraction:
+            self._tracked[threading.get_ident()] = endpoint
+
+    def untrack(self):
+        self._tracked.pop(threading.get_ident(), None)
+
+    def _sample(self):
+        own = threading.get_ident()
+        frames = sys._current_frames()
+        if self._all_threads:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            targets = {ident: names.get(ident, str(ident)) for ident in frames if ident != own}
+        else:
+            targets = dict(self._tracked)
+        for ident, root in targets.items():
+            frame = frames.get(ident)
+            if frame is not None:
+                self._stacks[fold_stack(frame, root)] += 1
+                self.capture['samples'] += 1
+
+    def _run(self, duration, interval, on_finish):
+        deadline = time.monotonic() + duration
+        while not self._stop.wait(interval) and time.monotonic() < deadline:
+            self._sample()
+        self._tracked.clear()
+        self.capture['duration'] = round(time.time() - self.capture['started_at'], 3)
+        if on_finish is not None:
+            on_finish(self.capture, self.folded())
+
+    def folded(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self._stacks.items()))
+
+
+class CaptureStore:
+    """Capturas en disco (compartidas por los workers del host) con las N más recientes"""
+
+    def __init__(self, directory, max_captures=50):
+        self.directory = directory
+        self.max_captures = max_captures
+
+    def new_id(self, kind):
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{kind}-{uuid.uuid4().hex[:8]}"
+
+    def path(self, capture_id):
+        if not CAPTURE_ID_RE.match(capture_id):
+            return None
+        kind = capture_id.split('-')[1]
+        return os.path.join(self.directory, capture_id + EXTENSIONS[kind])
+
+    def save(self, kind, data):
+        os.makedirs(self.directory, exist_ok=True)
+        capture_id = self.new_id(kind)
+        path = self.path(capture_id)
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+        os.replace(f'{path}.tmp', path)  # Escritura atómica
+        self._prune()
+        return capture_id
+
+    def list(self):
+        if not os.path.isdir(self.directory):
+            return []
+        captures = []
+        for name in os.listdir(self.directory):
+            capture_id, _ = os.path.splitext(name)
+            if CAPTURE_ID_RE.match(capture_id):
+                stat = os.stat(os.path.join(self.directory, name))
+                captures.append({
+                    'id': capture_id,
+                    'kind': capture_id.split('-')[1],
+                    'size': stat.st_size,
+                    'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(stat.st_mtime))
+                })
+        return sorted(captures, key=lambda c: c['id'], reverse=True)
+
+    def _prune(self):
+        for capture in self.list()[self.max_captures:]:
+            try:
+                os.remove(self.path(capture['id']))
+            except OSError:
+                pass
+
+
+def cprofile_text(data, sort='cumulative', limit=50):
+    """Resumen legible de una captura de cProfile (los N primeros por sort)"""
+    stats = pstats.Stats(_StatsSource(marshal.loads(data)), stream=io.StringIO())
+    stats.sort_stats(sort).print_stats(limit)
+    return stats.stream.getvalue()
+
+
+class _StatsSource:
+    """Adaptador para cargar en pstats unas estadísticas ya deserializadas"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+sampler = SamplingProfiler()
+_settings = {'store': None, 'header': 'X-Profile', 'max_duration': 300}  # Ver init_profiling
+_cprofile_lock = threading.Lock()  # Un solo cProfile a la vez por proceso
+
+
+def _save_sample(capture, folded):
+    capture_id = _settings['store'].save('sampler', folded)
+    capture['id'] = capture_id
+    logger.info('sampling capture saved', extra={
+        'capture_id': capture_id, 'samples': capture['samples'], 'duration': capture['duration']
+    })
+
+
+def start_sampler(duration, interval, routes=None, all_threads=False):
+    """Iniciar una captura por muestreo; al terminar se guarda como .folded"""
+    sampler.start(duration, interval, routes=routes, all_threads=all_threads, on_finish=_save_sample)
+
+
+def _begin_request():
+    sampler.track(request.endpoint)
+    if request.headers.get(_settings['header']) and _cprofile_lock.acquire(blocking=False):
+        from utils.auth import request_is_admin
+        if request_is_admin():
+            g.cprofile = cProfile.Profile()
+            g.cprofile.enable()
+        else:
+            _cprofile_lock.release()
+
+
+def _end_request(response):
+    profile = g.pop('cprofile', None)
+    if profile is not None:
+        profile.disable()
+        _cprofile_lock.release()
+        profile.create_stats()
+        capture_id = _settings['store'].save('cprofile', marshal.dumps(profile.stats))
+        response.headers['X-Profile-Id'] = capture_id
+        logger.info('request profiled', extra={'capture_id': capture_id, 'endpoint': request.endpoint})
+    return response
+
+
+def _teardown_request(exc):
+    sampler.untrack()
+    profile = g.pop('cprofile', None)
+    if profile is not None:  # La petición falló antes de after_request
+        profile.disable()
+        _cprofile_lock.release()
+
+
+def init_profiling(app):
+    """Registrar los hooks de perfilado (captura cProfile con la cabecera PROFILING_HEADER)"""
+    if not app.config['PROFILING_ENABLED']:
+        return
+    _settings['store'] = CaptureStore(
+        app.config['PROFILING_DIR'] or os.path.join(tempfile.gettempdir(), 'studentoverflow-profiles'),
+        app.config['PROFILING_MAX_CAPTURES']
+    )
+    _settings['header'] = app.config['PROFILING_HEADER']
+    _settings['max_duration'] = app.config['PROFILING_MAX_DURATION']
+    app.before_request(_begin_request)
+    app.after_request(_end_request)
+    app.teardown_request(_teardown_request)
+
+
+def capture_store():
+    return _settings['store']
+
+
+def max_duration():
+    return _settings['max_duration']
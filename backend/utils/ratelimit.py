@@ -0,0 +1,96 @@
+import math
+import time
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from utils.log import get_logger
+from utils.shared_store import create_store
+
+logger = get_logger('ratelimit')
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(spec):
+    """Convertir "10/minute" en (capacidad, tokens por segundo)"""
+    amount, _, period = spec.partition('/')
+    seconds = _PERIODS.get(period.strip().rstrip('s'))
+    if not amount.strip().isdigit() or seconds is None:
+        raise ValueError(f'Límite inválido: {spec}')
+    capacity = int(amount)
+    return capacity, capacity / seconds
+
+
+def parse_limits(spec):
+    """Aceptar un diccionario o "auth.login=10/minute,auth.register=5/minute" """
+    if isinstance(spec, dict):
+        return {endpoint: parse_limit(limit) for endpoint, limit in spec.items()}
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        endpoint, _, limit = item.partition('=')
+        limits[endpoint.strip()] = parse_limit(limit)
+    return limits
+
+
+def _take_token(capacity, rate, now):
+    """Función de actualización del token bucket para el almacén compartido"""
+    def update(state):
+        tokens, last = state if state else (capacity, now)
+        tokens = min(capacity, tokens + max(now - last, 0) * rate)
+        if tokens >= 1:
+            return [tokens - 1, now], 0.0
+        return [tokens, now], (1 - tokens) / rate
+    return update
+
+
+class RateLimiter:
+    """Token buckets por IP y por usuario para los endpoints configurados"""
+
+    def __init__(self):
+        self.store = None
+        self.limits = {}
+        self.limited = 0
+
+    def init_app(self, app):
+        if not app.config['RATELIMIT_ENABLED']:
+            return
+        self.store = create_store(app.config['RATELIMIT_STORAGE_URL'])
+        self.limits = parse_limits(app.config['RATELIMITS'])
+        app.before_request(self.check)
+
+    def hit(self, key, capacity, rate):
+        """Consumir un token; devuelve 0 si se permite o los segundos a esperar"""
+        # El TTL cubre el tiempo de rellenar el bucket; después vuelve a estar lleno
+        ttl = capacity / rate + 1
+        return self.store.update(f'rl:{key}', _take_token(capacity, rate, time.time()), ttl=ttl)
+
+    def _identities(self):
+        yield f'ip:{request.remote_addr}'
+        try:
+            verify_jwt_in_request(optional=True)
+            user_id = get_jwt_identity()
+        except Exception:
+            user_id = None  # Token inválido: lo rechazará la propia ruta
+        if user_id:
+            yield f'user:{user_id}'
+
+    def check(self):
+        if request.method == 'OPTIONS' or request.endpoint not in self.limits:
+            return None
+        capacity, rate = self.limits[request.endpoint]
+        for identity in self._identities():
+            retry_after = self.hit(f'{request.endpoint}:{identity}', capacity, rate)
+            if retry_after:
+                self.limited += 1
+                logger.info('rate limited', extra={
+                    'endpoint': request.endpoint, 'identity': identity.split(':')[0]
+                })
+                response = jsonify({'error': 'Demasiadas solicitudes, intenta de nuevo más tarde'})
+                response.status_code = 429
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response
+        return None
+
+
+rate_limiter = RateLimiter()
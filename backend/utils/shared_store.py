@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+
+# Almacenes clave-valor con expiración usados por el rate limiting y otras
+# utilidades que necesitan estado compartido. MemoryStore vive en el proceso;
+# SQLiteStore comparte el estado entre los workers de un mismo host (sustituto
+# local de Redis) y RedisStore entre hosts.
+
+
+class MemoryStore:
+    """Almacén en memoria del proceso, seguro entre hilos"""
+
+    SWEEP_EVERY = 1000  # Operaciones entre barridos de claves expiradas
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self._ops = 0
+
+    def _alive(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def _sweep(self, now):
+        self._ops += 1
+        if self._ops % self.SWEEP_EVERY == 0:
+            expired = [k for k, (_, exp) in self._data.items() if exp is not None and exp <= now]
+            for key in expired:
+                del self._data[key]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._alive(key, time.time())
+            return entry[0] if entry else None
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._lock:
+            self._data[key] = (value, now + ttl if ttl else None)
+            self._sweep(now)
+
+    def add(self, key, value, ttl=None):
+        """Guardar solo si la clave no existe; devuelve True si se guardó"""
+        now = time.time()
+        with self._lock:
+            if self._alive(key, now):
+                return False
+            self._data[key] = (value, now + ttl if ttl else None)
+            self._sweep(now)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def update(self, key, fn, ttl=None):
+        """Leer-modificar-escribir atómico: fn(valor o None) -> (nuevo, resultado)"""
+        now = time.time()
+        with self._lock:
+            entry = self._alive(key, now)
+            value, result = fn(entry[0] if entry else None)
+            self._data[key] = (value, now + ttl if ttl else None)
+            self._sweep(now)
+            return result
+
+
+class SQLiteStore:
+    """Almacén en un archivo SQLite compartido por los workers del host"""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._ops = 0
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)'
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _sweep(self, conn, now):
+        self._ops += 1
+        if self._ops % self.SWEEP_EVERY == 0:
+            conn.execute('DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+
+    def _read(self, conn, key, now):
+        row = conn.execute(
+            'SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)', (key, now)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, key):
+        return self._read(self._connect(), key, time.time())
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)',
+                     (key, json.dumps(value), now + ttl if ttl else None))
+        self._sweep(conn, now)
+
+    def add(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self._read(conn, key, now) is not None:
+                conn.execute('COMMIT')
+                return False
+            conn.execute('INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, json.dumps(value), now + ttl if ttl else None))
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM kv WHERE key = ?', (key,))
+
+    def update(self, key, fn, ttl=None):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            value, result = fn(self._read(conn, key, now))
+            conn.execute('INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, json.dumps(value), now + ttl if ttl else None))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._sweep(conn, now)
+        return result
+
+
+class RedisStore:
+    """Almacén en Redis, compartido entre hosts (dependencia opcional)"""
+
+    def __init__(self, url, prefix='studentoverflow:'):
+        import redis
+
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._redis.set(self.prefix + key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._redis.set(self.prefix + key, json.dumps(value), nx=True,
+                                    px=int(ttl * 1000) if ttl else None))
+
+    def delete(self, key):
+        self._redis.delete(self.prefix + key)
+
+    def update(self, key, fn, ttl=None):
+        full_key = self.prefix + key
+        outcome = {}
+
+        def transaction(pipe):
+            raw = pipe.get(full_key)
+            value, outcome['result'] = fn(json.loads(raw) if raw is not None else None)
+            pipe.multi()
+            pipe.set(full_key, json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+        self._redis.transaction(transaction, full_key)
+        return outcome['result']
+
+
+def create_store(url):
+    """Crear un almacén a partir de una URL: '' (memoria), sqlite:///ruta o redis://..."""
+    if not url or url == 'memory://':
+        return MemoryStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteStore(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisStore(url)
+    raise ValueError(f'URL de almacén no soportada: {url}')
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from utils.log import get_logger
+from utils.shared_store import create_store
+
+logger = get_logger('singleflight')
+
+_groups = {}
+_settings = {'store': None, 'lock_timeout': 5.0}  # Ver init_singleflight
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Agrupa lecturas concurrentes idénticas: una sola ejecución por clave
+
+    Dentro del proceso, la primera petición de una clave ejecuta fn() y las
+    demás que llegan mientras tanto esperan y reciben el mismo resultado
+    (que, por tanto, no debe modificarse). Con un almacén compartido,
+    además se toma un candado por clave entre workers: los de otros
+    procesos esperan a que el líder termine antes de ejecutar fn(), que
+    para entonces suele encontrar el trabajo hecho (p. ej. un documento
+    ya construido).
+    """
+
+    POLL_SECONDS = 0.02
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {'executed': 0, 'coalesced': 0, 'lock_waits': 0, 'errors': 0}
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            self._count('coalesced')
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            store = _settings['store']
+            call.result = self._run_locked(store, key, fn) if store else fn()
+            self._count('executed')
+            return call.result
+        except Exception as e:
+            call.error = e
+            self._count('errors')
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_locked(self, store, key, fn):
+        """Ejecutar fn() con un candado por clave en el almacén compartido"""
+        lock_key = f'sf:{self.name}:{key}'
+        timeout = _settings['lock_timeout']
+        deadline = time.monotonic() + timeout
+        try:
+            acquired = store.add(lock_key, 1, ttl=timeout)
+            if not acquired:
+                self._count('lock_waits')
+                while not acquired and time.monotonic() < deadline:
+                    time.sleep(self.POLL_SECONDS)
+                    acquired = store.add(lock_key, 1, ttl=timeout)
+        except Exception:
+            logger.exception('Error con el candado compartido', extra={'group': self.name})
+            acquired = False
+        # Si el candado no se consigue a tiempo se ejecuta igualmente
+        try:
+            return fn()
+        finally:
+            if acquired:
+                try:
+                    store.delete(lock_key)
+                except Exception:
+                    logger.exception('Error liberando el candado compartido', extra={'group': self.name})
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
+
+
+def get_group(name):
+    """Grupo de single-flight con nombre (uno por tipo de lectura)"""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups.setdefault(name, SingleFlight(name))
+    return group
+
+
+def init_singleflight(app):
+    """Configurar el candado entre workers (SINGLEFLIGHT_STORAGE_URL vacío = solo en proceso)"""
+    url = app.config['SINGLEFLIGHT_STORAGE_URL']
+    _settings['store'] = create_store(url) if url else None
+    _settings['lock_timeout'] = app.config['SINGLEFLIGHT_LOCK_TIMEOUT']
+
+
+def metrics():
+    return {name: group.stats() for name, group in _groups.items()}
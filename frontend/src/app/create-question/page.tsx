@@ -1,10 +1,10 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/navigation";
 import Link from "next/link";
 import { useAuth } from "@/context/AuthContext";
-import { questionService } from "@/services/api";
+import { questionService, newIdempotencyKey } from "@/services/api";
 import { BookOpen, ArrowLeft, Send } from "lucide-react";
 import toast from "react-hot-toast";
 
@@ -14,6 +14,8 @@ export default function CreateQuestion() {
     content: "",
   });
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // Idempotency-Key del envío en curso; se conserva si un reintento no obtuvo respuesta
+  const submitKey = useRef("");
   const [errors, setErrors] = useState<Record<string, string>>({});
 
   const { isAuthenticated, user, loading } = useAuth();
@@ -76,10 +78,16 @@ export default function CreateQuestion() {
     setIsSubmitting(true);
 
     try {
-      const response = await questionService.createQuestion(formData);
+      const response = await questionService.createQuestion(
+        formData,
+        (submitKey.current ||= newIdempotencyKey())
+      );
+      submitKey.current = "";
       toast.success("¡Pregunta creada exitosamente!");
       router.push(`/questions/${response.data.question.id}`);
     } catch (error: any) {
+      // Sin respuesta la pregunta pudo crearse: reintentar con la misma clave
+      if (error.response) submitKey.current = "";
       const errorMessage =
         error.response?.data?.error || "Error al crear la pregunta";
       toast.error(errorMessage);
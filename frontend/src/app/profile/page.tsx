@@ -21,19 +21,19 @@ import {
 import toast from "react-hot-toast";
 
 interface UserStats {
-  questions_count: number;
-  answers_count: number;
-  accepted_answers: number;
-  total_votes: number;
+  question_count: number;
+  answer_count: number;
+  accepted_answer_count: number;
+  votes_received: number;
 }
 
 export default function Profile() {
   const [isEditing, setIsEditing] = useState(false);
   const [userStats, setUserStats] = useState<UserStats>({
-    questions_count: 0,
-    answers_count: 0,
-    accepted_answers: 0,
-    total_votes: 0,
+    question_count: 0,
+    answer_count: 0,
+    accepted_answer_count: 0,
+    votes_received: 0,
   });
   const [formData, setFormData] = useState({
     first_name: "",
@@ -63,13 +63,11 @@ export default function Profile() {
         major: user.major || "",
       });
 
-      // Simular estadísticas (en una app real, esto vendría de la API)
-      setUserStats({
-        questions_count: Math.floor(Math.random() * 10) + 1,
-        answers_count: Math.floor(Math.random() * 15) + 2,
-        accepted_answers: Math.floor(Math.random() * 5) + 1,
-        total_votes: Math.floor(Math.random() * 50) + 10,
-      });
+      // Estadísticas agregadas del perfil
+      userService
+        .getUser(user.id)
+        .then((response) => setUserStats(response.data.stats))
+        .catch((error) => console.error("Error cargando estadísticas:", error));
     }
   }, [user]);
 
@@ -253,7 +251,7 @@ export default function Profile() {
                   <HelpCircle size={24} className="text-blue-600" />
                 </div>
                 <div className="text-2xl font-bold text-gray-900">
-                  {userStats.questions_count}
+                  {userStats.question_count}
                 </div>
                 <div className="text-sm text-gray-600">Preguntas</div>
               </div>
@@ -263,7 +261,7 @@ export default function Profile() {
                   <MessageCircle size={24} className="text-green-600" />
                 </div>
                 <div className="text-2xl font-bold text-gray-900">
-                  {userStats.answers_count}
+                  {userStats.answer_count}
                 </div>
                 <div className="text-sm text-gray-600">Respuestas</div>
               </div>
@@ -273,7 +271,7 @@ export default function Profile() {
                   <Award size={24} className="text-yellow-600" />
                 </div>
                 <div className="text-2xl font-bold text-gray-900">
-                  {userStats.accepted_answers}
+                  {userStats.accepted_answer_count}
                 </div>
                 <div className="text-sm text-gray-600">Aceptadas</div>
               </div>
@@ -283,7 +281,7 @@ export default function Profile() {
                   <User size={24} className="text-purple-600" />
                 </div>
                 <div className="text-2xl font-bold text-gray-900">
-                  {userStats.total_votes}
+                  {userStats.votes_received}
                 </div>
                 <div className="text-sm text-gray-600">Votos</div>
               </div>
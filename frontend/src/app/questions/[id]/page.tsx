@@ -1,10 +1,14 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import Link from "next/link";
 import { useParams, useRouter } from "next/navigation";
 import { useAuth } from "@/context/AuthContext";
-import { questionService, answerService } from "@/services/api";
+import {
+  questionService,
+  answerService,
+  newIdempotencyKey,
+} from "@/services/api";
 import {
   BookOpen,
   ArrowLeft,
@@ -28,6 +32,7 @@ interface Author {
 interface Answer {
   id: number;
   content: string;
+  content_html?: string;
   votes: number;
   is_accepted: boolean;
   created_at: string;
@@ -39,12 +44,14 @@ interface Question {
   id: number;
   title: string;
   content: string;
+  content_html?: string;
   votes: number;
   views: number;
   created_at: string;
   updated_at: string;
   is_solved: boolean;
   answer_count: number;
+  version: number;
   author: Author;
   answers: Answer[];
 }
@@ -54,6 +61,8 @@ export default function QuestionDetail() {
   const [loading, setLoading] = useState(true);
   const [answerContent, setAnswerContent] = useState("");
   const [isSubmittingAnswer, setIsSubmittingAnswer] = useState(false);
+  // Idempotency-Key del envío en curso; se conserva si un reintento no obtuvo respuesta
+  const answerKey = useRef("");
   const [showAnswerForm, setShowAnswerForm] = useState(false);
 
   const { isAuthenticated, user } = useAuth();
@@ -80,6 +89,69 @@ export default function QuestionDetail() {
     }
   }, [questionId]);
 
+  const upsertAnswer = (answer: Answer) => {
+    setQuestion((prev) => {
+      if (!prev) return prev;
+      const exists = prev.answers.some((a) => a.id === answer.id);
+      const answers = exists
+        ? prev.answers.map((a) => (a.id === answer.id ? answer : a))
+        : [...prev.answers, answer];
+      return { ...prev, answers, answer_count: answers.length };
+    });
+  };
+
+  const markAccepted = (answerId: number, questionVersion?: number) => {
+    setQuestion((prev) =>
+      prev
+        ? {
+            ...prev,
+            is_solved: true,
+            version: questionVersion ?? prev.version,
+            answers: prev.answers.map((a) => ({
+              ...a,
+              is_accepted: a.id === answerId,
+            })),
+          }
+        : prev
+    );
+  };
+
+  // Recibir cambios en tiempo real en lugar de volver a pedir la pregunta
+  useEffect(() => {
+    if (!questionId) return;
+
+    const source = questionService.subscribe(parseInt(questionId));
+
+    source.addEventListener("answer_created", (e) =>
+      upsertAnswer(JSON.parse((e as MessageEvent).data))
+    );
+    source.addEventListener("answer_updated", (e) =>
+      upsertAnswer(JSON.parse((e as MessageEvent).data))
+    );
+    source.addEventListener("answer_deleted", (e) => {
+      const { id } = JSON.parse((e as MessageEvent).data);
+      setQuestion((prev) => {
+        if (!prev) return prev;
+        const answers = prev.answers.filter((a) => a.id !== id);
+        return { ...prev, answers, answer_count: answers.length };
+      });
+    });
+    source.addEventListener("answer_accepted", (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      markAccepted(data.answer_id, data.question_version);
+    });
+    source.addEventListener("question_updated", (e) => {
+      const { answers, ...fields } = JSON.parse((e as MessageEvent).data);
+      setQuestion((prev) => (prev ? { ...prev, ...fields } : prev));
+    });
+    source.addEventListener("question_deleted", () => {
+      toast.error("La pregunta fue eliminada");
+      router.push("/questions");
+    });
+
+    return () => source.close();
+  }, [questionId]);
+
   const handleSubmitAnswer = async (e: React.FormEvent) => {
     e.preventDefault();
 
@@ -101,16 +173,22 @@ export default function QuestionDetail() {
     setIsSubmittingAnswer(true);
 
     try {
-      await answerService.createAnswer({
-        content: answerContent,
-        question_id: parseInt(questionId),
-      });
+      const response = await answerService.createAnswer(
+        {
+          content: answerContent,
+          question_id: parseInt(questionId),
+        },
+        (answerKey.current ||= newIdempotencyKey())
+      );
+      answerKey.current = "";
 
       toast.success("¡Respuesta publicada exitosamente!");
       setAnswerContent("");
       setShowAnswerForm(false);
-      fetchQuestion(); // Recargar para mostrar la nueva respuesta
+      upsertAnswer(response.data.answer);
     } catch (error: any) {
+      // Sin respuesta la respuesta pudo publicarse: reintentar con la misma clave
+      if (error.response) answerKey.current = "";
       const errorMessage =
         error.response?.data?.error || "Error al publicar la respuesta";
       toast.error(errorMessage);
@@ -126,9 +204,12 @@ export default function QuestionDetail() {
     }
 
     try {
-      await answerService.acceptAnswer(answerId);
+      const response = await answerService.acceptAnswer(
+        answerId,
+        question.version
+      );
       toast.success("Respuesta marcada como aceptada");
-      fetchQuestion(); // Recargar para mostrar el cambio
+      markAccepted(answerId, response.data.question_version);
     } catch (error: any) {
       const errorMessage =
         error.response?.data?.error || "Error al aceptar la respuesta";
@@ -281,9 +362,16 @@ export default function QuestionDetail() {
               </div>
 
               <div className="prose max-w-none mb-6">
-                <p className="text-gray-700 whitespace-pre-wrap leading-relaxed">
-                  {question.content}
-                </p>
+                {question.content_html ? (
+                  <div
+                    className="text-gray-700 leading-relaxed"
+                    dangerouslySetInnerHTML={{ __html: question.content_html }}
+                  />
+                ) : (
+                  <p className="text-gray-700 whitespace-pre-wrap leading-relaxed">
+                    {question.content}
+                  </p>
+                )}
               </div>
 
               {/* Question Meta */}
@@ -398,9 +486,16 @@ export default function QuestionDetail() {
                       )}
 
                       <div className="prose max-w-none mb-4">
-                        <p className="text-gray-700 whitespace-pre-wrap leading-relaxed">
-                          {answer.content}
-                        </p>
+                        {answer.content_html ? (
+                          <div
+                            className="text-gray-700 leading-relaxed"
+                            dangerouslySetInnerHTML={{ __html: answer.content_html }}
+                          />
+                        ) : (
+                          <p className="text-gray-700 whitespace-pre-wrap leading-relaxed">
+                            {answer.content}
+                          </p>
+                        )}
                       </div>
 
                       <div className="flex items-center justify-between pt-4 border-t border-gray-200">
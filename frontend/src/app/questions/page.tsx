@@ -46,6 +46,10 @@ export default function Questions() {
   const [loading, setLoading] = useState(true);
   const [search, setSearch] = useState("");
   const [sortBy, setSortBy] = useState("created_at");
+  const [filter, setFilter] = useState("");
+  const [suggestions, setSuggestions] = useState<
+    { id: number; title: string }[]
+  >([]);
   const [pagination, setPagination] = useState<Pagination | null>(null);
   const [currentPage, setCurrentPage] = useState(1);
 
@@ -54,7 +58,8 @@ export default function Questions() {
   const fetchQuestions = async (
     page = 1,
     searchTerm = "",
-    sort = "created_at"
+    sort = "created_at",
+    feed = ""
   ) => {
     try {
       setLoading(true);
@@ -64,6 +69,7 @@ export default function Questions() {
         search: searchTerm,
         sort_by: sort,
         order: "desc",
+        ...(feed && { filter: feed }),
       });
 
       setQuestions(response.data.questions);
@@ -77,13 +83,31 @@ export default function Questions() {
   };
 
   useEffect(() => {
-    fetchQuestions(currentPage, search, sortBy);
-  }, [currentPage, sortBy]);
+    fetchQuestions(currentPage, search, sortBy, filter);
+  }, [currentPage, sortBy, filter]);
+
+  // Sugerencias de títulos con un pequeño debounce mientras se escribe
+  useEffect(() => {
+    if (!search.trim()) {
+      setSuggestions([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await questionService.suggest(search);
+        setSuggestions(response.data.suggestions);
+      } catch {
+        setSuggestions([]);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [search]);
 
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
+    setSuggestions([]);
     setCurrentPage(1);
-    fetchQuestions(1, search, sortBy);
+    fetchQuestions(1, search, sortBy, filter);
   };
 
   const handlePageChange = (page: number) => {
@@ -173,11 +197,39 @@ export default function Questions() {
                   className="form-input pl-10 w-full"
                   value={search}
                   onChange={(e) => setSearch(e.target.value)}
+                  onBlur={() => setTimeout(() => setSuggestions([]), 150)}
                 />
+                {suggestions.length > 0 && (
+                  <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-md shadow-lg">
+                    {suggestions.map((suggestion) => (
+                      <li key={suggestion.id}>
+                        <Link
+                          href={`/questions/${suggestion.id}`}
+                          className="block px-4 py-2 text-sm text-gray-700 hover:bg-gray-50"
+                        >
+                          {suggestion.title}
+                        </Link>
+                      </li>
+                    ))}
+                  </ul>
+                )}
               </div>
             </form>
 
             <div className="flex items-center gap-4">
+              <select
+                value={filter}
+                onChange={(e) => {
+                  setCurrentPage(1);
+                  setFilter(e.target.value);
+                }}
+                className="form-input w-auto"
+              >
+                <option value="">Todas</option>
+                <option value="unanswered">Sin respuestas</option>
+                <option value="unsolved">Sin resolver</option>
+              </select>
+
               <select
                 value={sortBy}
                 onChange={(e) => setSortBy(e.target.value)}
@@ -186,6 +238,7 @@ export default function Questions() {
                 <option value="created_at">Más recientes</option>
                 <option value="votes">Más votadas</option>
                 <option value="views">Más vistas</option>
+                <option value="hot">Tendencias</option>
               </select>
 
               {isAuthenticated && (
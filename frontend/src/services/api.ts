@@ -40,6 +40,27 @@ api.interceptors.response.use(
   }
 );
 
+// Clave para reintentar un POST de creación sin duplicarlo: se reutiliza
+// mientras el servidor no haya respondido (p. ej. tras un error de red).
+// crypto.randomUUID solo existe en contextos seguros (HTTPS o localhost);
+// en HTTP plano se genera un UUID v4 con crypto.getRandomValues.
+export const newIdempotencyKey = (): string => {
+  if (typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40; // versión 4
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // variante RFC 4122
+  const hex = Array.from(bytes, (b) => b.toString(16).padStart(2, "0")).join("");
+  return [
+    hex.slice(0, 8),
+    hex.slice(8, 12),
+    hex.slice(12, 16),
+    hex.slice(16, 20),
+    hex.slice(20),
+  ].join("-");
+};
+
 // Servicios de autenticación
 export const authService = {
   login: (credentials: { username: string; password: string }) =>
@@ -60,31 +81,87 @@ export const authService = {
 // Servicios de preguntas
 export const questionService = {
   getQuestions: (params?: any) => api.get("/api/questions", { params }),
-  getQuestion: (id: number) => api.get(`/api/questions/${id}`),
-  createQuestion: (questionData: any) =>
-    api.post("/api/questions", questionData),
-  updateQuestion: (id: number, questionData: any) =>
-    api.put(`/api/questions/${id}`, questionData),
+  getQuestion: (id: number) =>
+    api.get(`/api/questions/${id}`, { params: { format: "html" } }),
+  // Autocompletado de títulos mientras se escribe en el buscador
+  suggest: (q: string, limit = 8) =>
+    api.get("/api/questions/suggest", { params: { q, limit } }),
+  getQuestionsByIds: (ids: number[]) =>
+    api.get("/api/questions", { params: { ids: ids.join(",") } }),
+  createQuestion: (questionData: any, idempotencyKey = newIdempotencyKey()) =>
+    api.post("/api/questions", questionData, {
+      headers: { "Idempotency-Key": idempotencyKey },
+    }),
+  // version: la última leída; el servidor responde 412 si otra persona editó antes
+  updateQuestion: (id: number, questionData: any, version?: number) =>
+    api.put(`/api/questions/${id}`, questionData, {
+      headers: version ? { "If-Match": `"v${version}"` } : {},
+    }),
   deleteQuestion: (id: number) => api.delete(`/api/questions/${id}`),
+  findSimilar: (draft: { title: string; content?: string; limit?: number }) =>
+    api.post("/api/questions/similar", draft),
+  getRelated: (id: number) => api.get(`/api/questions/${id}/related`),
+  // Canal SSE con respuestas nuevas, aceptadas, ediciones y eliminaciones
+  subscribe: (id: number) =>
+    new EventSource(`${API_BASE_URL}/api/questions/${id}/events`, {
+      withCredentials: true,
+    }),
 };
 
 // Servicios de respuestas
 export const answerService = {
-  createAnswer: (answerData: any) => api.post("/api/answers", answerData),
-  updateAnswer: (id: number, answerData: any) =>
-    api.put(`/api/answers/${id}`, answerData),
+  createAnswer: (answerData: any, idempotencyKey = newIdempotencyKey()) =>
+    api.post("/api/answers", answerData, {
+      headers: { "Idempotency-Key": idempotencyKey },
+    }),
+  updateAnswer: (id: number, answerData: any, version?: number) =>
+    api.put(`/api/answers/${id}`, answerData, {
+      headers: version ? { "If-Match": `"v${version}"` } : {},
+    }),
   deleteAnswer: (id: number) => api.delete(`/api/answers/${id}`),
-  acceptAnswer: (id: number) => api.post(`/api/answers/${id}/accept`),
+  // questionVersion: If-Match se compara con la versión de la pregunta
+  acceptAnswer: (id: number, questionVersion?: number) =>
+    api.post(`/api/answers/${id}/accept`, null, {
+      headers: questionVersion ? { "If-Match": `"v${questionVersion}"` } : {},
+    }),
+};
+
+// Servicios de categorías
+export const categoryService = {
+  getCategories: () => api.get("/api/categories"),
+  getCategory: (id: number) => api.get(`/api/categories/${id}`),
+};
+
+// Servicios de etiquetas
+export const tagService = {
+  getTags: (params?: { q?: string; limit?: number }) =>
+    api.get("/api/tags", { params }),
+};
+
+// Servicios de notificaciones
+export const notificationService = {
+  getNotifications: (params?: { before?: number; per_page?: number; unread?: boolean }) =>
+    api.get("/api/notifications", { params }),
+  getUnreadCount: () => api.get("/api/notifications/unread-count"),
+  markRead: (ids?: number[]) => api.post("/api/notifications/read", { ids }),
 };
 
 // Servicios de usuarios
 export const userService = {
   getUser: (id: number) => api.get(`/api/users/${id}`),
+  getUsersByIds: (ids: number[]) =>
+    api.get("/api/users", { params: { ids: ids.join(",") } }),
   updateProfile: (userData: any) => api.put("/api/users/profile", userData),
   getUserQuestions: (id: number, params?: any) =>
     api.get(`/api/users/${id}/questions`, { params }),
   getUserAnswers: (id: number, params?: any) =>
     api.get(`/api/users/${id}/answers`, { params }),
+  getLeaderboard: (params?: {
+    scope?: "global" | "university" | "major";
+    value?: string;
+    page?: number;
+    per_page?: number;
+  }) => api.get("/api/users/leaderboard", { params }),
 };
 
 export default api;